@@ -0,0 +1,61 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+from django.urls import Resolver404, resolve
+
+# anonymous, read-only endpoints taking most of the public traffic
+PUBLIC_READ_ONLY_VIEWS = {
+    "news:published:news",
+    "news:keywords:domains",
+    "news:keywords:tags",
+}
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def is_public_read_only(request):
+    if request.method not in READ_ONLY_METHODS:
+        return False
+
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    return match.view_name in PUBLIC_READ_ONLY_VIEWS
+
+
+class PooledASGIHandler(ASGIHandler):
+    """
+    ASGI handler reading requests and writing responses in the event loop,
+    so slow clients do not hold a thread, and running the synchronous views
+    in bounded thread pools. Public read-only endpoints have a pool of their
+    own, so a burst of anonymous traffic can not starve panel requests.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.ASGI_THREADS, thread_name_prefix="asgi"
+        )
+        self.read_only_executor = ThreadPoolExecutor(
+            max_workers=settings.ASGI_READ_ONLY_THREADS,
+            thread_name_prefix="asgi-read-only",
+        )
+
+    async def get_response(self, request):
+        executor = (
+            self.read_only_executor if is_public_read_only(request) else self.executor
+        )
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(executor, self.get_response_in_thread, request)
+
+    def get_response_in_thread(self, request):
+        # database connections belong to pool threads, not to requests, so
+        # they are checked in the thread using them, like WSGI workers do
+        close_old_connections()
+        try:
+            return super().get_response(request)
+        finally:
+            close_old_connections()
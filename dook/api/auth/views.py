@@ -36,6 +36,7 @@ from dook.core.users.email_service import (
     send_registration_confirmation_email,
 )
 from dook.core.users.models import Invitation, User
+from dook.core.users.token_cache import invalidate_tokens
 from dook.core.users.tokens import get_user_from_uid, password_reset_token_generator
 
 
@@ -108,6 +109,8 @@ class CreateTokenView(generics.CreateAPIView):
 
         try:
             token = Token.objects.get(user=user)
+            # the key is the primary key, cleared by delete
+            invalidate_tokens([token.key])
             token.delete()
         except Token.DoesNotExist:
             pass
@@ -134,7 +137,9 @@ class LogoutView(views.APIView):
 
     def post(self, request, *args, **kwargs):
         try:
-            Token.objects.get(user=request.user).delete()
+            token = Token.objects.get(user=request.user)
+            invalidate_tokens([token.key])
+            token.delete()
         except Token.DoesNotExist:
             pass
 
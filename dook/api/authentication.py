@@ -0,0 +1,22 @@
+from rest_framework.authentication import TokenAuthentication
+
+from dook.core.users.token_cache import cache_token, get_cached_token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication caching users of token keys for
+    AUTH_TOKEN_CACHE_TIMEOUT seconds, so authenticated requests do not query
+    the token and its user. Entries are dropped when the token is deleted and
+    when the user is saved, eg. deactivated or given another role, so caching
+    is enabled only with a cache shared by all processes, see CACHE_SHARED.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = get_cached_token(key)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        cache_token(user, token)
+        return user, token
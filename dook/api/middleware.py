@@ -0,0 +1,130 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import Resolver404, resolve
+
+from dook.core.database.instrumentation import QueryRecorder, record_queries
+from dook.core.routers import replica_lag_guard, replica_reads
+
+# list views reading from the replica
+REPLICA_VIEWS = {
+    "news:crew:expert-news",
+    "news:crew:fact-checker-news",
+    "news:keywords:domains",
+    "news:keywords:sensitive-keywords",
+    "news:keywords:tags",
+    "news:management:news",
+    "news:published:news",
+    "news:verified:news",
+}
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+PRIMARY_PIN_KEY_PREFIX = "primary_pin"
+PRIMARY_PIN_COOKIE = "primary_pin"
+
+
+def is_replica_view(request):
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+
+    # list and detail views share names, only lists are viewset "list" actions
+    actions = getattr(match.func, "actions", {})
+    return match.view_name in REPLICA_VIEWS and actions.get("get") == "list"
+
+
+def get_primary_pin_key(request):
+    # requests are authenticated in views, the token identifies the client
+    authorization = request.META.get("HTTP_AUTHORIZATION")
+    if not authorization:
+        return None
+
+    digest = hashlib.md5(authorization.encode("utf-8")).hexdigest()
+    return f"{PRIMARY_PIN_KEY_PREFIX}:{digest}"
+
+
+def pin_to_primary(request, response):
+    key = get_primary_pin_key(request)
+    if key is not None:
+        cache.set(key, 1, timeout=settings.REPLICA_PIN_SECONDS)
+        return
+
+    # anonymous clients carry their own pin, clients behind one proxy share
+    # an address
+    response.set_cookie(
+        PRIMARY_PIN_COOKIE,
+        "1",
+        max_age=settings.REPLICA_PIN_SECONDS,
+        httponly=True,
+        samesite="Lax",
+    )
+
+
+def is_pinned_to_primary(request):
+    key = get_primary_pin_key(request)
+    if key is None:
+        return PRIMARY_PIN_COOKIE in request.COOKIES
+    return bool(cache.get(key))
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Reads list views in REPLICA_VIEWS from the replica on safe requests.
+    A client is pinned to the primary for REPLICA_PIN_SECONDS after each of
+    its writes, so it reads its own writes, and all clients read from the
+    primary while the replica lags behind. Pins of authenticated clients are
+    cached, so replica reads need a cache shared by all processes, see
+    CACHE_SHARED.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (settings.REPLICA_READS and settings.CACHE_SHARED):
+            return self.get_response(request)
+
+        if request.method not in READ_ONLY_METHODS:
+            response = self.get_response(request)
+            pin_to_primary(request, response)
+            return response
+
+        if (
+            not is_replica_view(request)
+            or is_pinned_to_primary(request)
+            or not replica_lag_guard.is_available()
+        ):
+            return self.get_response(request)
+
+        with replica_reads():
+            return self.get_response(request)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Logs query count, SQL time, the slowest statements and the queryset
+    methods building the queries of each request to the database log, with
+    QUERY_INSTRUMENTATION.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.logger = logging.getLogger("database")
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION:
+            return self.get_response(request)
+
+        recorder = QueryRecorder(slowest_count=settings.QUERY_INSTRUMENTATION_SLOWEST)
+        with record_queries(recorder):
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else request.path_info
+        self.logger.info(
+            f"{request.method} {view_name} {response.status_code}: "
+            f"{recorder.summary()}"
+        )
+        return response
@@ -3,7 +3,7 @@ from distutils.util import strtobool
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, views
 from rest_framework.exceptions import ValidationError
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import get_object_or_404
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.response import Response
@@ -21,18 +21,23 @@ from dook.api.news.crew.serializers import (
 )
 from dook.api.news.errors import INVALID_EXPERT_NEWS_TAGS_INPUT
 from dook.api.news.exceptions import TagCountPerNewsExceededException
+from dook.api.news.filters import NewsSearchFilter
+from dook.api.news.mixins import RelatedKeywordsFilterMixin
 from dook.api.permissions import IsExpert, IsFactChecker, IsModerator, IsSpecialist
-from dook.core.news.models import Domain, News, NewsDomain, NewsTag, Tag
+from dook.core.news.cache import invalidate_published_feed
+from dook.core.news.models import News, NewsDomain, NewsTag, Tag
 from dook.core.users.constants import UserRoleType
 from dook.core.users.email_service import send_news_assignment_rejection_for_assignor
 from dook.core.users.models import User, UserNews
 
 
-class ExpertNewsViewSet(GenericViewSet, ListModelMixin, RetrieveModelMixin):
+class ExpertNewsViewSet(
+    RelatedKeywordsFilterMixin, GenericViewSet, ListModelMixin, RetrieveModelMixin
+):
     serializer_class = ExpertNewsSerializer
     permission_classes = (IsExpert | IsSpecialist,)
     filterset_class = ExpertNewsFilter
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, NewsSearchFilter]
     ordering_fields = ["reported_at"]
     ordering = ["-reported_at"]
     search_fields = ["text"]
@@ -42,8 +47,6 @@ class ExpertNewsViewSet(GenericViewSet, ListModelMixin, RetrieveModelMixin):
             News.objects.with_fact_checker_opinions()
             .with_expert_opinions()
             .with_verdicts()
-            .with_is_duplicate()
-            .with_is_spam()
             .with_assigned_to_me(user=self.request.user)
             .with_assigned_crew_members()
             .filter(is_published=False)
@@ -56,20 +59,10 @@ class ExpertNewsViewSet(GenericViewSet, ListModelMixin, RetrieveModelMixin):
             except ValueError:
                 pass
 
-        tags = self.request.query_params.getlist("tags[]")
-        if tags:
-            qs = qs.filter_by_related_tags(
-                tags=[get_object_or_404(Tag, name=name) for name in tags]
-            )
+        qs = self.filter_by_tags(qs)
 
         if self.request.user.role == UserRoleType.EXPERT:
-            domains = self.request.query_params.getlist("domains[]")
-            if domains:
-                qs = qs.filter_by_related_domains(
-                    domains=[get_object_or_404(Domain, name=domain) for domain in domains]
-                )
-
-            return qs
+            return self.filter_by_domains(qs)
 
         news_ids = NewsDomain.objects.filter(domain=self.request.user.domain).values_list(
             "news", flat=True
@@ -100,10 +93,6 @@ class ExpertNewsCreateOpinionView(views.APIView):
             user=self.request.user, opinion_params=serializer.validated_data
         )
 
-        if news_instance.is_with_verdict():
-            news_instance.refresh_from_db()
-            news_instance.events.new_verdict()
-
         serializer = ExpertOpinionSerializer(instance=opinion)
         return Response(serializer.data, status=HTTP_201_CREATED)
 
@@ -117,8 +106,6 @@ class ExpertNewsAssignTagsView(views.APIView):
             News.objects.with_fact_checker_opinions()
             .with_expert_opinions()
             .with_verdicts()
-            .with_is_duplicate()
-            .with_is_spam()
             .filter(is_published=False)
             .with_assigned_crew_members(),
             pk=pk,
@@ -137,6 +124,7 @@ class ExpertNewsAssignTagsView(views.APIView):
         tag_objects = [Tag.objects.get_or_create(name=tag)[0] for tag in tags]
         for tag in tag_objects:
             NewsTag.objects.create(news=news_instance, tag=tag)
+        invalidate_published_feed()
 
         return Response(ExpertNewsSerializer(news_instance).data)
 
@@ -167,11 +155,13 @@ class ExpertNewsDismissAssignmentView(views.APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class FactCheckerNewsViewSet(GenericViewSet, ListModelMixin, RetrieveModelMixin):
+class FactCheckerNewsViewSet(
+    RelatedKeywordsFilterMixin, GenericViewSet, ListModelMixin, RetrieveModelMixin
+):
     serializer_class = FactCheckerNewsSerializer
     permission_classes = (IsFactChecker,)
     filterset_class = FactCheckerNewsFilter
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, NewsSearchFilter]
     ordering_fields = ["assigned_at"]
     ordering = ["-assigned_at"]
     search_fields = ["text"]
@@ -185,11 +175,7 @@ class FactCheckerNewsViewSet(GenericViewSet, ListModelMixin, RetrieveModelMixin)
             .filter(current_verdict__in=["no_verdict", "dispute"])
         )
 
-        tags = self.request.query_params.getlist("tags[]")
-        if tags:
-            qs = qs.filter_by_related_tags(
-                tags=[get_object_or_404(Tag, name=name) for name in tags]
-            )
+        qs = self.filter_by_tags(qs)
 
         return qs
 
@@ -215,9 +201,5 @@ class FactCheckerNewsCreateOpinionView(views.APIView):
             user=self.request.user, opinion_params=serializer.validated_data
         )
 
-        if news_instance.is_with_verdict():
-            news_instance.refresh_from_db()
-            news_instance.events.new_verdict()
-
         serializer = FactCheckerOpinionSerializer(instance=opinion)
         return Response(serializer.data, status=HTTP_201_CREATED)
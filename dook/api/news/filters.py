@@ -0,0 +1,28 @@
+from django.db import connections
+from rest_framework.filters import SearchFilter
+
+from dook.core.news.search import is_search_vector_supported, search_news
+
+
+class NewsSearchFilter(SearchFilter):
+    """
+    Full-text search over news search vector, ranked by relevance unless
+    the ordering is requested explicitly. Falls back to SearchFilter lookups
+    over `search_fields` on databases without text search.
+    """
+
+    ordering_param = "ordering"
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_search_vector_supported(connections[queryset.db]):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        queryset = search_news(queryset, terms)
+        if self.ordering_param in request.query_params:
+            return queryset
+
+        return queryset.order_by("-search_rank", *queryset.query.order_by)
@@ -32,3 +32,15 @@ class AssigningNewsToInactiveUserException(exceptions.APIException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_code = "assigning news to inactive user"
     default_detail = _("Can not assign news to inactive user.")
+
+
+class ScreenshotUploadNotFoundException(exceptions.APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "screenshot upload not found"
+    default_detail = _("Uploaded screenshot does not exist.")
+
+
+class InvalidScreenshotUploadException(exceptions.APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "invalid screenshot upload"
+    default_detail = _("Uploaded screenshot has to be an image of allowed size.")
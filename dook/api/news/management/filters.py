@@ -7,7 +7,7 @@ from dook.core.news.models import News
 
 class ManagementNewsFilter(FilterSet):
     current_verdict = filters.ChoiceFilter(
-        field_name="current_verdict", choices=NEWS_FINAL_VERDICT_TYPES
+        field_name="verdict_status", choices=NEWS_FINAL_VERDICT_TYPES
     )
     deleted = filters.BooleanFilter(field_name="deleted")
     is_duplicate = filters.BooleanFilter(field_name="is_duplicate")
@@ -134,7 +134,10 @@ class NewsSerializer(serializers.ModelSerializer):
             "is_sensitive",
             "origin",
             "reported_at",
+            "screenshot_thumbnail_url",
+            "screenshot_thumbnail_webp_url",
             "screenshot_url",
+            "screenshot_webp_url",
             "sensitive_keywords",
             "tags",
             "text",
@@ -142,7 +145,8 @@ class NewsSerializer(serializers.ModelSerializer):
         )
 
     def get_current_verdict(self, obj):
-        return obj.current_verdict
+        # annotated by NewsQuerySet.with_news_verdict_status()
+        return getattr(obj, "verdict_status", obj.current_verdict)
 
     def get_is_duplicate(self, obj):
         return obj.is_duplicate
@@ -179,6 +183,16 @@ class NewsImageSerializer(serializers.Serializer):
     image = serializers.ImageField(required=True)
 
 
+class NewsImageUploadSerializer(serializers.Serializer):
+    object_name = serializers.CharField(read_only=True)
+    url = serializers.URLField(read_only=True)
+    fields = serializers.DictField(child=serializers.CharField(), read_only=True)
+
+
+class NewsImageUploadConfirmSerializer(serializers.Serializer):
+    object_name = serializers.CharField(max_length=1000)
+
+
 class NewsAssignSerializer(serializers.Serializer):
     assignee = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.filter(
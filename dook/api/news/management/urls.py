@@ -5,6 +5,8 @@ from dook.api.news.management.views import (
     FactCheckerOpinionDetailView,
     NewsAssignView,
     NewsDismissView,
+    NewsImageUploadConfirmView,
+    NewsImageUploadView,
     NewsImageView,
     NewsViewSet,
 )
@@ -33,4 +35,14 @@ urlpatterns = [
         name="fact-checker-opinion-detail",
     ),
     path("news-image/<uuid:pk>", NewsImageView.as_view(), name="news-image"),
+    path(
+        "news-image/<uuid:pk>/upload",
+        NewsImageUploadView.as_view(),
+        name="news-image-upload",
+    ),
+    path(
+        "news-image/<uuid:pk>/upload/confirm",
+        NewsImageUploadConfirmView.as_view(),
+        name="news-image-upload-confirm",
+    ),
 ]
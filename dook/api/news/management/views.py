@@ -1,17 +1,21 @@
 from distutils.util import strtobool
 
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, status, views, viewsets
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
 from dook.api.news.consts import MAX_TAG_COUNT_PER_NEWS
 from dook.api.news.exceptions import TagCountPerNewsExceededException
+from dook.api.news.filters import NewsSearchFilter
 from dook.api.news.management.exceptions import (
     AssigningNewsToInactiveUserException,
+    InvalidScreenshotUploadException,
     NewsAlreadyAssignedException,
     NewsAlreadyAssignedToRequestedUserException,
+    ScreenshotUploadNotFoundException,
 )
 from dook.api.news.management.filters import ManagementNewsFilter
 from dook.api.news.management.serializers import (
@@ -19,11 +23,16 @@ from dook.api.news.management.serializers import (
     FactCheckerOpinionExtendedSerializer,
     NewsAssignSerializer,
     NewsImageSerializer,
+    NewsImageUploadConfirmSerializer,
+    NewsImageUploadSerializer,
     NewsSerializer,
     NewsUpdateSerializer,
 )
+from dook.api.news.mixins import RelatedKeywordsFilterMixin
 from dook.api.permissions import IsAdmin, IsExpert, IsModerator, IsSpecialist
+from dook.api.transactions import TransactionPolicy
 from dook.core.integrations.storage.client import S3ApiClient
+from dook.core.news.cache import invalidate_published_feed
 from dook.core.news.models import (
     Domain,
     ExpertOpinion,
@@ -41,8 +50,8 @@ from dook.core.users.email_service import (
 from dook.core.users.models import User, UserNews
 
 
-class NewsViewSet(viewsets.ModelViewSet):
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+class NewsViewSet(RelatedKeywordsFilterMixin, viewsets.ModelViewSet):
+    filter_backends = [DjangoFilterBackend, OrderingFilter, NewsSearchFilter]
     filterset_class = ManagementNewsFilter
     ordering_fields = ["reported_at"]
     ordering = ["-reported_at"]
@@ -61,21 +70,14 @@ class NewsViewSet(viewsets.ModelViewSet):
             News.objects.with_expert_opinions()
             .with_fact_checker_opinions()
             .with_news_verdict_status()
-            .with_is_duplicate()
             .with_assigned_crew_members()
         )
+        if self.action == "list":
+            qs = qs.with_opinion_judges().with_keywords().with_sensitive_keywords()
 
-        tags = self.request.query_params.getlist("tags[]")
-        if tags:
-            qs = qs.filter_by_related_tags(
-                tags=[get_object_or_404(Tag, name=name) for name in tags]
-            )
+        qs = self.filter_by_tags(qs)
 
-        domains = self.request.query_params.getlist("domains[]")
-        if domains:
-            qs = qs.filter_by_related_domains(
-                domains=[get_object_or_404(Domain, name=domain) for domain in domains]
-            )
+        qs = self.filter_by_domains(qs)
 
         is_verified_by_expert = self.request.query_params.get("is_verified_by_expert")
         if is_verified_by_expert:
@@ -125,6 +127,7 @@ class NewsViewSet(viewsets.ModelViewSet):
                 NewsTag.objects.create(news=news, tag=tag)
 
         super().partial_update(request, args, kwargs)
+        invalidate_published_feed()
 
         return Response(NewsSerializer(instance=news).data, status=status.HTTP_200_OK)
 
@@ -148,19 +151,77 @@ class NewsImageView(generics.UpdateAPIView):
     permission_classes = (IsAdmin | IsModerator,)
     serializer_class = NewsImageSerializer
     queryset = News.objects.all()
+    # no transaction is held while the screenshot is uploaded
+    transaction_policies = {"PATCH": TransactionPolicy.AUTOCOMMIT}
 
     def patch(self, request, pk):
-        self.s3_client = S3ApiClient()
-
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         news = self.get_object()
         news.attach_screenshot(image=serializer.validated_data["image"])
+        invalidate_published_feed()
 
         return Response(status=status.HTTP_204_NO_CONTENT,)
 
 
+class NewsImageUploadView(views.APIView):
+    """
+    Presigns a POST uploading the screenshot straight to the bucket, confirmed
+    afterwards with NewsImageUploadConfirmView.
+    """
+
+    permission_classes = (IsAdmin | IsModerator,)
+    transaction_policies = {"POST": TransactionPolicy.READ_ONLY}
+
+    def post(self, request, pk):
+        news = get_object_or_404(News, pk=pk)
+
+        s3_client = S3ApiClient()
+        object_name = s3_client.generate_filename(type=f"image_{news.pk}")
+        upload = s3_client.generate_presigned_post(
+            object_name,
+            max_size=settings.SCREENSHOT_UPLOAD_MAX_SIZE,
+            expires_in=settings.SCREENSHOT_UPLOAD_EXPIRES_IN,
+        )
+
+        serializer = NewsImageUploadSerializer(
+            {"object_name": object_name, "url": upload["url"], "fields": upload["fields"]}
+        )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class NewsImageUploadConfirmView(views.APIView):
+    permission_classes = (IsAdmin | IsModerator,)
+    # no transaction is held while the upload is checked in the bucket
+    transaction_policies = {"POST": TransactionPolicy.AUTOCOMMIT}
+
+    def post(self, request, pk):
+        news = get_object_or_404(News, pk=pk)
+        serializer = NewsImageUploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        object_name = serializer.validated_data["object_name"]
+
+        # only objects presigned for this news can be attached to it
+        if not object_name.startswith(f"image_{news.pk}_"):
+            raise InvalidScreenshotUploadException
+
+        s3_client = S3ApiClient()
+        metadata = s3_client.get_object_metadata(object_name)
+        if metadata is None:
+            raise ScreenshotUploadNotFoundException
+        if (
+            not metadata.get("ContentType", "").startswith("image/")
+            or metadata["ContentLength"] > settings.SCREENSHOT_UPLOAD_MAX_SIZE
+        ):
+            raise InvalidScreenshotUploadException
+
+        news.set_screenshot_url(s3_client.get_object_url(object_name))
+        invalidate_published_feed()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class NewsAssignView(views.APIView):
     permission_classes = (IsAdmin | IsModerator,)
 
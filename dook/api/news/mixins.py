@@ -0,0 +1,35 @@
+from django.http import Http404
+
+from dook.core.news.models import Domain, Tag
+
+
+class RelatedKeywordsFilterMixin:
+    """
+    Filters news by `tags[]` and `domains[]` query params, resolving all names
+    of a kind in a single lookup.
+    """
+
+    def filter_by_tags(self, qs):
+        names = self.request.query_params.getlist("tags[]")
+        if names:
+            qs = qs.filter_by_related_tags(tags=self.get_keywords_or_404(Tag, names))
+
+        return qs
+
+    def filter_by_domains(self, qs):
+        names = self.request.query_params.getlist("domains[]")
+        if names:
+            qs = qs.filter_by_related_domains(
+                domains=self.get_keywords_or_404(Domain, names)
+            )
+
+        return qs
+
+    @staticmethod
+    def get_keywords_or_404(model, names):
+        names = set(names)
+        keywords = list(model.objects.filter(name__in=names))
+        if len(keywords) != len(names):
+            raise Http404(f"No {model._meta.object_name} matches the given query.")
+
+        return keywords
@@ -28,19 +28,23 @@ class NewsPublishedSerializer(serializers.HyperlinkedModelSerializer):
         return True if getattr(obj, "expertopinion", None) else False
 
     def get_title(self, obj):
-        opinion = (
-            getattr(obj, "expertopinion", None) or obj.factcheckeropinion_set.first()
-        )
+        opinion = self.get_leading_opinion(obj)
 
         return opinion.title if opinion else ""
 
     def get_text(self, obj):
-        opinion = (
-            getattr(obj, "expertopinion", None) or obj.factcheckeropinion_set.first()
-        )
+        opinion = self.get_leading_opinion(obj)
 
         return f"{opinion.comment[:200]}..." if opinion else ""
 
+    @staticmethod
+    def get_leading_opinion(obj):
+        # the first fact checker opinion taken from the prefetched ones,
+        # first() would query each news again
+        return getattr(obj, "expertopinion", None) or min(
+            obj.factcheckeropinion_set.all(), key=lambda opinion: opinion.pk, default=None
+        )
+
     def get_date(self, obj):
         return obj.created_at
 
@@ -73,7 +77,10 @@ class NewsPublishedSerializer(serializers.HyperlinkedModelSerializer):
             "id",
             "is_pinned",
             "reported_at",
+            "screenshot_thumbnail_url",
+            "screenshot_thumbnail_webp_url",
             "screenshot_url",
+            "screenshot_webp_url",
             "tags",
             "text",
             "title",
@@ -1,15 +1,20 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
 from rest_framework.filters import OrderingFilter
-from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
 
+from dook.api.news.mixins import RelatedKeywordsFilterMixin
 from dook.api.news.published.filters import NewsPublishedFilter
 from dook.api.news.published.serializers import NewsPublishedSerializer
-from dook.core.news.models import Domain, News, Tag
+from dook.core.news.cache import (
+    build_published_feed_key,
+    get_or_build_published_feed,
+)
+from dook.core.news.models import News
 
 
-class NewsPublishedViewSet(viewsets.ModelViewSet):
+class NewsPublishedViewSet(RelatedKeywordsFilterMixin, viewsets.ModelViewSet):
     serializer_class = NewsPublishedSerializer
 
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -20,18 +25,27 @@ class NewsPublishedViewSet(viewsets.ModelViewSet):
     permission_classes = (AllowAny,)
 
     def get_queryset(self):
-        qs = News.objects.published()
+        qs = News.objects.published().with_keywords()
 
-        tags = self.request.query_params.getlist("tags[]")
-        if tags:
-            qs = qs.filter_by_related_tags(
-                tags=[get_object_or_404(Tag, name=name) for name in tags]
-            )
+        qs = self.filter_by_tags(qs)
 
-        domains = self.request.query_params.getlist("domains[]")
-        if domains:
-            qs = qs.filter_by_related_domains(
-                domains=[get_object_or_404(Domain, name=domain) for domain in domains]
-            )
+        qs = self.filter_by_domains(qs)
 
         return qs
+
+    def list(self, request, *args, **kwargs):
+        key = build_published_feed_key("list", request.query_params)
+        return self.get_cached_response(key, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        key = build_published_feed_key(
+            "detail", request.query_params, pk=kwargs[self.lookup_field]
+        )
+        return self.get_cached_response(key, super().retrieve, request, *args, **kwargs)
+
+    def get_cached_response(self, key, action, request, *args, **kwargs):
+        data = get_or_build_published_feed(
+            key, lambda: action(request, *args, **kwargs).data
+        )
+
+        return Response(data)
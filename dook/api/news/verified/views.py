@@ -1,21 +1,24 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
-from rest_framework.generics import get_object_or_404
+from rest_framework.filters import OrderingFilter
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
 
+from dook.api.news.filters import NewsSearchFilter
+from dook.api.news.mixins import RelatedKeywordsFilterMixin
 from dook.api.news.verified.filters import NewsVerifiedFilter
 from dook.api.news.verified.serializers import NewsVerifiedSerializer
-from dook.core.news.models import Domain, News, Tag
+from dook.core.news.models import News
 
 
-class NewsVerifiedViewSet(GenericViewSet, ListModelMixin, RetrieveModelMixin):
+class NewsVerifiedViewSet(
+    RelatedKeywordsFilterMixin, GenericViewSet, ListModelMixin, RetrieveModelMixin
+):
     lookup_url_kwarg = "pk"
     serializer_class = NewsVerifiedSerializer
     permission_classes = (IsAuthenticated,)
     filterset_class = NewsVerifiedFilter
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, NewsSearchFilter]
     ordering_fields = ["reported_at"]
     ordering = ["-reported_at"]
     search_fields = ["text"]
@@ -27,19 +30,10 @@ class NewsVerifiedViewSet(GenericViewSet, ListModelMixin, RetrieveModelMixin):
             .with_assigned_to_me(self.request.user)
             .with_verdicts()
             .filter(current_verdict__in=["true", "false", "unidentified"])
-            .with_is_duplicate()
         )
 
-        domains = self.request.query_params.getlist("domains[]")
-        if domains:
-            qs = qs.filter_by_related_domains(
-                domains=[get_object_or_404(Domain, name=domain) for domain in domains]
-            )
+        qs = self.filter_by_domains(qs)
 
-        tags = self.request.query_params.getlist("tags[]")
-        if tags:
-            qs = qs.filter_by_related_tags(
-                tags=[get_object_or_404(Tag, name=name) for name in tags]
-            )
+        qs = self.filter_by_tags(qs)
 
         return qs
@@ -1,15 +1,230 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
 from collections import OrderedDict
 
-from rest_framework.pagination import PageNumberPagination
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    _positive_int,
+)
 from rest_framework.response import Response
 
 
+class KeysetCursorPagination(BasePagination):
+    """
+    Paginates by comparing ordering field values of the last seen row instead of
+    using OFFSET, so every page costs the same and no COUNT(*) is run.
+
+    Keyset fields are taken from the ordering applied to the queryset (eg.
+    `-reported_at`), with `id` appended as a tiebreaker. NULLs of nullable fields
+    are ordered as larger than any value on every database.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    tiebreaker = "id"
+
+    def __init__(self, page_size, page_size_query_param, max_page_size):
+        self.page_size = page_size
+        self.page_size_query_param = page_size_query_param
+        self.max_page_size = max_page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        self.nullable = {
+            field.lstrip("-")
+            for field in self.ordering
+            if self.is_nullable(queryset, field.lstrip("-"))
+        }
+
+        position, reverse = self.decode_cursor(request, queryset)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position, reverse))
+
+        ordering = [self.get_order_by(field, reverse) for field in self.ordering]
+        results = list(queryset.order_by(*ordering)[: self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[: self.limit]
+        if reverse:
+            results.reverse()
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if results:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(results[-1], reverse=False)
+            if position is not None and (has_more or not reverse):
+                self.previous_cursor = self.encode_cursor(results[0], reverse=True)
+
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.next_cursor),
+                    ("previous", self.previous_cursor),
+                    ("page_size", self.limit),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+
+        return self.page_size
+
+    def get_ordering(self, queryset, view):
+        ordering = list(queryset.query.order_by) or list(
+            getattr(view, "ordering", None) or []
+        )
+        ordering = [
+            field for field in ordering if isinstance(field, str) and field != "?"
+        ]
+        if not ordering:
+            ordering = [f"-{self.tiebreaker}"]
+
+        if all(field.lstrip("-") not in (self.tiebreaker, "pk") for field in ordering):
+            descending = ordering[-1].startswith("-")
+            ordering.append(f"-{self.tiebreaker}" if descending else self.tiebreaker)
+
+        return ordering
+
+    def get_order_by(self, field, reverse):
+        name = field.lstrip("-")
+        descending = field.startswith("-") != reverse
+        if name not in self.nullable:
+            return f"-{name}" if descending else name
+
+        if descending:
+            return F(name).desc(nulls_first=True)
+        return F(name).asc(nulls_last=True)
+
+    def get_keyset_filter(self, position, reverse):
+        """
+        Builds (a < x) OR (a = x AND b < y) OR ... for the keyset fields, with
+        comparison direction following the ordering of each field.
+        """
+        keyset_filter = Q()
+        equal_so_far = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            keyset_filter |= equal_so_far & self.get_after_filter(name, value, descending)
+            equal_so_far &= Q(
+                **{f"{name}__isnull": True} if value is None else {name: value}
+            )
+
+        return keyset_filter
+
+    @staticmethod
+    def get_after_filter(name, value, descending):
+        """
+        Matches rows ordered after the value, with NULLs being the largest.
+        """
+        if value is None:
+            # NULLs come first only in descending order
+            return Q(**{f"{name}__isnull": False}) if descending else Q(pk__in=[])
+        if descending:
+            return Q(**{f"{name}__lt": value})
+        return Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+
+    def encode_cursor(self, instance, reverse):
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            if value is not None:
+                value = value.isoformat() if hasattr(value, "isoformat") else str(value)
+            position.append(value)
+
+        payload = json.dumps({"p": position, "r": int(reverse)}, separators=(",", ":"))
+        return b64encode(payload.encode("utf-8"), altchars=b"-_").decode("ascii")
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii"), altchars=b"-_"))
+            position, reverse = payload["p"], bool(payload["r"])
+            if len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.get_output_field(queryset, field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (
+            BinasciiError,
+            FieldDoesNotExist,
+            KeyError,
+            TypeError,
+            UnicodeError,
+            ValidationError,
+            ValueError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    @classmethod
+    def is_nullable(cls, queryset, name):
+        # annotations like Max() give NULL for rows without related rows
+        if name in queryset.query.annotations:
+            return True
+        try:
+            return cls.get_output_field(queryset, name).null
+        except FieldDoesNotExist:
+            return True
+
+    @staticmethod
+    def get_output_field(queryset, name):
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+
+        if name == "pk":
+            return queryset.model._meta.pk
+        return queryset.model._meta.get_field(name)
+
+
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 200
 
+    pagination_query_param = "pagination"
+    cursor_pagination_class = KeysetCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.is_cursor_mode(request):
+            self.cursor_paginator = self.cursor_pagination_class(
+                self.page_size, self.page_size_query_param, self.max_page_size
+            )
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+
         return Response(
             OrderedDict(
                 [
@@ -20,3 +235,10 @@ class CustomPageNumberPagination(PageNumberPagination):
                 ]
             )
         )
+
+    def is_cursor_mode(self, request):
+        cursor_query_param = self.cursor_pagination_class.cursor_query_param
+        return (
+            request.query_params.get(self.pagination_query_param) == "cursor"
+            or cursor_query_param in request.query_params
+        )
@@ -19,7 +19,10 @@ class NewsSerializerBase(serializers.ModelSerializer):
             "comment",
             "origin",
             "reported_at",
+            "screenshot_thumbnail_url",
+            "screenshot_thumbnail_webp_url",
             "screenshot_url",
+            "screenshot_webp_url",
             "text",
             "url",
         )
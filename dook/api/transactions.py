@@ -0,0 +1,94 @@
+import enum
+import re
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections, transaction
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+WRITE_STATEMENT = re.compile(
+    r"^\s*(INSERT|UPDATE|DELETE|CREATE|ALTER|DROP|TRUNCATE)\b|\bFOR\s+UPDATE\b",
+    re.IGNORECASE,
+)
+
+
+class TransactionPolicy(enum.Enum):
+    # the whole view runs in one transaction, rolled back on errors
+    ATOMIC = "atomic"
+    # no transaction and no writes, each read sees committed data anyway
+    READ_ONLY = "read_only"
+    # no transaction, each write commits on its own
+    AUTOCOMMIT = "autocommit"
+
+
+class ReadOnlyViewWriteError(RuntimeError):
+    pass
+
+
+def get_transaction_policy(view_func, method):
+    """
+    Returns the policy the view declares for the method in its
+    `transaction_policies` mapping, or the default one of the method.
+    """
+    view = getattr(view_func, "cls", view_func)
+    policies = getattr(view, "transaction_policies", {})
+    if method in policies:
+        return policies[method]
+
+    return (
+        TransactionPolicy.READ_ONLY
+        if method in SAFE_METHODS
+        else TransactionPolicy.ATOMIC
+    )
+
+
+def read_only_guard(execute, sql, params, many, context):
+    if WRITE_STATEMENT.search(sql):
+        raise ReadOnlyViewWriteError(
+            f"Write in a view with read only transaction policy: {sql}"
+        )
+    return execute(sql, params, many, context)
+
+
+class TransactionPolicyMiddleware:
+    """
+    Calls views with their transaction policy, in place of ATOMIC_REQUESTS
+    wrapping every request in a transaction. Databases with ATOMIC_REQUESTS
+    get transactions only for ATOMIC views, with TRANSACTION_POLICY_GUARD
+    writes of READ_ONLY views raise ReadOnlyViewWriteError.
+
+    Has to be the last middleware with process_view, as it calls the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        policy = get_transaction_policy(view_func, request.method)
+        databases = [
+            connection.alias
+            for connection in connections.all()
+            if connection.settings_dict["ATOMIC_REQUESTS"]
+        ]
+
+        with ExitStack() as stack:
+            for alias in databases:
+                # views called in a transaction, eg. in tests, get a savepoint,
+                # so rolling back their errors does not break the transaction
+                if (
+                    policy == TransactionPolicy.ATOMIC
+                    or connections[alias].in_atomic_block
+                ):
+                    stack.enter_context(transaction.atomic(using=alias))
+
+            if (
+                policy == TransactionPolicy.READ_ONLY
+                and settings.TRANSACTION_POLICY_GUARD
+            ):
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(read_only_guard))
+
+            return view_func(request, *view_args, **view_kwargs)
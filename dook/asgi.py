@@ -0,0 +1,20 @@
+"""
+ASGI config for sfnf-panel project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+"""
+
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "dook.settings")
+
+django.setup(set_prefix=False)
+
+from dook.api.asgi import PooledASGIHandler  # noqa: E402 isort:skip
+
+application = PooledASGIHandler()
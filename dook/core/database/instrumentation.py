@@ -0,0 +1,226 @@
+import functools
+import heapq
+import inspect
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections, models
+
+NO_ORIGIN = "-"
+
+_local = threading.local()
+
+
+def _get_origins():
+    if not hasattr(_local, "origins"):
+        _local.origins = []
+    return _local.origins
+
+
+def _get_recorders():
+    if not hasattr(_local, "recorders"):
+        _local.recorders = []
+    return _local.recorders
+
+
+def get_query_origin():
+    """ Returns the queryset method innermost in building the running query. """
+    origins = _get_origins()
+    return origins[-1] if origins else NO_ORIGIN
+
+
+@contextmanager
+def query_origin(origin):
+    origins = _get_origins()
+    origins.append(origin)
+    try:
+        yield
+    finally:
+        origins.pop()
+
+
+def get_active_recorder():
+    """ Returns the innermost recorder of this thread, eg. to share it with workers. """
+    recorders = _get_recorders()
+    return recorders[-1] if recorders else None
+
+
+class QueryRecorder:
+    """
+    Execute wrapper counting queries and their time, with the slowest
+    statements and the count per origin, ie. the queryset method building
+    them. One recorder may be installed in many threads at once.
+    """
+
+    def __init__(self, slowest_count=3):
+        self.slowest_count = slowest_count
+        self.lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+        self.origins = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        origin = get_query_origin()
+        started_at = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.monotonic() - started_at, origin)
+
+    def record(self, sql, duration, origin):
+        with self.lock:
+            self.count += 1
+            self.duration += duration
+            self.origins[origin] += 1
+            # min heap of the slowest statements, the counter breaks ties
+            entry = (duration, self.count, sql, origin)
+            if len(self.slowest) < self.slowest_count:
+                heapq.heappush(self.slowest, entry)
+            elif self.slowest and duration > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    def get_slowest(self):
+        with self.lock:
+            return [
+                (duration, sql, origin)
+                for duration, _, sql, origin in sorted(self.slowest, reverse=True)
+            ]
+
+    def summary(self):
+        origins = ", ".join(
+            f"{origin}={count}" for origin, count in self.origins.most_common()
+        )
+        slowest = "; ".join(
+            f"{duration * 1000:.1f}ms [{origin}] {sql[:200]}"
+            for duration, sql, origin in self.get_slowest()
+        )
+        return (
+            f"{self.count} queries in {self.duration * 1000:.1f}ms "
+            f"by origin: {origins or NO_ORIGIN}, slowest: {slowest or NO_ORIGIN}"
+        )
+
+
+@contextmanager
+def record_queries(recorder=None):
+    """
+    Records queries of this thread on all databases with the given recorder,
+    or a new one.
+    """
+    recorder = recorder or QueryRecorder()
+    recorders = _get_recorders()
+    recorders.append(recorder)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            yield recorder
+    finally:
+        recorders.pop()
+
+
+@contextmanager
+def log_queries(logger, label):
+    """
+    Records queries of the block and logs them with the label, with
+    QUERY_INSTRUMENTATION.
+    """
+    if not settings.QUERY_INSTRUMENTATION:
+        yield None
+        return
+
+    recorder = QueryRecorder(slowest_count=settings.QUERY_INSTRUMENTATION_SLOWEST)
+    try:
+        with record_queries(recorder):
+            yield recorder
+    finally:
+        logger.info(f"{label}: {recorder.summary()}")
+
+
+def _with_origin(origin, method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # only calls from outside of instrumented methods label their querysets
+        is_outermost = not _get_origins()
+        with query_origin(origin):
+            result = method(self, *args, **kwargs)
+        if (
+            is_outermost
+            and isinstance(result, InstrumentedQuerySet)
+            and result._query_origin is None
+        ):
+            result._query_origin = origin
+        return result
+
+    return wrapper
+
+
+def instrument_query_origins(cls):
+    """
+    Labels public methods defined on the class with "<class>.<method>": queries
+    they run and querysets they return, when not called by another labeled
+    method, are attributed to them.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.isfunction(attribute):
+            continue
+        setattr(cls, name, _with_origin(f"{cls.__name__}.{name}", attribute))
+    return cls
+
+
+class InstrumentedQuerySet(models.QuerySet):
+    """
+    QuerySet whose subclass methods are the origin of queries they build,
+    see QueryRecorder. The first labeled method building a queryset stays its
+    origin through chained calls.
+    """
+
+    _query_origin = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_query_origins(cls)
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._query_origin = self._query_origin
+        return clone
+
+    @contextmanager
+    def _executing(self):
+        if self._query_origin is None:
+            yield
+        else:
+            with query_origin(self._query_origin):
+                yield
+
+    def _fetch_all(self):
+        with self._executing():
+            super()._fetch_all()
+
+    def count(self):
+        with self._executing():
+            return super().count()
+
+    def exists(self):
+        with self._executing():
+            return super().exists()
+
+    def aggregate(self, *args, **kwargs):
+        with self._executing():
+            return super().aggregate(*args, **kwargs)
+
+    def update(self, **kwargs):
+        with self._executing():
+            return super().update(**kwargs)
+
+    def delete(self):
+        with self._executing():
+            return super().delete()
+
+    update.alters_data = True
+    delete.alters_data = True
+    delete.queryset_only = True
@@ -0,0 +1,236 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+DEFAULT_POOL_OPTIONS = {
+    "MAX_SIZE": 10,
+    "TIMEOUT": 10.0,
+    "MAX_LIFETIME": 1800,
+    "HEALTH_CHECK": True,
+    "STATS_LOG_INTERVAL": 300,
+}
+
+
+class ConnectionPool:
+    """
+    Bounded pool of psycopg2 connections of one database alias, shared by
+    threads of a process. Checked out connections are health checked, and
+    connections broken, left in a transaction or older than MAX_LIFETIME are
+    evicted on check in. Checking out waits up to TIMEOUT seconds for a free
+    connection once MAX_SIZE connections are open.
+    """
+
+    def __init__(self, alias, options=None):
+        self.alias = alias
+        self.options = {**DEFAULT_POOL_OPTIONS, **(options or {})}
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+        self.idle = deque()
+        self.created_at = {}
+        self.size = 0
+        self.stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "connects": 0,
+            "evictions": 0,
+        }
+        self.stats_logged_at = time.monotonic()
+        self.logger = logging.getLogger("database")
+
+    def checkout(self, connect):
+        """
+        Returns an idle healthy connection or a new one made by `connect`.
+        Raises psycopg2.OperationalError when none is free in time.
+        """
+        deadline = time.monotonic() + self.options["TIMEOUT"]
+        waited = False
+
+        with self.condition:
+            while True:
+                connection = self._pop_idle()
+                if connection is not None:
+                    break
+
+                if self.size < self.options["MAX_SIZE"]:
+                    # reserved now, connected outside of the lock
+                    self.size += 1
+                    break
+
+                if not waited:
+                    waited = True
+                    self.stats["waits"] += 1
+                    wait_started_at = time.monotonic()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    self.stats["wait_seconds"] += time.monotonic() - wait_started_at
+                    raise psycopg2.OperationalError(
+                        f"No free connection to {self.alias} in "
+                        f"{self.options['TIMEOUT']} seconds, "
+                        f"all {self.options['MAX_SIZE']} are in use"
+                    )
+                self.condition.wait(remaining)
+
+            if waited:
+                self.stats["wait_seconds"] += time.monotonic() - wait_started_at
+            self.stats["checkouts"] += 1
+
+        if connection is None:
+            connection = self._connect(connect)
+        elif not self._is_healthy(connection):
+            self._evict(connection)
+            with self.condition:
+                self.stats["checkouts"] -= 1
+            return self.checkout(connect)
+
+        return connection
+
+    def checkin(self, connection, discard=False):
+        if discard or not self._is_reusable(connection):
+            self._evict(connection)
+            return
+
+        with self.condition:
+            self.idle.append(connection)
+            self.condition.notify()
+        self._log_stats()
+
+    def close_idle(self):
+        with self.condition:
+            idle = list(self.idle)
+            self.idle.clear()
+        for connection in idle:
+            self._evict(connection)
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                **self.stats,
+                "size": self.size,
+                "idle": len(self.idle),
+                "in_use": self.size - len(self.idle),
+                "max_size": self.options["MAX_SIZE"],
+            }
+
+    def _pop_idle(self):
+        # most recently used first, so surplus connections age out
+        return self.idle.pop() if self.idle else None
+
+    def _connect(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            self._release_slot()
+            raise
+
+        with self.condition:
+            self.stats["connects"] += 1
+            self.created_at[id(connection)] = time.monotonic()
+        return connection
+
+    def _is_healthy(self, connection):
+        if connection.closed:
+            return False
+        if not self.options["HEALTH_CHECK"]:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except psycopg2.Error:
+            return False
+        return True
+
+    def _is_reusable(self, connection):
+        if connection.closed:
+            return False
+
+        age = time.monotonic() - self.created_at.get(id(connection), 0)
+        if age > self.options["MAX_LIFETIME"]:
+            return False
+
+        status = connection.get_transaction_status()
+        if status == extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status in (
+            extensions.TRANSACTION_STATUS_INTRANS,
+            extensions.TRANSACTION_STATUS_INERROR,
+        ):
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                return False
+            return True
+        return False
+
+    def _evict(self, connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+        with self.condition:
+            self.stats["evictions"] += 1
+            self.created_at.pop(id(connection), None)
+        self._release_slot()
+
+    def _release_slot(self):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def _log_stats(self):
+        now = time.monotonic()
+        if now - self.stats_logged_at < self.options["STATS_LOG_INTERVAL"]:
+            return
+
+        self.stats_logged_at = now
+        stats = " ".join(f"{name}={value}" for name, value in self.get_stats().items())
+        self.logger.info(f"Connection pool {self.alias}: {stats}")
+
+
+_pools = {}
+_inherited_pools = []
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(alias, conn_params, options=None):
+    """
+    Returns the pool of the alias connecting with `conn_params`, eg. the test
+    database gets its own pool while its alias is switched to it.
+    """
+    key = (
+        alias,
+        tuple(sorted((name, str(value)) for name, value in conn_params.items())),
+    )
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is not None and pool.pid != os.getpid():
+            # connections inherited from a parent process belong to the parent,
+            # they are kept referenced so they are not closed in this one
+            _inherited_pools.append(pool)
+            pool = None
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(alias, options)
+        return pool
+
+
+def close_idle_connections(alias):
+    """ Closes idle pooled connections of the alias, eg. before dropping its database. """
+    with _pools_lock:
+        pools = [pool for (pool_alias, _), pool in _pools.items() if pool_alias == alias]
+    for pool in pools:
+        pool.close_idle()
+
+
+def get_connection_pools_stats():
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [{"alias": pool.alias, **pool.get_stats()} for pool in pools]
@@ -0,0 +1,44 @@
+from functools import partial
+
+from django.db.backends.postgresql import base, creation
+
+from dook.core.database.pool import close_idle_connections, get_connection_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # pooled connections to the test database would block dropping it
+        close_idle_connections(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend taking connections from a per process pool configured
+    by the POOL database setting. Closing a connection, eg. at the end of a
+    request, checks it back in instead of disconnecting.
+    """
+
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_connection_pool(
+            self.alias, conn_params, self.settings_dict.get("POOL")
+        )
+        connection = self.pool.checkout(partial(super().get_new_connection, conn_params))
+        # set by the parent class only on new connections
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # closed in a transaction the connection stays referenced here
+                # until the next connect, so it can not be reused meanwhile
+                self.pool.checkin(self.connection, discard=self.in_atomic_block)
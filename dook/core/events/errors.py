@@ -1 +1,2 @@
 EVENT_SUBSCRIBER_NOT_FOUND_ERROR = "Event subscriber not found <{}>"
+EVENT_OBJECT_NOT_FOUND_ERROR = "Event object not found <{}>"
@@ -0,0 +1,5 @@
+class SubscriberUnavailableError(Exception):
+    """
+    Raised by subscribers skipping delivery without trying, eg. while their
+    circuit breaker is open. Events are rescheduled without using up an attempt.
+    """
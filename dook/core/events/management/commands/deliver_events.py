@@ -0,0 +1,64 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dook.core.events.models import OutboxEvent
+from dook.core.events.outbox import OutboxDelivery, OutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Delivers outbox events to their subscribers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep running and deliver events as they become due",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=None,
+            help="Seconds between polls when the outbox is drained (daemon mode)",
+        )
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            default=None,
+            help="Delete events delivered more than the given number of days ago",
+        )
+        parser.add_argument(
+            "--stats", action="store_true", help="Print undelivered events per subscriber"
+        )
+
+    def handle(self, *args, **options):
+        if options["purge_days"] is not None:
+            deleted, _ = OutboxEvent.objects.delivered_before(
+                timezone.now() - datetime.timedelta(days=options["purge_days"])
+            ).delete()
+            self.stdout.write(f"Deleted {deleted} delivered events")
+
+        if options["stats"]:
+            self.print_stats()
+            return
+
+        if options["daemon"]:
+            OutboxWorker(
+                batch_size=options["batch_size"], poll_interval=options["poll_interval"]
+            ).run()
+            return
+
+        delivered = OutboxDelivery(batch_size=options["batch_size"]).deliver_all()
+        self.stdout.write(f"Handled {delivered} events")
+
+    def print_stats(self):
+        now = timezone.now()
+        for row in OutboxEvent.objects.lag_by_subscriber():
+            oldest_pending_at = row["oldest_pending_at"]
+            lag = (now - oldest_pending_at).total_seconds() if oldest_pending_at else 0
+            self.stdout.write(
+                f"{row['subscriber']}: {row['pending_count']} pending, "
+                f"{row['dead_count']} dead, lag {lag:.0f}s"
+            )
@@ -0,0 +1,61 @@
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from dook.core.events.constants import OutboxEventStatus
+
+
+class OutboxEventQuerySet(models.QuerySet):
+    def due(self):
+        return self.filter(
+            status=OutboxEventStatus.PENDING, available_at__lte=timezone.now()
+        )
+
+    def claim_due(self):
+        """
+        Locks due events on the primary, oldest first, skipping events already
+        locked by other workers. Has to be evaluated in a transaction.
+        """
+        return (
+            self.using("default")
+            .select_for_update(skip_locked=True)
+            .due()
+            .order_by("available_at", "id")
+        )
+
+    def delivered_before(self, moment):
+        return self.filter(status=OutboxEventStatus.DELIVERED, delivered_at__lt=moment)
+
+    def lag_by_subscriber(self):
+        """
+        Returns pending and dead events count and the oldest pending event
+        creation time of every subscriber with undelivered events.
+        """
+        pending = Q(status=OutboxEventStatus.PENDING)
+        return (
+            self.exclude(status=OutboxEventStatus.DELIVERED)
+            .order_by("subscriber")
+            .values("subscriber")
+            .annotate(
+                pending_count=Count("id", filter=pending),
+                dead_count=Count("id", filter=Q(status=OutboxEventStatus.DEAD)),
+                oldest_pending_at=Min("created_at", filter=pending),
+            )
+        )
+
+
+class OutboxEventManager(models.Manager.from_queryset(OutboxEventQuerySet)):
+    def enqueue(self, event_name, subscriber, obj, args=(), kwargs=None):
+        return self.create(
+            event_name=event_name,
+            subscriber=subscriber,
+            content_type=ContentType.objects.get_for_model(obj),
+            object_id=str(obj.pk),
+            arguments=json.dumps(
+                {"args": list(args), "kwargs": kwargs or {}}, cls=DjangoJSONEncoder
+            ),
+        )
@@ -0,0 +1,77 @@
+import datetime
+import json
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+from dook.core.events.constants import OutboxEventStatus
+from dook.core.events.managers import OutboxEventManager
+
+
+class OutboxEvent(models.Model):
+    """
+    Event waiting for delivery to a single subscriber. Written in the
+    transaction emitting the event, so rolled back events are never delivered.
+    """
+
+    objects = OutboxEventManager()
+
+    event_name = models.CharField(max_length=100)
+    subscriber = models.CharField(max_length=255, db_index=True)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=64)
+    arguments = models.TextField(default="{}")
+
+    status = models.CharField(
+        max_length=30,
+        choices=OutboxEventStatus.choices,
+        default=OutboxEventStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, default=None)
+
+    class Meta:
+        db_table = "outbox_event"
+        indexes = [models.Index(fields=["status", "available_at"])]
+
+    def __str__(self):
+        return f"{self.event_name} -> {self.subscriber} ({self.status})"
+
+    def get_arguments(self):
+        arguments = json.loads(self.arguments)
+        return arguments.get("args", []), arguments.get("kwargs", {})
+
+    def mark_delivered(self):
+        self.status = OutboxEventStatus.DELIVERED
+        self.attempts += 1
+        self.delivered_at = timezone.now()
+        self.last_error = ""
+
+    def mark_failed(self, error, retry=True):
+        self.attempts += 1
+        self.last_error = error
+
+        if not retry or self.attempts >= settings.EVENTS_OUTBOX_MAX_ATTEMPTS:
+            self.status = OutboxEventStatus.DEAD
+        else:
+            self.available_at = timezone.now() + self.get_retry_delay()
+
+    def mark_postponed(self, error):
+        # the subscriber did not try, so no attempt is used up
+        self.last_error = error
+        self.available_at = timezone.now() + datetime.timedelta(
+            seconds=settings.EVENTS_OUTBOX_RETRY_DELAY
+        )
+
+    def get_retry_delay(self):
+        # exponential backoff: base delay doubled after every failed attempt
+        delay = settings.EVENTS_OUTBOX_RETRY_DELAY * 2 ** (self.attempts - 1)
+        return datetime.timedelta(
+            seconds=min(delay, settings.EVENTS_OUTBOX_MAX_RETRY_DELAY)
+        )
@@ -0,0 +1,245 @@
+import datetime
+import logging
+import signal
+import threading
+import time
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from pydoc import locate
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+
+from dook.core.events.errors import (
+    EVENT_OBJECT_NOT_FOUND_ERROR,
+    EVENT_SUBSCRIBER_NOT_FOUND_ERROR,
+)
+from dook.core.events.exceptions import SubscriberUnavailableError
+from dook.core.events.models import OutboxEvent
+
+_delivery = threading.local()
+
+
+def is_outbox_delivery():
+    """
+    Tells whether subscribers are called by the outbox worker, which retries
+    their failures, instead of right away by the event.
+    """
+    return getattr(_delivery, "active", False)
+
+
+@contextmanager
+def outbox_delivery():
+    _delivery.active = True
+    try:
+        yield
+    finally:
+        _delivery.active = False
+
+
+class OutboxDelivery:
+    """
+    Delivers outbox events to their subscribers in batches. Events are
+    delivered at least once: a batch interrupted before its results are
+    recorded is delivered again when its lease ends.
+    """
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or settings.EVENTS_OUTBOX_BATCH_SIZE
+        self.events = OutboxEvent.objects
+        self.logger = logging.getLogger("events")
+
+    def deliver_batch(self):
+        """
+        Delivers one batch of due events and returns the number of events
+        handled, successfully or not.
+        """
+        outbox_events = self.claim_batch()
+        if not outbox_events:
+            return 0
+
+        objects = self.get_objects(outbox_events)
+        for subscriber_path, subscriber_events in self.group_by_subscriber(
+            outbox_events
+        ).items():
+            self.deliver(subscriber_path, subscriber_events, objects)
+
+        self.events.bulk_update(
+            outbox_events,
+            ["status", "attempts", "last_error", "available_at", "delivered_at"],
+        )
+
+        return len(outbox_events)
+
+    def claim_batch(self):
+        """
+        Leases a batch of due events for EVENTS_OUTBOX_LEASE seconds, so they
+        are delivered outside of a transaction while other workers skip them.
+        """
+        lease_until = timezone.now() + datetime.timedelta(
+            seconds=settings.EVENTS_OUTBOX_LEASE
+        )
+        with transaction.atomic(using="default"):
+            outbox_events = list(self.events.claim_due()[: self.batch_size])
+            self.events.using("default").filter(
+                id__in=[outbox_event.id for outbox_event in outbox_events]
+            ).update(available_at=lease_until)
+
+        for outbox_event in outbox_events:
+            outbox_event.available_at = lease_until
+        return outbox_events
+
+    def deliver_all(self):
+        delivered = 0
+        while True:
+            batch_delivered = self.deliver_batch()
+            delivered += batch_delivered
+            if batch_delivered < self.batch_size:
+                return delivered
+
+    def get_objects(self, outbox_events):
+        """
+        Loads objects of all events with one query per model.
+        """
+        object_ids = defaultdict(set)
+        for outbox_event in outbox_events:
+            object_ids[outbox_event.content_type_id].add(outbox_event.object_id)
+
+        objects = {}
+        for content_type_id, ids in object_ids.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            for pk, obj in model._default_manager.in_bulk(ids).items():
+                objects[content_type_id, str(pk)] = obj
+
+        return objects
+
+    def group_by_subscriber(self, outbox_events):
+        grouped = defaultdict(list)
+        for outbox_event in outbox_events:
+            grouped[outbox_event.subscriber].append(outbox_event)
+        return grouped
+
+    def deliver(self, subscriber_path, outbox_events, objects):
+        """
+        Delivers events of a single subscriber, all in one receive_batch()
+        call when the subscriber supports batches.
+        """
+        subscriber = locate(subscriber_path)
+        if subscriber is None:
+            for outbox_event in outbox_events:
+                outbox_event.mark_failed(
+                    EVENT_SUBSCRIBER_NOT_FOUND_ERROR.format(subscriber_path), retry=False
+                )
+            return
+
+        deliverable = []
+        for outbox_event in outbox_events:
+            obj = objects.get((outbox_event.content_type_id, outbox_event.object_id))
+            if obj is None:
+                outbox_event.mark_failed(
+                    EVENT_OBJECT_NOT_FOUND_ERROR.format(outbox_event.object_id),
+                    retry=False,
+                )
+            else:
+                deliverable.append((outbox_event, obj))
+
+        if len(deliverable) > 1 and hasattr(subscriber, "receive_batch"):
+            self.call_subscriber(
+                [outbox_event for outbox_event, _ in deliverable],
+                subscriber.receive_batch,
+                [
+                    (obj, *outbox_event.get_arguments())
+                    for outbox_event, obj in deliverable
+                ],
+            )
+            return
+
+        for outbox_event, obj in deliverable:
+            args, kwargs = outbox_event.get_arguments()
+            self.call_subscriber([outbox_event], subscriber.receive, obj, *args, **kwargs)
+
+    def call_subscriber(self, outbox_events, receive, *args, **kwargs):
+        try:
+            # subscriber database changes are rolled back with its failure only
+            with outbox_delivery(), transaction.atomic(using="default"):
+                receive(*args, **kwargs)
+        except SubscriberUnavailableError as e:
+            self.logger.warning(
+                f"Postponed {len(outbox_events)} events to "
+                f"{outbox_events[0].subscriber}: {e}"
+            )
+            for outbox_event in outbox_events:
+                outbox_event.mark_postponed(str(e))
+        except Exception:
+            self.logger.exception(
+                f"Delivering {len(outbox_events)} events to "
+                f"{outbox_events[0].subscriber} failed"
+            )
+            error = traceback.format_exc()
+            for outbox_event in outbox_events:
+                outbox_event.mark_failed(error)
+        else:
+            for outbox_event in outbox_events:
+                outbox_event.mark_delivered()
+
+    def log_stats(self):
+        now = timezone.now()
+        for row in self.events.lag_by_subscriber():
+            oldest_pending_at = row["oldest_pending_at"]
+            lag = (now - oldest_pending_at).total_seconds() if oldest_pending_at else 0
+            self.logger.info(
+                f"Outbox subscriber {row['subscriber']}: "
+                f"{row['pending_count']} pending, {row['dead_count']} dead, "
+                f"lag {lag:.0f}s"
+            )
+
+
+class OutboxWorker:
+    """
+    Keeps running a delivery, outbox events by default, waiting poll interval
+    whenever there is nothing due. Stops after the current batch on SIGTERM
+    or SIGINT.
+    """
+
+    def __init__(self, delivery=None, batch_size=None, poll_interval=None):
+        self.delivery = delivery or OutboxDelivery(batch_size=batch_size)
+        self.poll_interval = poll_interval or settings.EVENTS_OUTBOX_POLL_INTERVAL
+        self.stopping = threading.Event()
+        self.logger = self.delivery.logger
+
+    def run(self):
+        previous_handlers = {
+            signum: signal.signal(signum, self.handle_stop_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        self.logger.info(f"{type(self.delivery).__name__} worker started")
+        last_stats_logged_at = 0
+
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                try:
+                    delivered = self.delivery.deliver_batch()
+                    if time.monotonic() - last_stats_logged_at >= self.poll_interval:
+                        self.delivery.log_stats()
+                        last_stats_logged_at = time.monotonic()
+                except Exception:
+                    self.logger.exception("Delivery failed")
+                    delivered = 0
+                close_old_connections()
+
+                if delivered < self.delivery.batch_size:
+                    self.stopping.wait(self.poll_interval)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            connections.close_all()
+
+        self.logger.info(f"{type(self.delivery).__name__} worker stopped")
+
+    def handle_stop_signal(self, signum, frame):
+        self.logger.info(f"Received signal {signum}, stopping after current batch")
+        self.stopping.set()
@@ -2,6 +2,8 @@ from pydoc import locate
 
 from django.conf import settings
 
+from dook.core.events.models import OutboxEvent
+
 
 class ModelEventService:
     def __init__(self, instance):
@@ -9,4 +11,11 @@ class ModelEventService:
 
     def _send(self, event_name, *args, **kwargs):
         for subscriber_path in settings.EVENTS[event_name]:
-            locate(subscriber_path).receive(self.obj, *args, **kwargs)
+            subscriber = locate(subscriber_path)
+            if settings.EVENTS_OUTBOX and getattr(subscriber, "outbox", False):
+                # delivered by the deliver_events worker once the transaction commits
+                OutboxEvent.objects.enqueue(
+                    event_name, subscriber_path, self.obj, args, kwargs
+                )
+            else:
+                subscriber.receive(self.obj, *args, **kwargs)
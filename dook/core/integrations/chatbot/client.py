@@ -1,5 +1,63 @@
+import logging
+import threading
+
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from dook.core.integrations.chatbot.exceptions import (
+    ChatbotApiError,
+    ChatbotUnavailableError,
+)
+from dook.core.integrations.circuit_breaker import CircuitBreaker
+
+_session_lock = threading.Lock()
+_session = None
+_circuit_breaker = None
+
+
+def get_session():
+    """
+    Returns HTTP session shared by all chatbot API clients of the process, so
+    connections to the chatbot API are kept alive and reused.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=settings.CHATBOT_API_POOL_SIZE
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def get_circuit_breaker():
+    global _circuit_breaker
+
+    with _session_lock:
+        if _circuit_breaker is None:
+            _circuit_breaker = CircuitBreaker(
+                failure_threshold=settings.CHATBOT_API_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.CHATBOT_API_CIRCUIT_RESET_TIMEOUT,
+            )
+        return _circuit_breaker
+
+
+def reset_client_state():
+    """
+    Drops the shared session and circuit breaker, eg. after settings change.
+    """
+    global _session, _circuit_breaker
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _circuit_breaker = None
 
 
 class ApiClient:
@@ -7,10 +65,53 @@ class ApiClient:
         "x-api-key": settings.CHATBOT_API_KEY,
     }
 
+    def __init__(self):
+        self.session = get_session()
+        self.circuit_breaker = get_circuit_breaker()
+        self.logger = logging.getLogger("chatbot")
+
     def _send(self, data, path=""):
-        requests.post(
-            f"{settings.CHATBOT_API_URL}{path}", json=data, headers=self.headers
-        )
+        self.post(path, data)
+
+    def post(self, path, data):
+        """
+        POSTs JSON data to the chatbot API. Raises ChatbotApiError when the
+        request fails or times out, and ChatbotUnavailableError without
+        sending anything while the API is considered down.
+        """
+        if not self.circuit_breaker.allow_request():
+            raise ChatbotUnavailableError(f"Chatbot API is unavailable, skipped {path}")
+
+        try:
+            response = self.session.post(
+                f"{settings.CHATBOT_API_URL}{path}",
+                json=data,
+                headers=self.headers,
+                timeout=(
+                    settings.CHATBOT_API_CONNECT_TIMEOUT,
+                    settings.CHATBOT_API_READ_TIMEOUT,
+                ),
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            self.circuit_breaker.record_failure()
+            self.logger.warning(f"Chatbot API request to {path} failed: {e}")
+            raise ChatbotApiError(str(e)) from e
+
+        self.circuit_breaker.record_success()
+        return response
 
     def send_new_news_verdict(self, data):
         self._send(data, path="/news")
+
+    def send_news_verdicts(self, data_list):
+        """
+        Sends many news verdict events, in a single request to the batch
+        endpoint when it is enabled.
+        """
+        if settings.CHATBOT_API_BATCH:
+            self._send({"events": data_list}, path=settings.CHATBOT_API_BATCH_PATH)
+            return
+
+        for data in data_list:
+            self.send_new_news_verdict(data)
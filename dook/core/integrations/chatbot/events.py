@@ -1,14 +1,39 @@
+import logging
+
+from dook.core.events.outbox import is_outbox_delivery
+
 from .client import ApiClient
+from .exceptions import ChatbotApiError
 from .serializers import ChatbotNewsSerializer
 
+logger = logging.getLogger("chatbot")
+
 
 class ChatbotNewsBaseSubscriber:
     serializer = ChatbotNewsSerializer
+    outbox = True
 
     @classmethod
     def receive(cls, obj, *args, **kwargs):
-        data = {"type": cls.event_type, "data": cls.serializer(obj).data}
-        ApiClient().send_new_news_verdict(data)
+        try:
+            ApiClient().send_new_news_verdict(cls.get_data(obj))
+        except ChatbotApiError as e:
+            # only the outbox worker retries, opinions are saved regardless
+            if is_outbox_delivery():
+                raise
+            logger.warning(f"Chatbot {cls.event_type} event was not sent: {e}")
+
+    @classmethod
+    def receive_batch(cls, events):
+        ApiClient().send_news_verdicts([cls.get_data(obj) for obj, _, _ in events])
+
+    @classmethod
+    def get_data(cls, obj):
+        if not hasattr(obj, "_verdict"):
+            # news loaded by the outbox worker
+            obj.is_with_verdict()
+
+        return {"type": cls.event_type, "data": cls.serializer(obj).data}
 
 
 class ChatbotNewsNewVerdictSubscriber(ChatbotNewsBaseSubscriber):
@@ -0,0 +1,11 @@
+from dook.core.events.exceptions import SubscriberUnavailableError
+
+
+class ChatbotApiError(Exception):
+    pass
+
+
+class ChatbotUnavailableError(ChatbotApiError, SubscriberUnavailableError):
+    """
+    Raised without calling the chatbot API while its circuit breaker is open.
+    """
@@ -0,0 +1,115 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from dook.core.integrations.chatbot.client import ApiClient
+from dook.core.integrations.chatbot.events import ChatbotNewsNewVerdictSubscriber
+from dook.core.news.models import News
+
+
+class ChatbotResync:
+    """
+    Sends new verdict events of all news with a verdict to the chatbot API.
+    News are streamed in chunks ordered by pk, each chunk is sent in batches
+    by a bounded number of concurrent requests. The pk of the last fully sent
+    chunk is checkpointed, so an interrupted resync resumes where it stopped.
+    """
+
+    subscriber = ChatbotNewsNewVerdictSubscriber
+
+    def __init__(
+        self,
+        checkpoint_path=None,
+        chunk_size=None,
+        batch_size=None,
+        concurrency=None,
+        dry_run=False,
+    ):
+        self.checkpoint_path = checkpoint_path or settings.CHATBOT_RESYNC_CHECKPOINT
+        self.chunk_size = chunk_size or settings.CHATBOT_RESYNC_CHUNK_SIZE
+        self.batch_size = batch_size or settings.CHATBOT_RESYNC_BATCH_SIZE
+        self.concurrency = concurrency or settings.CHATBOT_RESYNC_CONCURRENCY
+        self.dry_run = dry_run
+        self.logger = logging.getLogger("chatbot")
+
+    def run(self, restart=False):
+        """
+        Sends all remaining news and returns the number of news sent in this
+        and previous runs. The checkpoint is removed once the resync is done.
+        """
+        checkpoint = {} if restart else self.load_checkpoint()
+        last_pk = checkpoint.get("last_pk")
+        sent = 0 if self.dry_run else checkpoint.get("sent", 0)
+        if last_pk:
+            self.logger.info(f"Resuming chatbot resync after news {last_pk}")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for chunk in self.iter_chunks(last_pk):
+                self.send_chunk(executor, chunk)
+                last_pk = str(chunk[-1].pk)
+                sent += len(chunk)
+                self.save_checkpoint({"last_pk": last_pk, "sent": sent})
+                self.logger.info(f"Chatbot resync sent {sent} news, last {last_pk}")
+
+        self.remove_checkpoint()
+        return sent
+
+    def iter_chunks(self, last_pk=None):
+        queryset = (
+            News.objects.filter_with_event_verdict()
+            .prefetch_related("factcheckeropinion_set", "expertopinion", "tags")
+            .order_by("pk")
+        )
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk[: self.chunk_size])
+            if not chunk:
+                return
+
+            yield chunk
+            last_pk = chunk[-1].pk
+
+    def send_chunk(self, executor, chunk):
+        # verdicts come from the loaded state, serializing does not hit the database
+        data_list = [self.subscriber.get_data(news) for news in chunk]
+        if self.dry_run:
+            return
+
+        batches = []
+        while data_list:
+            batches.append(data_list[: self.batch_size])
+            del data_list[: self.batch_size]
+        # raises the first failure, so the chunk is not checkpointed
+        list(executor.map(self.send_batch, batches))
+
+    def send_batch(self, data_list):
+        ApiClient().send_news_verdicts(data_list)
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as checkpoint_file:
+                return json.load(checkpoint_file)
+        except FileNotFoundError:
+            return {}
+
+    def save_checkpoint(self, checkpoint):
+        if self.dry_run:
+            return
+
+        # written aside and renamed, so an interruption never leaves a partial file
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def remove_checkpoint(self):
+        if self.dry_run:
+            return
+
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
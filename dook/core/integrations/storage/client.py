@@ -1,39 +1,156 @@
 import logging
+import mimetypes
+import threading
 from datetime import datetime
 
 from boto3 import client
-from botocore.exceptions import ClientError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from django.conf import settings
 
 from dook.core.integrations.storage.exceptions import StorageServiceInternalException
 
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+
+_client_lock = threading.Lock()
+_boto3_client = None
+
+
+def get_boto3_client():
+    """
+    Returns S3 client shared by the whole process. Creating a client is
+    expensive, while a created one is thread safe and pools its connections.
+    """
+    global _boto3_client
+
+    with _client_lock:
+        if _boto3_client is None:
+            _boto3_client = client(
+                "s3",
+                region_name=settings.REGION_NAME,
+                endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                config=Config(
+                    max_pool_connections=settings.AWS_S3_MAX_POOL_CONNECTIONS,
+                    connect_timeout=settings.AWS_S3_CONNECT_TIMEOUT,
+                    read_timeout=settings.AWS_S3_READ_TIMEOUT,
+                    retries={"max_attempts": settings.AWS_S3_MAX_RETRIES},
+                ),
+            )
+        return _boto3_client
+
+
+def reset_boto3_client():
+    """
+    Drops the shared client, eg. after settings change.
+    """
+    global _boto3_client
+
+    with _client_lock:
+        _boto3_client = None
+
+
+def get_transfer_config():
+    return TransferConfig(
+        multipart_threshold=settings.AWS_S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=settings.AWS_S3_MULTIPART_CHUNKSIZE,
+        max_concurrency=settings.AWS_S3_MAX_CONCURRENCY,
+    )
+
+
+def detect_content_type(file_object):
+    """
+    Returns content type of an uploaded file. Django image fields set it out
+    of the image format detected by Pillow, otherwise it is guessed from the
+    file name.
+    """
+    content_type = getattr(file_object, "content_type", None)
+    if not content_type:
+        content_type, _ = mimetypes.guess_type(getattr(file_object, "name", "") or "")
+
+    return content_type or DEFAULT_CONTENT_TYPE
+
 
 class S3ApiClient:
     def __init__(self):
-        self.boto3_client = client(
-            "s3",
-            region_name=settings.REGION_NAME,
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-        )
+        self.boto3_client = get_boto3_client()
         self.logger = logging.getLogger("s3-bucket")
 
     def upload_image(self, image_object, filename=None):
+        """
+        Streams the image to the bucket, in concurrently uploaded parts when
+        it is larger than AWS_S3_MULTIPART_THRESHOLD.
+        """
         if not filename:
             filename = self.generate_filename(type="image")
 
+        self.upload_file(image_object, filename, detect_content_type(image_object))
+        self.logger.info(f"Uploaded image to s3 bucket, image name: {filename}.")
+
+    def upload_file(self, file_object, filename, content_type):
         try:
             self.boto3_client.upload_fileobj(
-                image_object,
+                file_object,
                 settings.BUCKET_NAME,
                 filename,
-                ExtraArgs={"ContentType": "image/jpeg", "ACL": "public-read"},
+                ExtraArgs={"ContentType": content_type, "ACL": "public-read"},
+                Config=get_transfer_config(),
+            )
+        except (BotoCoreError, ClientError) as e:
+            self.logger.error(e)
+            raise StorageServiceInternalException
+
+    def download_file(self, object_name, file_object):
+        try:
+            self.boto3_client.download_fileobj(
+                settings.BUCKET_NAME,
+                object_name,
+                file_object,
+                Config=get_transfer_config(),
+            )
+        except (BotoCoreError, ClientError) as e:
+            self.logger.error(e)
+            raise StorageServiceInternalException
+
+    def generate_presigned_post(self, object_name, max_size, expires_in):
+        """
+        Returns URL and form fields, which let a client POST a public image
+        of at most max_size bytes straight to the bucket as object_name.
+        """
+        try:
+            return self.boto3_client.generate_presigned_post(
+                settings.BUCKET_NAME,
+                object_name,
+                Fields={"acl": "public-read"},
+                Conditions=[
+                    {"acl": "public-read"},
+                    ["starts-with", "$Content-Type", "image/"],
+                    ["content-length-range", 1, max_size],
+                ],
+                ExpiresIn=expires_in,
+            )
+        except (BotoCoreError, ClientError) as e:
+            self.logger.error(e)
+            raise StorageServiceInternalException
+
+    def get_object_metadata(self, object_name):
+        """
+        Returns HEAD response of the object, None when it does not exist.
+        """
+        try:
+            return self.boto3_client.head_object(
+                Bucket=settings.BUCKET_NAME, Key=object_name
             )
         except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            self.logger.error(e)
+            raise StorageServiceInternalException
+        except BotoCoreError as e:
             self.logger.error(e)
             raise StorageServiceInternalException
-        else:
-            self.logger.info(f"Uploaded image to s3 bucket, image name: {filename}.")
 
     def get_object_url(self, object_name):
         """Generate a presigned URL to share an S3 object
@@ -42,11 +159,25 @@ class S3ApiClient:
         :param object_name: string
         :return: Presigned URL as string. If error, returns None.
         """
+        if settings.AWS_S3_ENDPOINT_URL:
+            return f"{settings.AWS_S3_ENDPOINT_URL}/{settings.BUCKET_NAME}/{object_name}"
+
         # Generate an URL for the S3 object
         url = f"https://{settings.BUCKET_NAME}.s3.amazonaws.com/{object_name}"
 
         return url
 
+    def get_object_name(self, url):
+        """
+        Returns name of the bucket object the URL points to, None for URLs
+        outside of the bucket.
+        """
+        prefix = self.get_object_url("")
+        if not url.startswith(prefix) or len(url) == len(prefix):
+            return None
+
+        return url.replace(prefix, "", 1)
+
     def generate_filename(self, type="file"):
         time_stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         filename = f"{type}_{time_stamp}"
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from dook.core.routers import primary_reads
+
+PUBLISHED_FEED_KEY_PREFIX = "published_feed"
+PUBLISHED_FEED_GENERATION_KEY = f"{PUBLISHED_FEED_KEY_PREFIX}:generation"
+PUBLISHED_FEED_PARAMS = (
+    "is_pinned",
+    "tags[]",
+    "domains[]",
+    "ordering",
+    "page",
+    "page_size",
+    "pagination",
+    "cursor",
+)
+
+
+def is_published_feed_cache_enabled():
+    return bool(settings.PUBLISHED_FEED_CACHE_TIMEOUT and settings.CACHE_SHARED)
+
+
+def get_published_feed_generation():
+    generation = cache.get(PUBLISHED_FEED_GENERATION_KEY)
+    if generation is None:
+        cache.add(PUBLISHED_FEED_GENERATION_KEY, uuid4().hex, timeout=None)
+        generation = cache.get(PUBLISHED_FEED_GENERATION_KEY)
+
+    return generation
+
+
+def _bump_published_feed_generation():
+    cache.set(PUBLISHED_FEED_GENERATION_KEY, uuid4().hex, timeout=None)
+
+
+def invalidate_published_feed():
+    """
+    Drops all cached feed pages and news payloads at once by moving to a new
+    key generation; entries of the old one expire on their own.
+
+    The generation is moved again after commit, so a page rebuilt from not yet
+    committed data by a concurrent request is not served afterwards.
+    """
+    _bump_published_feed_generation()
+    transaction.on_commit(_bump_published_feed_generation)
+
+
+def build_published_feed_key(kind, query_params, **extra):
+    params = {
+        name: sorted(query_params.getlist(name))
+        for name in PUBLISHED_FEED_PARAMS
+        if name in query_params
+    }
+    params.update(extra)
+    digest = hashlib.md5(
+        json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+    return (
+        f"{PUBLISHED_FEED_KEY_PREFIX}:{get_published_feed_generation()}:{kind}:{digest}"
+    )
+
+
+def get_or_build_published_feed(key, build):
+    """
+    Returns cached payload or builds it with `build`. Only one caller builds
+    a missing payload, the others wait for it for up to
+    PUBLISHED_FEED_CACHE_LOCK_WAIT seconds before building it on their own.
+    Payloads are always built without CACHE_SHARED.
+    """
+    if not is_published_feed_cache_enabled():
+        return build()
+
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=settings.PUBLISHED_FEED_CACHE_LOCK_TIMEOUT):
+        try:
+            # a lagging replica would keep the cache stale for its whole timeout
+            with primary_reads():
+                payload = build()
+            cache.set(key, payload, timeout=settings.PUBLISHED_FEED_CACHE_TIMEOUT)
+        finally:
+            cache.delete(lock_key)
+
+        return payload
+
+    deadline = time.monotonic() + settings.PUBLISHED_FEED_CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(settings.PUBLISHED_FEED_CACHE_POLL_INTERVAL)
+        payload = cache.get(key)
+        if payload is not None:
+            return payload
+
+    with primary_reads():
+        return build()
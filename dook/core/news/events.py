@@ -1,5 +1,6 @@
 from dook.api.news.errors import EVENT_MISSING_VERDICT_ATTRIBUTE_ERROR
 from dook.core.events.services import ModelEventService
+from dook.core.news.screenshots import ScreenshotDerivativesGenerator
 
 
 class NewsEvents(ModelEventService):
@@ -14,3 +15,14 @@ class NewsEvents(ModelEventService):
             raise AttributeError(EVENT_MISSING_VERDICT_ATTRIBUTE_ERROR)
 
         self._send("news_edit_verdict", *args, **kwargs)
+
+    def screenshot_attached(self, *args, **kwargs):
+        self._send("news_screenshot_attached", *args, **kwargs)
+
+
+class ScreenshotDerivativesSubscriber:
+    outbox = True
+
+    @classmethod
+    def receive(cls, obj, *args, **kwargs):
+        ScreenshotDerivativesGenerator().generate_and_save(obj)
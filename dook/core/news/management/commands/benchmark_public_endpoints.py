@@ -0,0 +1,72 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+DEFAULT_PATHS = (
+    "/news/published/news",
+    "/news/keywords/domains",
+    "/news/keywords/tags",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load tests public read-only endpoints of a running server, "
+        "eg. to compare uwsgi over dook.wsgi with uvicorn over dook.asgi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path requested in turns with other paths, may be repeated",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=50, help="Clients sending requests"
+        )
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or DEFAULT_PATHS
+        urls = [
+            f"{options['base_url']}{paths[number % len(paths)]}"
+            for number in range(options["requests"])
+        ]
+
+        def fetch(url):
+            started_at = time.monotonic()
+            try:
+                # a connection per request, the uwsgi http router does not keep
+                # connections alive and reusing them would count as errors
+                response = requests.get(url, timeout=options["timeout"])
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            return ok, time.monotonic() - started_at
+
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(fetch, urls))
+        elapsed = time.monotonic() - started_at
+
+        latencies = sorted(latency for ok, latency in results if ok)
+        errors = len(results) - len(latencies)
+        self.stdout.write(
+            f"{len(results)} requests, {options['concurrency']} concurrent clients, "
+            f"{errors} errors"
+        )
+        self.stdout.write(f"Throughput: {len(results) / elapsed:.1f} requests/s")
+        if latencies:
+            quantiles = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f"Latency p50: {quantiles[49] * 1000:.1f} ms, "
+                f"p95: {quantiles[94] * 1000:.1f} ms, "
+                f"p99: {quantiles[98] * 1000:.1f} ms, "
+                f"max: {latencies[-1] * 1000:.1f} ms"
+            )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from dook.core.news.screenshots import ScreenshotDerivativesGenerator
+
+
+class Command(BaseCommand):
+    help = "Generates thumbnails and WebP variants of existing news screenshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=100)
+        parser.add_argument(
+            "--workers", type=int, default=4, help="Screenshots converted concurrently"
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate derivatives of news which already have them",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count news with screenshots missing derivatives",
+        )
+
+    def handle(self, *args, **options):
+        generated = ScreenshotDerivativesGenerator().backfill(
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            force=options["force"],
+            dry_run=options["dry_run"],
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(f"News with screenshots to process: {generated}")
+        else:
+            self.stdout.write(f"News given screenshot derivatives: {generated}")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from dook.core.news.models import News
+
+
+class Command(BaseCommand):
+    help = "Recomputes stored verdict state of news and reports drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drift, do not update stored state",
+        )
+
+    def handle(self, *args, **options):
+        drifted_news, drifted_fields = News.objects.recompute_verdict_state(
+            chunk_size=options["chunk_size"], dry_run=options["dry_run"]
+        )
+
+        self.stdout.write(f"News with drifted verdict state: {drifted_news}")
+        for field, count in sorted(drifted_fields.items()):
+            self.stdout.write(f"  {field}: {count}")
+
+        if drifted_news and not options["dry_run"]:
+            self.stdout.write("Verdict state repaired.")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from dook.core.integrations.chatbot.resync import ChatbotResync
+
+
+class Command(BaseCommand):
+    help = "Sends verdicts of all news to the chatbot, resuming an interrupted resync"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=None)
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--concurrency", type=int, default=None, help="Requests sent concurrently"
+        )
+        parser.add_argument(
+            "--checkpoint", default=None, help="Path of the resync progress file"
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore saved progress and start from the first news",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only serialize news, do not send them nor save progress",
+        )
+
+    def handle(self, *args, **options):
+        resync = ChatbotResync(
+            checkpoint_path=options["checkpoint"],
+            chunk_size=options["chunk_size"],
+            batch_size=options["batch_size"],
+            concurrency=options["concurrency"],
+            dry_run=options["dry_run"],
+        )
+        sent = resync.run(restart=options["restart"])
+
+        if options["dry_run"]:
+            self.stdout.write(f"News to send: {sent}")
+        else:
+            self.stdout.write(f"News sent: {sent}")
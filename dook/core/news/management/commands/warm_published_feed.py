@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from dook.api.news.published.views import NewsPublishedViewSet
+
+
+class Command(BaseCommand):
+    help = "Fills published news feed cache with the first pages of the feed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=3)
+
+    def handle(self, *args, **options):
+        request_factory = APIRequestFactory()
+        view = NewsPublishedViewSet.as_view(actions={"get": "list"})
+
+        warmed_pages = 0
+        for filters in ({}, {"is_pinned": "true"}, {"is_pinned": "false"}):
+            for page in range(1, options["pages"] + 1):
+                # first page is requested by clients without the page param
+                data = {**filters, "page": page} if page > 1 else filters
+                request = request_factory.get("/", data=data)
+                response = view(request)
+                if response.status_code != 200:
+                    break
+
+                warmed_pages += 1
+                if page * response.data["page_size"] >= response.data["total"]:
+                    break
+
+        self.stdout.write(f"Warmed published feed pages: {warmed_pages}")
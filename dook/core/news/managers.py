@@ -1,123 +1,77 @@
 from collections import Counter
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models
 from django.db.models import (
-    BooleanField,
     Case,
     CharField,
     Count,
     DateTimeField,
     Exists,
     F,
+    IntegerField,
     OuterRef,
     Q,
     Subquery,
     Value,
     When,
 )
+from django.db.models.functions import Coalesce
 
+from dook.core.database.instrumentation import (
+    InstrumentedQuerySet,
+    instrument_query_origins,
+)
+from dook.core.news.search import build_search_vector, is_search_vector_supported
+from dook.core.news.verdicts import (
+    EVENT_VERDICT_COUNT_FIELDS,
+    NO_VERDICT,
+    UNPUBLISHED_VERDICTS,
+    VERDICT_STATE_FIELDS,
+    compute_verdict_state_from_row,
+)
 from dook.core.users.constants import UserRoleType
 from dook.core.users.managers import ACTIVE_ASSIGNMENTS_BOUNDARY_EXPR
 from dook.core.users.models import UserNews
 
 
-class NewsQuerySet(models.QuerySet):
-    def with_is_spam(self):
-        return self.annotate(
-            spam_verdicts_fc=Count(
-                "factcheckeropinion", filter=Q(factcheckeropinion__verdict="spam")
-            ),
-            spam_verdicts_expert=Count(
-                "expertopinion", filter=Q(expertopinion__verdict="spam")
-            ),
-        ).annotate(
-            is_spam=Case(
-                When(
-                    (Q(spam_verdicts_fc__gte=2) | Q(spam_verdicts_expert__gte=1)),
-                    then=Value(True),
-                ),
-                output_field=BooleanField(),
-                default=Value(False),
-            )
-        )
-
-    def with_is_duplicate(self):
-        return self.annotate(
-            is_duplicate_by_factcheckers=Count(
-                "factcheckeropinion", filter=Q(factcheckeropinion__is_duplicate=True),
-            )
-        ).annotate(
-            is_duplicate=Case(
-                When(
-                    expertopinion__is_duplicate__isnull=False,
-                    then=F("expertopinion__is_duplicate"),
-                ),
-                When(is_duplicate_by_factcheckers__gte=2, then=Value(True)),
-                output_field=BooleanField(),
-                default=Value(False),
-            )
-        )
-
-    def with_verdicts(self):
+class NewsQuerySet(InstrumentedQuerySet):
+    def verdict_state_sources(self):
         return (
-            self.with_fact_checker_opinions()
-            .with_expert_opinions()
+            self.order_by()
+            .values("id", "expertopinion__verdict", "expertopinion__is_duplicate")
             .annotate(
-                true=Count(
+                opinions_count=Count("factcheckeropinion"),
+                true_count=Count(
                     "factcheckeropinion", filter=Q(factcheckeropinion__verdict="true")
                 ),
-                false=Count(
+                false_count=Count(
                     "factcheckeropinion", filter=Q(factcheckeropinion__verdict="false")
                 ),
-                unidentified=Count(
+                unidentified_count=Count(
                     "factcheckeropinion",
                     filter=Q(factcheckeropinion__verdict="unidentified"),
                 ),
-                spam_verdicts=Count(
+                spam_count=Count(
                     "factcheckeropinion", filter=Q(factcheckeropinion__verdict="spam")
                 ),
-            )
-            .annotate(
-                current_verdict=Case(
-                    When(
-                        expertopinion__verdict__isnull=False,
-                        then=F("expertopinion__verdict"),
-                    ),
-                    When(
-                        (Q(true__gte=1) & Q(false__gte=1))
-                        | (Q(spam_verdicts=1) & (Q(false__gte=1) | Q(true__gte=1)))
-                        | (
-                            Q(unidentified__gte=1)
-                            & (Q(false__gte=1) | Q(true__gte=1) | Q(spam_verdicts=1))
-                        ),
-                        then=Value("dispute"),
-                    ),
-                    When(true__gte=2, then=Value("true")),
-                    When(false__gte=2, then=Value("false")),
-                    When(unidentified__gte=2, then=Value("unidentified"),),
-                    When(spam_verdicts__gte=2, then=Value("spam")),
-                    output_field=CharField(),
-                    default=Value("no_verdict"),
-                )
+                duplicate_count=Count(
+                    "factcheckeropinion", filter=Q(factcheckeropinion__is_duplicate=True)
+                ),
             )
         )
 
+    def with_verdicts(self):
+        return self.with_fact_checker_opinions().with_expert_opinions()
+
     def with_news_verdict_status(self):
-        return (
-            self.with_fact_checker_opinions()
-            .annotate(confirmed=Count("factcheckeropinion"))
-            .annotate(
-                current_verdict=Case(
-                    When(
-                        expertopinion__verdict__isnull=False,
-                        then=F("expertopinion__verdict"),
-                    ),
-                    When(confirmed__gt=0, then=Value("awaiting")),
-                    When(confirmed=0, then=Value("no_verdict")),
-                )
+        return self.annotate(
+            verdict_status=Case(
+                When(expert_verdict__isnull=False, then=F("expert_verdict")),
+                When(fact_checker_opinions_count__gt=0, then=Value("awaiting")),
+                output_field=CharField(),
+                default=Value(NO_VERDICT),
             )
-            .distinct()
         )
 
     def with_has_user_opinion(self, user):
@@ -159,7 +113,7 @@ class NewsQuerySet(models.QuerySet):
         )
 
     def verified_by_expert(self, verified: bool = True):
-        return self.exclude(expertopinion__isnull=verified)
+        return self.exclude(expert_verdict__isnull=verified)
 
     def with_fact_checker_opinions(self):
 
@@ -169,23 +123,38 @@ class NewsQuerySet(models.QuerySet):
 
         return self.prefetch_related("expertopinion")
 
+    def with_opinion_judges(self):
+        return self.prefetch_related(
+            "expertopinion__judge", "factcheckeropinion_set__judge"
+        )
+
+    def with_keywords(self):
+        return self.prefetch_related("tags", "domains")
+
+    def with_sensitive_keywords(self):
+        return self.prefetch_related("sensitive_keywords")
+
     def with_usernews_table(self):
 
         return self.prefetch_related("usernews_set")
 
     def with_active_assignments_for_fact_checkers_count(self):
-        return self.annotate(
-            active_assignments_count=models.Count(
-                "usernews",
-                filter=self._active_assignments_filter_for_fact_checkers(),
-                distinct=True,
+        # counted in a subquery, so the news rows are not grouped
+        active_assignments = (
+            UserNews.objects.filter(
+                news=OuterRef("pk"),
+                created_at__gte=ACTIVE_ASSIGNMENTS_BOUNDARY_EXPR,
+                user__role=UserRoleType.FACT_CHECKER,
             )
+            .order_by()
+            .values("news")
+            .annotate(count=Count("id"))
+            .values("count")
         )
-
-    def _active_assignments_filter_for_fact_checkers(self):
-        return Q(
-            usernews__created_at__gte=ACTIVE_ASSIGNMENTS_BOUNDARY_EXPR,
-            usernews__user__role=UserRoleType.FACT_CHECKER,
+        return self.annotate(
+            active_assignments_count=Coalesce(
+                Subquery(active_assignments, output_field=IntegerField()), 0
+            )
         )
 
     def filter_with_active_assignments_for_fact_checkers_below_target(self):
@@ -193,42 +162,112 @@ class NewsQuerySet(models.QuerySet):
             active_assignments_count__lt=settings.TARGET_ASSIGNMENTS_PER_NEWS_COUNT
         )
 
+    def filter_with_event_verdict(self):
+        """
+        Filters news which verdict events are sent for, see compute_event_verdict().
+        """
+        condition = Q(
+            expert_verdict__in=[verdict for verdict, _ in EVENT_VERDICT_COUNT_FIELDS]
+        )
+        for _, count_field in EVENT_VERDICT_COUNT_FIELDS:
+            condition |= Q(**{f"{count_field}__gte": 2})
+
+        return self.filter(condition)
+
     def filter_without_verdict(self):
-        return (
-            self.filter(expertopinion__isnull=True)
-            .annotate(Count("factcheckeropinion"))
-            .filter(factcheckeropinion__count__lt=2)
+        return self.filter(expert_verdict__isnull=True, fact_checker_opinions_count__lt=2)
+
+    def update_search_vector(self):
+        from dook.core.news.models import ExpertOpinion, FactCheckerOpinion
+
+        if not is_search_vector_supported(connections[self.db]):
+            return 0
+
+        return self.update(
+            search_vector=build_search_vector(FactCheckerOpinion, ExpertOpinion)
         )
 
     def filter_by_related_tags(self, tags) -> models.QuerySet:
+        """
+        Filters news related to all of the given tags.
+        """
         from dook.core.news.models import NewsTag
 
-        news_with_tags = list(
-            NewsTag.objects.filter(tag__in=tags).values_list("news", flat=True)
-        )
-        news_ids = [
-            id_ for id_, cnt in Counter(news_with_tags).items() if cnt == len(tags)
-        ]
-
-        return self.filter(id__in=news_ids)
+        return self._filter_by_all_related(NewsTag.objects.all(), "tag", tags)
 
     def filter_by_related_domains(self, domains) -> models.QuerySet:
+        """
+        Filters news related to all of the given domains.
+        """
         from dook.core.news.models import NewsDomain
 
-        news_with_domains = list(
-            NewsDomain.objects.filter(domain__in=domains).values_list("news", flat=True)
+        return self._filter_by_all_related(NewsDomain.objects.all(), "domain", domains)
+
+    def _filter_by_all_related(self, relations, field, keywords):
+        keywords = set(keywords)
+        news_with_all_keywords = (
+            relations.filter(**{f"{field}__in": keywords})
+            .order_by()
+            .values("news")
+            .annotate(matched_count=Count(field, distinct=True))
+            .filter(matched_count=len(keywords))
+            .values("news")
         )
-        news_ids = [
-            id_ for id_, cnt in Counter(news_with_domains).items() if cnt == len(domains)
-        ]
 
-        return self.filter(id__in=news_ids)
+        return self.filter(id__in=news_with_all_keywords)
 
 
+@instrument_query_origins
 class NewsManager(models.Manager.from_queryset(NewsQuerySet)):
+    def recompute_verdict_state(self, chunk_size=1000, dry_run=False):
+        """
+        Recomputes stored verdict state of all news in chunks ordered by pk.
+        Returns number of news with drifted state and drift count per field.
+        """
+        drifted_news = 0
+        drifted_fields = Counter()
+        last_pk = None
+
+        while True:
+            chunk = self.order_by("pk")
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+
+            stored_states = list(chunk.values("pk", *VERDICT_STATE_FIELDS)[:chunk_size])
+            if not stored_states:
+                break
+            last_pk = stored_states[-1]["pk"]
+
+            rows = {
+                row["id"]: row
+                for row in self.filter(
+                    pk__in=[stored["pk"] for stored in stored_states]
+                ).verdict_state_sources()
+            }
+
+            news_to_update = []
+            for stored in stored_states:
+                state = compute_verdict_state_from_row(rows[stored["pk"]])
+                changed = [
+                    field
+                    for field in VERDICT_STATE_FIELDS
+                    if stored[field] != state[field]
+                ]
+                if changed:
+                    drifted_news += 1
+                    drifted_fields.update(changed)
+                    news_to_update.append(self.model(pk=stored["pk"], **state))
+
+            if news_to_update and not dry_run:
+                self.bulk_update(news_to_update, VERDICT_STATE_FIELDS)
+
+        return drifted_news, drifted_fields
+
     def stale(self):
         return (
-            self.filter_with_active_assignments_for_fact_checkers_below_target().filter_without_verdict()
+            self.filter_with_active_assignments_for_fact_checkers_below_target()
+            .filter_without_verdict()
+            .order_by("reported_at", "id")
         )
 
     def published(self):
@@ -238,53 +277,15 @@ class NewsManager(models.Manager.from_queryset(NewsQuerySet)):
             .exclude(
                 Q(
                     Q(deleted=True)
-                    | Q(Q(is_published=False) & Q(expertopinion__isnull=False))
+                    | Q(Q(is_published=False) & Q(expert_verdict__isnull=False))
                     | Q(
                         Q(is_published=True)
-                        & Q(expertopinion__isnull=False)
-                        & Q(expertopinion__is_duplicate=True)
+                        & Q(expert_verdict__isnull=False)
+                        & Q(is_duplicate=True)
                     )
                 )
             )
-            .annotate(
-                true=Count(
-                    "factcheckeropinion", filter=Q(factcheckeropinion__verdict="true")
-                ),
-                false=Count(
-                    "factcheckeropinion", filter=Q(factcheckeropinion__verdict="false")
-                ),
-                unidentified=Count(
-                    "factcheckeropinion",
-                    filter=Q(factcheckeropinion__verdict="unidentified"),
-                ),
-                spam_verdicts=Count(
-                    "factcheckeropinion", filter=Q(factcheckeropinion__verdict="spam")
-                ),
-            )
-            .annotate(
-                current_verdict=Case(
-                    When(
-                        expertopinion__verdict__isnull=False,
-                        then=F("expertopinion__verdict"),
-                    ),
-                    When(
-                        (Q(true__gte=1) & Q(false__gte=1))
-                        | (Q(spam_verdicts=1) & (Q(false__gte=1) | Q(true__gte=1)))
-                        | (
-                            Q(unidentified__gte=1)
-                            & (Q(false__gte=1) | Q(true__gte=1) | Q(spam_verdicts=1))
-                        ),
-                        then=Value("dispute"),
-                    ),
-                    When(true__gte=2, then=Value("true")),
-                    When(false__gte=2, then=Value("false")),
-                    When(unidentified__gte=2, then=Value("unidentified")),
-                    When(spam_verdicts__gte=2, then=Value("spam")),
-                    output_field=CharField(),
-                    default=Value("no_verdict"),
-                )
-            )
-            .exclude(current_verdict__in=["no_verdict", "spam", "dispute"])
+            .exclude(current_verdict__in=UNPUBLISHED_VERDICTS)
         )
 
 
@@ -0,0 +1,97 @@
+# Generated by Django 3.0.7 on 2026-10-17 19:24
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+from dook.core.news.verdicts import compute_verdict_state_from_row
+
+
+def fill_verdict_state(apps, schema_editor):
+    News = apps.get_model('news', 'news')
+
+    rows = News.objects.order_by().values(
+        "id", "expertopinion__verdict", "expertopinion__is_duplicate"
+    ).annotate(
+        opinions_count=Count("factcheckeropinion"),
+        true_count=Count(
+            "factcheckeropinion", filter=Q(factcheckeropinion__verdict="true")
+        ),
+        false_count=Count(
+            "factcheckeropinion", filter=Q(factcheckeropinion__verdict="false")
+        ),
+        unidentified_count=Count(
+            "factcheckeropinion", filter=Q(factcheckeropinion__verdict="unidentified")
+        ),
+        spam_count=Count(
+            "factcheckeropinion", filter=Q(factcheckeropinion__verdict="spam")
+        ),
+        duplicate_count=Count(
+            "factcheckeropinion", filter=Q(factcheckeropinion__is_duplicate=True)
+        ),
+    )
+
+    for row in rows.iterator():
+        News.objects.filter(pk=row["id"]).update(
+            **compute_verdict_state_from_row(row)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0015_auto_20200625_1512'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='current_verdict',
+            field=models.CharField(db_index=True, default='no_verdict', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='expert_verdict',
+            field=models.CharField(default=None, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='fact_checker_duplicate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='fact_checker_false_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='fact_checker_opinions_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='fact_checker_spam_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='fact_checker_true_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='fact_checker_unidentified_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='is_duplicate',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='is_spam',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(fill_verdict_state, migrations.RunPython.noop),
+    ]
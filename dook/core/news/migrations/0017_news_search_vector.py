@@ -0,0 +1,46 @@
+# Generated by Django 3.0.7 on 2026-10-17 19:49
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from dook.core.news.search import build_search_vector, is_search_vector_supported
+
+
+def create_search_vector_index(apps, schema_editor):
+    if not is_search_vector_supported(schema_editor.connection):
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS news_news_search_vector_gin "
+        "ON news_news USING gin (search_vector)"
+    )
+
+    News = apps.get_model('news', 'news')
+    FactCheckerOpinion = apps.get_model('news', 'factcheckeropinion')
+    ExpertOpinion = apps.get_model('news', 'expertopinion')
+    News.objects.update(
+        search_vector=build_search_vector(FactCheckerOpinion, ExpertOpinion)
+    )
+
+
+def drop_search_vector_index(apps, schema_editor):
+    if not is_search_vector_supported(schema_editor.connection):
+        return
+
+    schema_editor.execute("DROP INDEX IF EXISTS news_news_search_vector_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0016_news_verdict_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_index, drop_search_vector_index),
+    ]
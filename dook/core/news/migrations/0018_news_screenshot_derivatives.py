@@ -0,0 +1,28 @@
+# Generated by Django 3.0.7 on 2026-10-17 20:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0017_news_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='screenshot_thumbnail_url',
+            field=models.CharField(blank=True, max_length=1000),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='screenshot_thumbnail_webp_url',
+            field=models.CharField(blank=True, max_length=1000),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='screenshot_webp_url',
+            field=models.CharField(blank=True, max_length=1000),
+        ),
+    ]
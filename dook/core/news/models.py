@@ -1,17 +1,28 @@
 import uuid
-from collections import Counter
 
-from django.core.exceptions import ObjectDoesNotExist, ValidationError
-from django.db import IntegrityError, models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
 from django.db.models import NOT_PROVIDED
 
 from dook.api.news.consts import OPINION_FIELDS
 from dook.api.news.exceptions import UserOpinionUniqueException
 from dook.core.events.mixins import ModelEventMixin
 from dook.core.integrations.storage.client import S3ApiClient
+from dook.core.news.cache import invalidate_published_feed
 from dook.core.news.constants import NewsOrigin, VerdictType
 from dook.core.news.events import NewsEvents
 from dook.core.news.managers import NewsManager, NewsSensitiveKeywordsManager
+from dook.core.news.screenshots import SCREENSHOT_DERIVATIVE_FIELDS
+from dook.core.news.verdicts import (
+    NO_VERDICT,
+    PUBLISHED_FEED_STATE_FIELDS,
+    UNPUBLISHED_VERDICTS,
+    VERDICT_STATE_FIELDS,
+    compute_event_verdict,
+    compute_verdict_state,
+    compute_verdict_state_from_row,
+)
 from dook.core.users.constants import UserRoleType
 from dook.core.users.models import User
 
@@ -24,6 +35,10 @@ class News(ModelEventMixin, models.Model):
 
     url = models.URLField(max_length=2000)
     screenshot_url = models.CharField(max_length=1000, blank=True)
+    # maintained by dook.core.news.screenshots out of screenshot_url
+    screenshot_thumbnail_url = models.CharField(max_length=1000, blank=True)
+    screenshot_thumbnail_webp_url = models.CharField(max_length=1000, blank=True)
+    screenshot_webp_url = models.CharField(max_length=1000, blank=True)
     reporter_email = models.EmailField(blank=False)
     text = models.TextField(blank=True)
     comment = models.TextField(blank=True)
@@ -39,6 +54,21 @@ class News(ModelEventMixin, models.Model):
     created_at = models.DateTimeField(auto_now=False, auto_now_add=True)
     reported_at = models.DateTimeField(auto_now=False, auto_now_add=False)
 
+    # verdict state maintained by opinions, see update_verdict_state()
+    fact_checker_opinions_count = models.PositiveIntegerField(default=0)
+    fact_checker_true_count = models.PositiveIntegerField(default=0)
+    fact_checker_false_count = models.PositiveIntegerField(default=0)
+    fact_checker_unidentified_count = models.PositiveIntegerField(default=0)
+    fact_checker_spam_count = models.PositiveIntegerField(default=0)
+    fact_checker_duplicate_count = models.PositiveIntegerField(default=0)
+    expert_verdict = models.CharField(max_length=50, null=True, default=None)
+    current_verdict = models.CharField(max_length=50, default=NO_VERDICT, db_index=True)
+    is_spam = models.BooleanField(default=False, db_index=True)
+    is_duplicate = models.BooleanField(default=False, db_index=True)
+
+    # maintained by update_search_vector(), GIN indexed on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+
     sensitive_keywords = models.ManyToManyField(
         "news.SensitiveKeyword", through="NewsSensitiveKeyword"
     )
@@ -50,37 +80,87 @@ class News(ModelEventMixin, models.Model):
     objects = NewsManager()
     events_class = NewsEvents
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        if self.is_with_verdict():
-            self.events.edit_verdict()
+    SEARCHED_FIELDS = ("text", "comment", "url")
 
-    def is_with_verdict(self):
-        self._verdict = None
-        expected_verditcs = [
-            VerdictType.VERIFIED_TRUE.value,
-            VerdictType.VERIFIED_FALSE.value,
-            VerdictType.CANNOT_BE_VERIFIED.value,
-        ]
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if not adding and kwargs.get("update_fields") is None:
+            # verdict state, search vector and screenshot derivatives are
+            # written only by update_verdict_state(), update_search_vector()
+            # and the screenshot derivatives stage, so a stale instance can
+            # not overwrite them
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in VERDICT_STATE_FIELDS
+                and field.name not in SCREENSHOT_DERIVATIVE_FIELDS
+                and field.name != "search_vector"
+            ]
 
-        try:
-            self._verdict = (
-                self.expertopinion.verdict
-                if self.expertopinion.verdict in expected_verditcs
-                else None
+        super().save(*args, **kwargs)
+        if adding or set(self.SEARCHED_FIELDS).intersection(kwargs["update_fields"]):
+            self.update_search_vector()
+        if not adding:
+            invalidate_published_feed()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_published_feed()
+        return result
+
+    def update_verdict_state(self):
+        """
+        Recounts verdict state of the news out of its opinions and sends
+        a single verdict event for the change: new_verdict when the news gets
+        its first verdict, edit_verdict when its verdict changes, none when
+        the verdict stays the same. The published feed is invalidated when the
+        news may enter, leave or change in it.
+        """
+        with transaction.atomic():
+            # lock the news row, so concurrent opinions are counted one by one
+            previous_state = (
+                News.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values(*VERDICT_STATE_FIELDS)
+                .first()
             )
-        except ObjectDoesNotExist:
-            pass
+            if previous_state is None:
+                return
 
-        if not self._verdict:
-            counted_opinions_verdicts = Counter(
-                self.factcheckeropinion_set.values_list("verdict", flat=True)
+            row = News.objects.filter(pk=self.pk).verdict_state_sources().first()
+            state = (
+                compute_verdict_state_from_row(row) if row else compute_verdict_state()
             )
-            for v in expected_verditcs:
-                if counted_opinions_verdicts[v] >= 2:
-                    self._verdict = v
+            News.objects.filter(pk=self.pk).update(**state)
+
+            for field, value in state.items():
+                setattr(self, field, value)
+
+            # opinions are shown with news in the feed, so it changes with
+            # opinions of news having a published verdict too
+            if self.current_verdict not in UNPUBLISHED_VERDICTS or any(
+                previous_state[field] != state[field]
+                for field in PUBLISHED_FEED_STATE_FIELDS
+            ):
+                invalidate_published_feed()
+
+            previous_verdict = compute_event_verdict(previous_state)
+            if not self.is_with_verdict() or self._verdict == previous_verdict:
+                return
+            if previous_verdict is None:
+                self.events.new_verdict()
+            else:
+                self.events.edit_verdict()
 
-        return True if self._verdict else False
+    def update_search_vector(self):
+        News.objects.filter(pk=self.pk).update_search_vector()
+
+    def is_with_verdict(self):
+        self._verdict = compute_event_verdict(
+            {field: getattr(self, field) for field in VERDICT_STATE_FIELDS}
+        )
+        return self._verdict is not None
 
     def leave_opinion(self, user, opinion_params):
         whose_opinion = {
@@ -108,8 +188,16 @@ class News(ModelEventMixin, models.Model):
         s3_client.upload_image(image_object=image, filename=filename)
         image_url = s3_client.get_object_url(object_name=filename)
 
-        self.screenshot_url = image_url
-        self.save()
+        self.set_screenshot_url(image_url)
+
+    def set_screenshot_url(self, url):
+        self.screenshot_url = url
+        # derivatives of the previous screenshot are replaced in the background
+        for field in SCREENSHOT_DERIVATIVE_FIELDS:
+            setattr(self, field, "")
+        with transaction.atomic():
+            self.save(update_fields=["screenshot_url", *SCREENSHOT_DERIVATIVE_FIELDS])
+            self.events.screenshot_attached()
 
 
 class OpinionBase(models.Model):
@@ -139,6 +227,19 @@ class OpinionBase(models.Model):
         abstract = True
         unique_together = ["news", "judge"]
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.news.update_verdict_state()
+            self.news.update_search_vector()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self.news.update_verdict_state()
+            self.news.update_search_vector()
+        return result
+
     def reset_field_values(self, exclude_fields):
         fields_to_reset = OPINION_FIELDS.difference(exclude_fields)
         for field in fields_to_reset:
@@ -162,11 +263,6 @@ class FactCheckerOpinion(OpinionBase):
         related_query_name="%(class)s",
     )
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        if self.news and self.news.is_with_verdict():
-            self.news.events.edit_verdict()
-
     class Meta(OpinionBase.Meta):
         db_table = "fact_checker_opinion"
 
@@ -179,11 +275,6 @@ class ExpertOpinion(OpinionBase):
 
     news = models.OneToOneField(News, on_delete=models.CASCADE, primary_key=False,)
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
-        if self.news and self.news.is_with_verdict():
-            self.news.events.edit_verdict()
-
     class Meta(OpinionBase.Meta):
         db_table = "expert_opinion"
 
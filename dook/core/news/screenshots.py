@@ -0,0 +1,158 @@
+import io
+import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from PIL import Image
+
+from dook.core.integrations.storage.client import S3ApiClient
+from dook.core.news.cache import invalidate_published_feed
+
+# News fields with derivative URLs, with object name suffix and format
+SCREENSHOT_DERIVATIVES = (
+    ("screenshot_thumbnail_url", "_thumbnail.jpg", "JPEG"),
+    ("screenshot_thumbnail_webp_url", "_thumbnail.webp", "WEBP"),
+    ("screenshot_webp_url", ".webp", "WEBP"),
+)
+SCREENSHOT_DERIVATIVE_FIELDS = tuple(field for field, _, _ in SCREENSHOT_DERIVATIVES)
+
+CONTENT_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+def render_screenshot_derivatives(image):
+    """
+    Returns encoded derivative images of a Pillow image, by News field.
+    """
+    thumbnail = image.copy()
+    thumbnail.thumbnail(settings.SCREENSHOT_THUMBNAIL_SIZE, Image.LANCZOS)
+    sources = {
+        "screenshot_thumbnail_url": thumbnail,
+        "screenshot_thumbnail_webp_url": thumbnail,
+        "screenshot_webp_url": image,
+    }
+
+    derivatives = {}
+    for field, _, image_format in SCREENSHOT_DERIVATIVES:
+        source = sources[field]
+        if image_format == "JPEG" or source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGB")
+
+        encoded = io.BytesIO()
+        if image_format == "JPEG":
+            source.save(
+                encoded,
+                image_format,
+                quality=settings.SCREENSHOT_JPEG_QUALITY,
+                optimize=True,
+            )
+        else:
+            source.save(encoded, image_format, quality=settings.SCREENSHOT_WEBP_QUALITY)
+        derivatives[field] = encoded.getvalue()
+
+    return derivatives
+
+
+class ScreenshotDerivativesGenerator:
+    """
+    Generates resized and WebP variants of news screenshots stored in the
+    bucket and uploads them next to the originals.
+    """
+
+    def __init__(self):
+        self.s3_client = S3ApiClient()
+        self.logger = logging.getLogger("s3-bucket")
+
+    def generate(self, news):
+        """
+        Returns derivative URLs by News field, None when the screenshot is not
+        stored in the bucket or is not a readable image.
+        """
+        object_name = self.s3_client.get_object_name(news.screenshot_url)
+        if object_name is None:
+            self.logger.info(
+                f"Skipped screenshot outside of the bucket of news {news.pk}"
+            )
+            return None
+
+        # large originals are spooled to disk instead of being kept in memory
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as original:
+            self.s3_client.download_file(object_name, original)
+            original.seek(0)
+            try:
+                with Image.open(original) as image:
+                    image.load()
+                    derivatives = render_screenshot_derivatives(image)
+            except (OSError, Image.DecompressionBombError) as e:
+                self.logger.warning(f"Unreadable screenshot of news {news.pk}: {e}")
+                return None
+
+        urls = {}
+        for field, suffix, image_format in SCREENSHOT_DERIVATIVES:
+            filename = f"{object_name}{suffix}"
+            self.s3_client.upload_file(
+                io.BytesIO(derivatives[field]), filename, CONTENT_TYPES[image_format]
+            )
+            urls[field] = self.s3_client.get_object_url(filename)
+
+        return urls
+
+    def save(self, news, urls, invalidate_feed=True):
+        """
+        Stores derivative URLs unless the screenshot was replaced meanwhile.
+        Returns whether the news was updated.
+        """
+        from dook.core.news.models import News
+
+        updated = News.objects.filter(
+            pk=news.pk, screenshot_url=news.screenshot_url
+        ).update(**urls)
+        if updated:
+            for field, url in urls.items():
+                setattr(news, field, url)
+            if invalidate_feed:
+                invalidate_published_feed()
+
+        return bool(updated)
+
+    def generate_and_save(self, news):
+        urls = self.generate(news)
+        return urls is not None and self.save(news, urls)
+
+    def backfill(self, chunk_size=100, workers=4, force=False, dry_run=False):
+        """
+        Generates derivatives of existing screenshots in chunks ordered by pk,
+        downloading and converting images of a chunk in worker threads.
+        Returns the number of news given derivatives, or to be given them in
+        a dry run.
+        """
+        from dook.core.news.models import News
+
+        news_list = News.objects.exclude(screenshot_url="").only("pk", "screenshot_url")
+        if not force:
+            news_list = news_list.filter(screenshot_thumbnail_url="")
+
+        generated = 0
+        last_pk = None
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                chunk = news_list.order_by("pk")
+                if last_pk is not None:
+                    chunk = chunk.filter(pk__gt=last_pk)
+                chunk = list(chunk[:chunk_size])
+                if not chunk:
+                    break
+                last_pk = chunk[-1].pk
+
+                if dry_run:
+                    generated += len(chunk)
+                    continue
+
+                for news, urls in zip(chunk, executor.map(self.generate, chunk)):
+                    if urls is not None and self.save(news, urls, invalidate_feed=False):
+                        generated += 1
+                self.logger.info(f"Generated screenshot derivatives of {generated} news")
+
+        if generated and not dry_run:
+            invalidate_published_feed()
+        return generated
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat
+
+
+def is_search_vector_supported(connection):
+    return connection.vendor == "postgresql"
+
+
+def build_search_vector(fact_checker_opinion_model, expert_opinion_model):
+    """
+    Builds search vector expression of a news row: news text is weighted the
+    most, then its comment and url, then titles and comments of its opinions.
+
+    Opinions are aggregated in subqueries, so the expression can be used in
+    a queryset update().
+    """
+    config = settings.NEWS_SEARCH_CONFIG
+    opinion_text = Concat("title", Value(" "), "comment", output_field=TextField())
+
+    fact_checker_opinions = (
+        fact_checker_opinion_model.objects.filter(news=OuterRef("pk"))
+        .order_by()
+        .values("news")
+        .annotate(search_text=StringAgg(opinion_text, delimiter=" "))
+        .values("search_text")
+    )
+    expert_opinion = (
+        expert_opinion_model.objects.filter(news=OuterRef("pk"))
+        .annotate(search_text=opinion_text)
+        .values("search_text")
+    )
+
+    return (
+        SearchVector("text", config=config, weight="A")
+        + SearchVector("comment", "url", config=config, weight="B")
+        + SearchVector(
+            Coalesce(Subquery(fact_checker_opinions), Value("")),
+            Coalesce(Subquery(expert_opinion), Value("")),
+            config=config,
+            weight="C",
+        )
+    )
+
+
+def search_news(queryset, terms):
+    query = SearchQuery(" ".join(terms), config=settings.NEWS_SEARCH_CONFIG)
+
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F("search_vector"), query)
+    )
@@ -0,0 +1,117 @@
+from dook.core.news.constants import VerdictType
+
+DISPUTE = "dispute"
+NO_VERDICT = "no_verdict"
+
+VERDICT_STATE_FIELDS = (
+    "fact_checker_opinions_count",
+    "fact_checker_true_count",
+    "fact_checker_false_count",
+    "fact_checker_unidentified_count",
+    "fact_checker_spam_count",
+    "fact_checker_duplicate_count",
+    "expert_verdict",
+    "current_verdict",
+    "is_spam",
+    "is_duplicate",
+)
+
+# verdict state fields NewsQuerySet.published() filters on
+PUBLISHED_FEED_STATE_FIELDS = ("expert_verdict", "current_verdict", "is_duplicate")
+# news with these verdicts are not in the published feed
+UNPUBLISHED_VERDICTS = (NO_VERDICT, VerdictType.SPAM.value, DISPUTE)
+
+# verdicts news verdict events are sent for, with matching fact checker counts
+EVENT_VERDICT_COUNT_FIELDS = (
+    (VerdictType.VERIFIED_TRUE.value, "fact_checker_true_count"),
+    (VerdictType.VERIFIED_FALSE.value, "fact_checker_false_count"),
+    (VerdictType.CANNOT_BE_VERIFIED.value, "fact_checker_unidentified_count"),
+)
+
+
+def compute_verdict_state(
+    opinions_count=0,
+    true_count=0,
+    false_count=0,
+    unidentified_count=0,
+    spam_count=0,
+    duplicate_count=0,
+    expert_verdict=None,
+    expert_is_duplicate=None,
+):
+    """
+    Derives stored verdict state of a news out of fact checker verdict counts
+    and expert opinion. expert_verdict is None when there is no expert opinion.
+    """
+    if expert_verdict is not None:
+        current_verdict = expert_verdict
+    elif (
+        (true_count >= 1 and false_count >= 1)
+        or (spam_count == 1 and (false_count >= 1 or true_count >= 1))
+        or (
+            unidentified_count >= 1
+            and (false_count >= 1 or true_count >= 1 or spam_count == 1)
+        )
+    ):
+        current_verdict = DISPUTE
+    elif true_count >= 2:
+        current_verdict = VerdictType.VERIFIED_TRUE.value
+    elif false_count >= 2:
+        current_verdict = VerdictType.VERIFIED_FALSE.value
+    elif unidentified_count >= 2:
+        current_verdict = VerdictType.CANNOT_BE_VERIFIED.value
+    elif spam_count >= 2:
+        current_verdict = VerdictType.SPAM.value
+    else:
+        current_verdict = NO_VERDICT
+
+    if expert_verdict is not None:
+        is_duplicate = bool(expert_is_duplicate)
+    else:
+        is_duplicate = duplicate_count >= 2
+
+    return {
+        "fact_checker_opinions_count": opinions_count,
+        "fact_checker_true_count": true_count,
+        "fact_checker_false_count": false_count,
+        "fact_checker_unidentified_count": unidentified_count,
+        "fact_checker_spam_count": spam_count,
+        "fact_checker_duplicate_count": duplicate_count,
+        "expert_verdict": expert_verdict,
+        "current_verdict": current_verdict,
+        "is_spam": spam_count >= 2 or expert_verdict == VerdictType.SPAM.value,
+        "is_duplicate": is_duplicate,
+    }
+
+
+def compute_verdict_state_from_row(row):
+    """
+    Computes verdict state out of a row returned by
+    NewsQuerySet.verdict_state_sources().
+    """
+    return compute_verdict_state(
+        opinions_count=row["opinions_count"],
+        true_count=row["true_count"],
+        false_count=row["false_count"],
+        unidentified_count=row["unidentified_count"],
+        spam_count=row["spam_count"],
+        duplicate_count=row["duplicate_count"],
+        expert_verdict=row["expertopinion__verdict"],
+        expert_is_duplicate=row["expertopinion__is_duplicate"],
+    )
+
+
+def compute_event_verdict(state):
+    """
+    Returns the verdict news verdict events are sent for out of stored verdict
+    state: the expert verdict, or a verdict given by at least two fact
+    checkers. None when there is no such verdict.
+    """
+    verdict = None
+    for event_verdict, count_field in EVENT_VERDICT_COUNT_FIELDS:
+        if state["expert_verdict"] == event_verdict:
+            return event_verdict
+        if state[count_field] >= 2:
+            verdict = event_verdict
+
+    return verdict
@@ -0,0 +1,174 @@
+import logging
+import os
+import select
+import signal
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from dook.core.database.instrumentation import log_queries
+from dook.core.processor.processor import NewsDraftProcessor, StaleNewsProcessor
+from dook.core.users.email_service import send_due_assignment_digests
+
+NEWS_DRAFT_CHANNEL = "news_draft_created"
+
+
+class DraftNotificationListener:
+    """
+    Listens for NOTIFY sent by the news_draft insert trigger on a dedicated
+    PostgreSQL connection, outside of Django connection handling.
+    """
+
+    def __init__(self, alias="default", channel=NEWS_DRAFT_CHANNEL):
+        self.alias = alias
+        self.channel = channel
+        self.connection = None
+        self.logger = logging.getLogger("processor")
+
+    @staticmethod
+    def is_supported(alias="default"):
+        return connections[alias].vendor == "postgresql"
+
+    def connect(self):
+        import psycopg2
+
+        params = connections[self.alias].get_connection_params()
+        self.connection = psycopg2.connect(**params)
+        self.connection.set_session(autocommit=True)
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+
+        self.logger.info(f"Listening for notifications on {self.channel}")
+
+    def fileno(self):
+        return self.connection.fileno()
+
+    def drain(self):
+        """
+        Consumes pending notifications and returns their count.
+        """
+        self.connection.poll()
+        count = len(self.connection.notifies)
+        self.connection.notifies.clear()
+        return count
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class ProcessorDaemon:
+    """
+    Keeps processors warm and processes news drafts as soon as they are
+    reported. Wakes up on news_draft NOTIFY or every poll interval, and stops
+    after the current batch on SIGTERM or SIGINT.
+    """
+
+    def __init__(self, workers=1, poll_interval=None):
+        self.workers = workers
+        self.poll_interval = poll_interval or settings.PROCESSOR_POLL_INTERVAL
+        self.drafts_processor = NewsDraftProcessor()
+        self.stale_news_processor = StaleNewsProcessor()
+        self.listener = None
+        self.stopping = False
+        self.logger = logging.getLogger("processor")
+        self._wakeup_read, self._wakeup_write = os.pipe()
+
+    def run(self):
+        previous_handlers = {
+            signum: signal.signal(signum, self.handle_stop_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        self.logger.info("Processor daemon started")
+
+        try:
+            while not self.stopping:
+                close_old_connections()
+                try:
+                    processed_all = self.process()
+                except Exception:
+                    self.logger.exception("Processing news drafts failed")
+                    processed_all = False
+                close_old_connections()
+
+                if processed_all and not self.stopping:
+                    # the batch was full, more drafts may be waiting
+                    continue
+
+                self.wait()
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            if self.listener is not None:
+                self.listener.close()
+            connections.close_all()
+            os.close(self._wakeup_read)
+            os.close(self._wakeup_write)
+
+        self.logger.info("Processor daemon stopped")
+
+    def process(self):
+        """
+        Runs stale news and drafts processing once and sends due assignment
+        digests. Returns whether the whole drafts batch was used up.
+        """
+        with log_queries(logging.getLogger("database"), "process_news"):
+            self.stale_news_processor.process_news()
+            stats = self.drafts_processor.process_batch(workers=self.workers)
+            if settings.ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES:
+                send_due_assignment_digests()
+
+        processed = sum(processed for processed, _ in stats)
+        return processed > 0 and processed >= self.drafts_processor.get_batch_size()
+
+    def wait(self):
+        descriptors = [self._wakeup_read]
+
+        listener = self.get_listener()
+        if listener is not None:
+            descriptors.append(listener)
+
+        try:
+            ready, _, _ = select.select(descriptors, [], [], self.poll_interval)
+        except OSError:
+            self.logger.exception("Waiting for news drafts failed")
+            return
+
+        if self._wakeup_read in ready:
+            os.read(self._wakeup_read, 1024)
+
+        if listener is not None and listener in ready:
+            try:
+                notifications = listener.drain()
+            except Exception:
+                self.logger.exception("Lost news drafts notifications connection")
+                self.close_listener()
+            else:
+                self.logger.info(f"Woken up by {notifications} news draft notifications")
+
+    def get_listener(self):
+        if self.listener is not None or not DraftNotificationListener.is_supported():
+            return self.listener
+
+        listener = DraftNotificationListener()
+        try:
+            listener.connect()
+        except Exception:
+            # polling continues, connecting is retried before the next wait
+            self.logger.exception("Listening for news drafts notifications failed")
+            listener.close()
+            return None
+
+        self.listener = listener
+        return listener
+
+    def close_listener(self):
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+
+    def handle_stop_signal(self, signum, frame):
+        self.logger.info(f"Received signal {signum}, stopping after current batch")
+        self.stopping = True
+        os.write(self._wakeup_write, b"\0")
@@ -0,0 +1,117 @@
+import threading
+from collections import deque
+
+from dook.core.news.models import SensitiveKeyword
+
+
+def normalize_text(text):
+    return text.lower()
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton matching all keyword names in a single pass over
+    normalized text.
+
+    Keywords are matched as substrings, like `keyword.name in text.lower()`.
+    Match positions are offsets in the normalized text.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            self._add_pattern(normalize_text(keyword.name), index)
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern, index):
+        if not pattern:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+
+        self._outputs[state].append((index, len(pattern)))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail_state = self._fail[state]
+                while fail_state and char not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                self._fail[next_state] = self._goto[fail_state].get(char, 0)
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+
+    def iter_matches(self, text):
+        """
+        Yields (start, end, keyword) for every keyword occurrence in the
+        normalized text.
+        """
+        for start, end, index in self._iter_match_indexes(text):
+            yield start, end, self.keywords[index]
+
+    def match(self, *texts):
+        """
+        Returns keywords found in any of the texts, in the order of keywords
+        the matcher was built with.
+        """
+        matched = set()
+        for text in texts:
+            matched.update(
+                index for _start, _end, index in self._iter_match_indexes(text)
+            )
+
+        return [self.keywords[index] for index in sorted(matched)]
+
+    def _iter_match_indexes(self, text):
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+
+        state = 0
+        for position, char in enumerate(normalize_text(text)):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for index, length in outputs[state]:
+                yield position + 1 - length, position + 1, index
+
+
+_matcher_lock = threading.Lock()
+_matcher_cache = {"fingerprint": None, "matcher": None}
+
+
+def get_sensitive_keyword_matcher():
+    """
+    Returns matcher of all sensitive keywords. The automaton is rebuilt only
+    when keywords were added, removed or renamed since the last call.
+    """
+    fingerprint = tuple(SensitiveKeyword.objects.order_by("id").values_list("id", "name"))
+
+    with _matcher_lock:
+        if _matcher_cache["fingerprint"] != fingerprint:
+            # matches are listed in the order keywords were created
+            keywords = list(SensitiveKeyword.objects.order_by("created_at", "id"))
+            _matcher_cache["matcher"] = KeywordMatcher(keywords)
+            # of the loaded keywords, in case they changed after the first query
+            _matcher_cache["fingerprint"] = tuple(
+                sorted((keyword.id, keyword.name) for keyword in keywords)
+            )
+
+        return _matcher_cache["matcher"]
@@ -0,0 +1,58 @@
+import random
+import timeit
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from dook.core.processor.pool import CheckerPool
+
+
+class Command(BaseCommand):
+    help = "Compares batch checker pool with per draft sorting of all fact checkers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checkers", type=int, default=10000)
+        parser.add_argument("--drafts", type=int, default=1000)
+        parser.add_argument("--per-draft", type=int, default=4)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        per_draft = options["per_draft"]
+        rows = [
+            (checker_id, f"checker{checker_id}@example.com", True, rng.randint(0, 5))
+            for checker_id in range(1, options["checkers"] + 1)
+        ]
+
+        def sort_per_draft():
+            counts = {checker_id: count for checker_id, _, _, count in rows}
+            for _ in range(options["drafts"]):
+                # sorts users of with_active_assignments_count() on every draft
+                users = [
+                    SimpleNamespace(
+                        id=checker_id,
+                        email=email,
+                        allow_subscriptions=allow_subscriptions,
+                        active_assignments_count=counts[checker_id],
+                    )
+                    for checker_id, email, allow_subscriptions, _ in rows
+                ]
+                rng.shuffle(users)
+                users.sort(key=lambda u: u.active_assignments_count)
+                for user in users[:per_draft]:
+                    counts[user.id] += 1
+
+        def take_from_pool():
+            pool = CheckerPool(rows, rng=rng)
+            for _ in range(options["drafts"]):
+                pool.take(per_draft)
+
+        sort_time = timeit.timeit(sort_per_draft, number=1)
+        pool_time = timeit.timeit(take_from_pool, number=1)
+
+        self.stdout.write(
+            f"{options['checkers']} fact checkers, {options['drafts']} drafts, "
+            f"{per_draft} fact checkers per draft"
+        )
+        self.stdout.write(f"Sorting per draft: {sort_time * 1000:.2f} ms")
+        self.stdout.write(f"Checker pool: {pool_time * 1000:.2f} ms")
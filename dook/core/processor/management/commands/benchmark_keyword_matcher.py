@@ -0,0 +1,58 @@
+import random
+import string
+import timeit
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from dook.core.processor.keywords import KeywordMatcher
+
+
+class Command(BaseCommand):
+    help = "Compares sensitive keyword matcher with per keyword substring scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keywords", type=int, default=1000)
+        parser.add_argument("--texts", type=int, default=100)
+        parser.add_argument("--text-length", type=int, default=2000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        keywords = [
+            SimpleNamespace(name=self.random_word(rng, rng.randint(4, 12)))
+            for _ in range(options["keywords"])
+        ]
+        texts = [
+            " ".join(
+                self.random_word(rng, rng.randint(2, 10))
+                for _ in range(options["text_length"] // 6)
+            )
+            for _ in range(options["texts"])
+        ]
+
+        build_time = timeit.timeit(lambda: KeywordMatcher(keywords), number=1)
+        matcher = KeywordMatcher(keywords)
+
+        def scan():
+            for text in texts:
+                [keyword for keyword in keywords if keyword.name in text.lower()]
+
+        def match():
+            for text in texts:
+                matcher.match(text)
+
+        scan_time = timeit.timeit(scan, number=1)
+        match_time = timeit.timeit(match, number=1)
+
+        self.stdout.write(
+            f"{options['keywords']} keywords, {options['texts']} texts "
+            f"of ~{options['text_length']} characters"
+        )
+        self.stdout.write(f"Automaton build: {build_time * 1000:.2f} ms")
+        self.stdout.write(f"Substring scans: {scan_time * 1000:.2f} ms")
+        self.stdout.write(f"Automaton matching: {match_time * 1000:.2f} ms")
+
+    @staticmethod
+    def random_word(rng, length):
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
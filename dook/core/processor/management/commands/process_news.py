@@ -1,14 +1,48 @@
+import logging
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from dook.core.database.instrumentation import log_queries
+from dook.core.processor.daemon import ProcessorDaemon
 from dook.core.processor.processor import NewsDraftProcessor, StaleNewsProcessor
+from dook.core.users.email_service import send_due_assignment_digests
 
 
 class Command(BaseCommand):
     help = "Processes a batch of news drafts and assigns fact checkers"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker threads processing news drafts concurrently",
+        )
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep running and process news drafts as soon as they are reported",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=None,
+            help="Seconds between polls when no notification arrives (daemon mode)",
+        )
+
     def handle(self, *args, **options):
+        if options["daemon"]:
+            ProcessorDaemon(
+                workers=options["workers"], poll_interval=options["poll_interval"]
+            ).run()
+            return
+
         drafts_processor = NewsDraftProcessor()
         stale_news_processor = StaleNewsProcessor()
 
-        stale_news_processor.process_news()
-        drafts_processor.process_batch()
+        with log_queries(logging.getLogger("database"), "process_news"):
+            stale_news_processor.process_news()
+            drafts_processor.process_batch(workers=options["workers"])
+            if settings.ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES:
+                send_due_assignment_digests()
@@ -2,10 +2,16 @@ from django.db import models
 
 
 class NewsDraftQuerySet(models.QuerySet):
-    def oldest_not_processed(self):
+    def claim_oldest_not_processed(self, exclude_ids=()):
+        """
+        Locks the oldest not processed drafts on the primary, skipping drafts
+        already locked by other workers. Has to be evaluated in a transaction.
+        """
         return (
-            self.using("readonly")
+            self.using("default")
+            .select_for_update(skip_locked=True)
             .filter(processing_result__isnull=True)
+            .exclude(id__in=exclude_ids)
             .order_by("reported_at")
         )
 
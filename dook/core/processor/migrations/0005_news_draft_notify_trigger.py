@@ -0,0 +1,41 @@
+from django.db import migrations
+
+CREATE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION notify_news_draft_created() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('news_draft_created', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS news_draft_created_notify ON news_draft;
+CREATE TRIGGER news_draft_created_notify
+    AFTER INSERT ON news_draft
+    FOR EACH STATEMENT EXECUTE PROCEDURE notify_news_draft_created();
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS news_draft_created_notify ON news_draft;
+DROP FUNCTION IF EXISTS notify_news_draft_created();
+"""
+
+
+def create_notify_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TRIGGER_SQL)
+
+
+def drop_notify_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("processor", "0004_auto_20200617_1124"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_notify_trigger, drop_notify_trigger),
+    ]
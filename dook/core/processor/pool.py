@@ -0,0 +1,88 @@
+import heapq
+import random
+import threading
+from collections import namedtuple
+
+PooledChecker = namedtuple("PooledChecker", ["id", "email", "allow_subscriptions"])
+
+
+class CheckerPool:
+    """
+    Fact checkers of a processing batch kept in a min-heap by their active
+    assignments count. Checkers with equal counts are taken in random order.
+
+    Counts are loaded once and then updated in memory, so the pool only
+    reflects assignments made through it since it was loaded.
+    """
+
+    def __init__(self, rows, rng=None):
+        """
+        Rows are (id, email, allow_subscriptions, active_assignments_count).
+        """
+        self._random = rng or random.Random()
+        self._checkers = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+        for checker_id, email, allow_subscriptions, count in rows:
+            self._checkers[checker_id] = PooledChecker(
+                checker_id, email, allow_subscriptions
+            )
+            self._heap.append((count, self._random.random(), checker_id))
+        heapq.heapify(self._heap)
+
+    @classmethod
+    def from_queryset(cls, users, rng=None):
+        rows = users.with_active_assignments_count().values_list(
+            "id", "email", "allow_subscriptions", "active_assignments_count"
+        )
+        return cls(rows, rng=rng)
+
+    def __len__(self):
+        return len(self._checkers)
+
+    def take(self, count, exclude_ids=()):
+        """
+        Returns up to `count` checkers with the least active assignments,
+        skipping `exclude_ids`, and counts one more assignment for each.
+        """
+        exclude_ids = set(exclude_ids)
+        taken, skipped = [], []
+
+        with self._lock:
+            while self._heap and len(taken) < count:
+                entry = heapq.heappop(self._heap)
+                if entry[2] in exclude_ids:
+                    skipped.append(entry)
+                else:
+                    taken.append(entry)
+
+            for assignments, _, checker_id in taken:
+                heapq.heappush(
+                    self._heap, (assignments + 1, self._random.random(), checker_id)
+                )
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+
+        return [self._checkers[checker_id] for _, _, checker_id in taken]
+
+    def release(self, checkers):
+        """
+        Reverts assignments counted by take(), e.g. when they were rolled back.
+        """
+        released_ids = {checker.id for checker in checkers}
+        if not released_ids:
+            return
+
+        with self._lock:
+            self._heap = [
+                (assignments - 1, tiebreak, checker_id)
+                if checker_id in released_ids
+                else (assignments, tiebreak, checker_id)
+                for assignments, tiebreak, checker_id in self._heap
+            ]
+            heapq.heapify(self._heap)
+
+    def get_assignments_counts(self):
+        with self._lock:
+            return {checker_id: count for count, _, checker_id in self._heap}
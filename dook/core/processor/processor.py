@@ -1,17 +1,24 @@
 import logging
 import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 
 from anymail.exceptions import AnymailError
 from django.conf import settings
-from django.db import transaction
+from django.db import connections, transaction
 from django.db.transaction import atomic
 
-from dook.core.news.models import News, NewsSensitiveKeyword, SensitiveKeyword
+from dook.core.database.instrumentation import get_active_recorder, record_queries
+from dook.core.news.models import News, NewsSensitiveKeyword
 from dook.core.processor.errors import (
     NEWS_DRAFT_PROCESSING_WITH_UNHANDLED_EXCEPTION_ERROR,
     NOTIFICATION_SENDING_FAILED_ERROR,
 )
+from dook.core.processor.keywords import get_sensitive_keyword_matcher
 from dook.core.processor.models import NewsDraft
+from dook.core.processor.pool import CheckerPool
 from dook.core.users import email_service
 from dook.core.users.models import User, UserNews
 
@@ -33,6 +40,37 @@ class ProcessorBase:
         return send_notifications
 
 
+class DraftBatch:
+    """
+    Number of drafts left to process in a batch, shared by workers.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._left = size
+        self._failed_ids = set()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            if self._left <= 0:
+                return False
+            self._left -= 1
+            return True
+
+    def mark_failed(self, draft_id):
+        with self._lock:
+            self._failed_ids.add(draft_id)
+
+    def get_failed_ids(self):
+        with self._lock:
+            return list(self._failed_ids)
+
+    def is_failed(self, draft_id):
+        with self._lock:
+            return draft_id in self._failed_ids
+
+
 class NewsDraftProcessor(ProcessorBase):
     def __init__(self):
         super().__init__()
@@ -40,30 +78,110 @@ class NewsDraftProcessor(ProcessorBase):
         self.user_news = UserNews.objects
         self.drafts = NewsDraft.objects
         self.news_keywords = NewsSensitiveKeyword.objects
-        self.keywords = self.get_keywords()
+        self.keyword_matcher = None
+        self.checker_pool = None
 
-    def get_keywords(self):
-        keywords = SensitiveKeyword.objects.all()
-        return keywords
+    def get_keyword_matcher(self):
+        if self.keyword_matcher is None:
+            self.refresh_keyword_matcher()
+        return self.keyword_matcher
 
-    def process_batch(self):
-        news_drafts = self.next_batch()
+    def refresh_keyword_matcher(self):
+        self.keyword_matcher = get_sensitive_keyword_matcher()
 
-        self.logger.info(f"Fetched batch of {len(news_drafts)} news drafts")
+    def get_checker_pool(self):
+        if self.checker_pool is None:
+            self.refresh_checker_pool()
+        return self.checker_pool
 
-        for news_draft in news_drafts:
-            try:
-                self.process_draft(news_draft)
-            except Exception:
-                self.logger.exception(
-                    NEWS_DRAFT_PROCESSING_WITH_UNHANDLED_EXCEPTION_ERROR.format(
-                        news_draft
+    def refresh_checker_pool(self):
+        self.checker_pool = CheckerPool.from_queryset(
+            self.fact_checkers.active_verified()
+        )
+
+    def process_batch(self, workers=1):
+        """
+        Processes up to a batch size of drafts with the given number of worker
+        threads. Every draft is claimed with a row lock for the transaction
+        materializing it, so concurrent workers and processor runs never
+        process the same draft twice.
+        """
+        self.refresh_keyword_matcher()
+        self.refresh_checker_pool()
+        batch = DraftBatch(size=self.get_batch_size())
+
+        self.logger.info(
+            f"Processing batch of up to {batch.size} news drafts with {workers} workers"
+        )
+
+        if workers == 1:
+            stats = [self.run_worker(1, batch)]
+        else:
+            # queries of workers are recorded with the ones of this thread
+            query_recorder = get_active_recorder()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                stats = list(
+                    executor.map(
+                        lambda number: self.run_worker(
+                            number,
+                            batch,
+                            close_connections=True,
+                            query_recorder=query_recorder,
+                        ),
+                        range(1, workers + 1),
                     )
                 )
 
-    def next_batch(self):
-        batch_size = self.get_batch_size()
-        return self.drafts.oldest_not_processed()[:batch_size]
+        self.logger.info(
+            f"Processed {sum(processed for processed, _ in stats)} news drafts"
+        )
+        return stats
+
+    def run_worker(self, number, batch, close_connections=False, query_recorder=None):
+        started_at = time.monotonic()
+        processed = 0
+
+        try:
+            with ExitStack() as stack:
+                if query_recorder is not None:
+                    stack.enter_context(record_queries(query_recorder))
+                while batch.take():
+                    news_draft = self.process_next_draft(batch)
+                    if news_draft is None:
+                        break
+                    # failed drafts use up the batch, but are not processed, so
+                    # callers looping over full batches do not retry them at once
+                    if not batch.is_failed(news_draft.id):
+                        processed += 1
+        finally:
+            if close_connections:
+                connections.close_all()
+
+        elapsed = time.monotonic() - started_at
+        throughput = processed / elapsed if elapsed else 0
+        self.logger.info(
+            f"Worker {number} processed {processed} news drafts "
+            f"in {elapsed:.2f}s ({throughput:.2f} drafts/s)"
+        )
+        return processed, elapsed
+
+    @atomic
+    def process_next_draft(self, batch):
+        news_draft = self.drafts.claim_oldest_not_processed(
+            exclude_ids=batch.get_failed_ids()
+        ).first()
+        if news_draft is None:
+            return None
+
+        try:
+            self.process_draft(news_draft)
+        except Exception:
+            batch.mark_failed(news_draft.id)
+            self.logger.exception(
+                NEWS_DRAFT_PROCESSING_WITH_UNHANDLED_EXCEPTION_ERROR.format(news_draft)
+            )
+
+        return news_draft
 
     def get_batch_size(self):
         # we want to assign one news per fact checker on average
@@ -80,16 +198,18 @@ class NewsDraftProcessor(ProcessorBase):
 
     def assign_fact_checkers_to_materialized_news(self, news_draft):
         checkers = self.get_checkers()
-        news = self.materialize_news(news_draft)
-        self.logger.info(f"Assigning {len(checkers)} fact checkers")
-        self.user_news.assign_users_to_news(checkers, news)
-        news_draft.mark_assigned()
-        transaction.on_commit(lambda: self.send_notifications_callback(checkers, news))
+        try:
+            news = self.materialize_news(news_draft)
+            self.logger.info(f"Assigning {len(checkers)} fact checkers")
+            self.user_news.assign_users_to_news(checkers, news)
+            news_draft.mark_assigned()
+        except Exception:
+            self.get_checker_pool().release(checkers)
+            raise
+        transaction.on_commit(self.send_notifications_callback(checkers, news))
 
     def get_checkers(self):
-        return self.fact_checkers.active_verified().ordered_by_active_assignments_randomized()[
-            : settings.TARGET_ASSIGNMENTS_PER_NEWS_COUNT
-        ]
+        return self.get_checker_pool().take(settings.TARGET_ASSIGNMENTS_PER_NEWS_COUNT)
 
     def materialize_news(self, news_draft):
         news = news_draft.as_news()
@@ -100,16 +220,12 @@ class NewsDraftProcessor(ProcessorBase):
             news.is_sensitive = True if keywords else False
 
         news.save()
+        if news.screenshot_url:
+            news.events.screenshot_attached()
         return news
 
     def get_keywords_out_of_text(self, news):
-        associated_keywords = []
-        text = news.text
-        comment = news.comment
-        for keyword in self.keywords:
-            if keyword.name in text.lower() or keyword.name in comment.lower():
-                associated_keywords.append(keyword)
-        return associated_keywords
+        return self.get_keyword_matcher().match(news.text, news.comment)
 
     def assign_keywords_to_news(self, keywords, news):
         self.news_keywords.assign_keywords_to_news(keywords, news)
@@ -123,19 +239,37 @@ class StaleNewsProcessor(ProcessorBase):
         self.news = News.objects
 
     def process_news(self):
+        """
+        Assigns missing fact checkers to a batch of stale news in one pass,
+        oldest news first. Fact checkers already assigned to a news are never
+        assigned to it again.
+        """
+        started_at = time.monotonic()
         stale_news = self.get_stale_news_batch()
+        assigned_user_ids = self.user_news.get_assigned_user_ids(
+            [news.id for news in stale_news]
+        )
+        pool = CheckerPool.from_queryset(self.fact_checkers.active_verified())
+        loaded_at = time.monotonic()
+
+        assignments = self.get_assignments(stale_news, assigned_user_ids, pool)
+        planned_at = time.monotonic()
+
+        self.assign_additional_fact_checkers(assignments)
+        finished_at = time.monotonic()
 
         self.logger.info(
-            f"Assigning additional fact checkers to {len(stale_news)} stale news"
+            f"Assigned {sum(len(checkers) for checkers, _ in assignments)} fact checkers "
+            f"to {len(stale_news)} stale news in {finished_at - started_at:.2f}s "
+            f"(loading {loaded_at - started_at:.2f}s, "
+            f"picking {planned_at - loaded_at:.2f}s, "
+            f"saving {finished_at - planned_at:.2f}s)"
         )
 
-        for news in stale_news:
-            self.assign_additional_fact_checkers_to_stale_news(news)
-
     def get_stale_news_batch(self):
         stale_news = self.news.stale()
         limit = self.get_stale_news_batch_size()
-        return stale_news[:limit]
+        return list(stale_news[:limit])
 
     def get_stale_news_batch_size(self):
         # no more than one additional news for each fact checker
@@ -145,20 +279,24 @@ class StaleNewsProcessor(ProcessorBase):
             )
         )
 
-    @atomic
-    def assign_additional_fact_checkers_to_stale_news(self, news):
-        checkers = self.get_checkers(news)
-        self.logger.info(f"Assigning {len(checkers)} fact checkers to {news}")
-        self.user_news.assign_users_to_news(checkers, news)
-        transaction.on_commit(lambda: self.send_notifications_callback(checkers, news))
-
-    def get_checkers(self, news):
-        missing = (
-            settings.TARGET_ASSIGNMENTS_PER_NEWS_COUNT - news.factcheckeropinion__count
-        )
-        checkers = (
-            self.fact_checkers.active_verified()
-            .exclude_assigned_to_news(news)
-            .ordered_by_active_assignments_randomized()[:missing]
+    def get_assignments(self, stale_news, assigned_user_ids, pool):
+        assignments = []
+        for news in stale_news:
+            checkers = pool.take(
+                self.get_missing_checkers_count(news),
+                exclude_ids=assigned_user_ids.get(news.id, ()),
+            )
+            if checkers:
+                assignments.append((checkers, news))
+        return assignments
+
+    def get_missing_checkers_count(self, news):
+        return (
+            settings.TARGET_ASSIGNMENTS_PER_NEWS_COUNT - news.fact_checker_opinions_count
         )
-        return checkers
+
+    @atomic
+    def assign_additional_fact_checkers(self, assignments):
+        self.user_news.assign_users_to_many_news(assignments)
+        for checkers, news in assignments:
+            transaction.on_commit(self.send_notifications_callback(checkers, news))
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PRIMARY_DATABASE = "default"
+REPLICA_DATABASE = "readonly"
+
+# seconds the replica replays behind the primary, 0 when it replayed all it
+# received and NULL when the database is not a replica
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_routing = threading.local()
+
+
+def is_reading_from_replica():
+    return getattr(_routing, "replica", False)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Routes reads in the block to the replica, until the first query on the
+    primary in the block, eg. a write, so the rest of it reads its own writes.
+    """
+
+    def read_from_primary(execute, sql, params, many, context):
+        _routing.replica = False
+        return execute(sql, params, many, context)
+
+    previous = is_reading_from_replica()
+    _routing.replica = True
+    try:
+        with connections[PRIMARY_DATABASE].execute_wrapper(read_from_primary):
+            yield
+    finally:
+        _routing.replica = previous
+
+
+@contextmanager
+def primary_reads():
+    """ Routes reads in the block to the primary, eg. to build cached payloads. """
+    previous = is_reading_from_replica()
+    _routing.replica = False
+    try:
+        yield
+    finally:
+        _routing.replica = previous
+
+
+class ReplicaRouter:
+    """
+    Sends reads in replica_reads blocks to the replica and all other queries
+    to the primary. Queries with an explicit `using` are not routed.
+    """
+
+    def db_for_read(self, model, **hints):
+        return REPLICA_DATABASE if is_reading_from_replica() else PRIMARY_DATABASE
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DATABASE
+
+
+class ReplicaLagGuard:
+    """
+    Tells whether the replica replays less than REPLICA_MAX_LAG seconds behind
+    the primary. The lag is checked at most every REPLICA_LAG_CHECK_INTERVAL
+    seconds per process, an unreachable replica counts as lagging.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_at = None
+        self.available = False
+        self.logger = logging.getLogger(__name__)
+
+    def is_available(self):
+        with self.lock:
+            now = time.monotonic()
+            if (
+                self.checked_at is not None
+                and now - self.checked_at < settings.REPLICA_LAG_CHECK_INTERVAL
+            ):
+                return self.available
+            # other threads use the previous result until this check is done
+            self.checked_at = now
+
+        self.available = self.check()
+        return self.available
+
+    def check(self):
+        try:
+            lag = self.get_lag()
+        except DatabaseError:
+            self.logger.exception("Replica lag check failed, reading from primary")
+            return False
+
+        if lag > settings.REPLICA_MAX_LAG:
+            self.logger.warning(f"Replica lags {lag:.1f}s, reading from primary")
+            return False
+        return True
+
+    def get_lag(self):
+        connection = connections[REPLICA_DATABASE]
+        if connection.vendor != "postgresql":
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_QUERY)
+            (lag,) = cursor.fetchone()
+        return float(lag or 0)
+
+
+replica_lag_guard = ReplicaLagGuard()
@@ -33,3 +33,9 @@ class InvitationUserRoleType(models.TextChoices):
     SPECIALIST = "specialist", _("Specialist")
     EXPERT = "expert", _("Expert")
     MODERATOR = "moderator", _("Moderator")
+
+
+class QueuedEmailStatus(models.TextChoices):
+    QUEUED = "queued", _("Queued")
+    SENT = "sent", _("Sent")
+    FAILED = "failed", _("Failed")
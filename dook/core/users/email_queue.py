@@ -0,0 +1,124 @@
+import datetime
+import logging
+
+from anymail.exceptions import AnymailError
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from dook.core.users.email_service import check_email_status
+from dook.core.users.models import QueuedEmail
+
+
+class EmailQueueDelivery:
+    """
+    Renders and sends queued e-mails in batches, all messages of a batch over
+    a single backend connection. Sending failures are retried with backoff,
+    messages rejected by the provider are marked failed. The result of every
+    message is saved right after sending it, so only a message interrupted
+    while being sent is sent again when the lease of its batch ends.
+    """
+
+    def __init__(self, batch_size=None):
+        self.batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+        self.emails = QueuedEmail.objects
+        self.logger = logging.getLogger("emails")
+
+    def deliver_batch(self):
+        """
+        Sends one batch of due e-mails and returns the number of e-mails
+        handled, successfully or not.
+        """
+        queued_emails = self.claim_batch()
+        if not queued_emails:
+            return 0
+
+        connection = get_connection()
+        connection.open()
+        try:
+            for queued_email in queued_emails:
+                self.send(connection, queued_email)
+                queued_email.save(
+                    update_fields=[
+                        "status",
+                        "attempts",
+                        "last_error",
+                        "provider_status",
+                        "message_id",
+                        "available_at",
+                        "sent_at",
+                    ]
+                )
+        finally:
+            connection.close()
+
+        return len(queued_emails)
+
+    def claim_batch(self):
+        """
+        Leases a batch of due e-mails for EMAIL_QUEUE_LEASE seconds, so they
+        are sent outside of a transaction while other workers skip them.
+        """
+        lease_until = timezone.now() + datetime.timedelta(
+            seconds=settings.EMAIL_QUEUE_LEASE
+        )
+        with transaction.atomic(using="default"):
+            queued_emails = list(self.emails.claim_due()[: self.batch_size])
+            self.emails.using("default").filter(
+                id__in=[queued_email.id for queued_email in queued_emails]
+            ).update(available_at=lease_until)
+
+        for queued_email in queued_emails:
+            queued_email.available_at = lease_until
+        return queued_emails
+
+    def deliver_all(self):
+        delivered = 0
+        while True:
+            batch_delivered = self.deliver_batch()
+            delivered += batch_delivered
+            if batch_delivered < self.batch_size:
+                return delivered
+
+    def send(self, connection, queued_email):
+        try:
+            message = queued_email.render()
+        except Exception as e:
+            self.logger.exception(f"Rendering {queued_email} failed")
+            queued_email.mark_failed(repr(e), retry=False)
+            return
+
+        try:
+            connection.send_messages([message])
+        except AnymailError as e:
+            self.logger.warning(f"Sending {queued_email} failed: {e}")
+            queued_email.mark_failed(str(e))
+            return
+        except Exception as e:
+            self.logger.exception(f"Sending {queued_email} failed")
+            queued_email.mark_failed(repr(e))
+            return
+
+        anymail_status = getattr(message, "anymail_status", None)
+        if anymail_status is None:
+            # sent by a non Anymail backend, which raises on failures
+            queued_email.mark_sent()
+            return
+
+        provider_status = ",".join(sorted(anymail_status.status or ()))
+        if check_email_status(anymail_status.status):
+            queued_email.mark_sent(provider_status, str(anymail_status.message_id or ""))
+        else:
+            queued_email.mark_failed(
+                f"Rejected by provider: {provider_status}",
+                retry=False,
+                provider_status=provider_status,
+            )
+
+    def log_stats(self):
+        counts = self.emails.status_counts()
+        self.logger.info(
+            "Queued e-mails: "
+            + ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        )
@@ -1,73 +1,92 @@
+import datetime
+from collections import defaultdict
+
 from django.conf import settings
-from django.core.mail import EmailMessage, get_connection
-from django.template.loader import render_to_string
+from django.core.mail import get_connection
+from django.db import transaction
+
+
+def send_templated_email(subject, template, context, to):
+    return send_templated_emails([(subject, template, context, to)])
+
+
+def send_templated_emails(emails):
+    """
+    Queues (subject, template, context, to) e-mails for the deliver_emails
+    worker, in the current transaction. With EMAIL_QUEUE disabled renders and
+    sends them right away over a single connection.
+
+    Returns whether all e-mails were accepted for delivery.
+    """
+    from dook.core.users.models import QueuedEmail
+
+    queued_emails = [QueuedEmail.objects.build(*email) for email in emails]
+    if settings.EMAIL_QUEUE:
+        QueuedEmail.objects.bulk_create(queued_emails)
+        return True
+
+    messages = [queued_email.render() for queued_email in queued_emails]
+    get_connection().send_messages(messages)
+    return all(check_message_status(message) for message in messages)
 
 
 def send_registration_confirm_email(url, user):
     REGISTRATION_CONFIRMATION_SUBJECT = "[SFNF] Kod weryfikacyjny."
-    message = render_to_string(
-        "account_activation_email.html", {"user_name": user.name, "url": url,},
-    )
 
-    email = EmailMessage(
+    return send_templated_email(
         REGISTRATION_CONFIRMATION_SUBJECT,
-        message,
-        settings.EMAIL_HOST_USER,
+        "account_activation_email.html",
+        {"user_name": user.name, "url": url},
         to=[user.email],
     )
-    email.send()
-    return check_email_status(email.anymail_status.status)
 
 
 def send_account_confirmed_email(user):
     ACCOUNT_CONFIRMATION_SUBJECT = "[SFNF] Potwierdzenie."
-    message = render_to_string("account_confirmed_email.html", {"user_name": user.name,},)
 
-    email = EmailMessage(
-        ACCOUNT_CONFIRMATION_SUBJECT, message, settings.EMAIL_HOST_USER, to=[user.email]
+    return send_templated_email(
+        ACCOUNT_CONFIRMATION_SUBJECT,
+        "account_confirmed_email.html",
+        {"user_name": user.name},
+        to=[user.email],
     )
-    email.send()
-    return check_email_status(email.anymail_status.status)
 
 
 def send_registration_invitation_email(email, invite_url):
     REGISTRATION_INVITATION_SUBJECT = (
         "[SFNF] Zaproszenie do rejestracji w aplikacji dla Fake Hunterów"
     )
-    message = render_to_string(
-        "registration_invitation_email.html", {"email": email, "invite_url": invite_url},
-    )
 
-    email = EmailMessage(
-        REGISTRATION_INVITATION_SUBJECT, message, settings.EMAIL_HOST_USER, to=[email]
+    return send_templated_email(
+        REGISTRATION_INVITATION_SUBJECT,
+        "registration_invitation_email.html",
+        {"email": email, "invite_url": invite_url},
+        to=[email],
     )
-    email.send()
-    return check_email_status(email.anymail_status.status)
 
 
 def send_registration_confirmation_email(name, email):
     REGISTRATION_CONFIRMATION_SUBJECT = (
         "Potwierdzenie rejestracji w aplikacji #FakeHunter"
     )
-    message = render_to_string("registration_confirmation_email.html", {"name": name},)
 
-    email = EmailMessage(
-        REGISTRATION_CONFIRMATION_SUBJECT, message, settings.EMAIL_HOST_USER, to=[email]
+    return send_templated_email(
+        REGISTRATION_CONFIRMATION_SUBJECT,
+        "registration_confirmation_email.html",
+        {"name": name},
+        to=[email],
     )
-    email.send()
-    return check_email_status(email.anymail_status.status)
 
 
 def send_password_reset_email(email, reset_url):
     PASSWORD_RESET_SUBJECT = "[SFNF] Prośba o zmianę hasła."
 
-    message = render_to_string("password_reset_email.html", {"reset_url": reset_url,},)
-
-    email = EmailMessage(
-        PASSWORD_RESET_SUBJECT, message, settings.EMAIL_HOST_USER, to=[email]
+    return send_templated_email(
+        PASSWORD_RESET_SUBJECT,
+        "password_reset_email.html",
+        {"reset_url": reset_url},
+        to=[email],
     )
-    email.send()
-    return check_email_status(email.anymail_status.status)
 
 
 def check_email_status(status):
@@ -80,29 +99,80 @@ def check_email_status(status):
         return False
 
 
-def assignment_notification_email_factory(
+def check_message_status(message):
+    anymail_status = getattr(message, "anymail_status", None)
+    if anymail_status is None:
+        # sent by a non Anymail backend, which raises on failures
+        return True
+    return check_email_status(anymail_status.status)
+
+
+def assignment_notification_email(
     user, news, template="assignment_notification_email.html"
 ):
     SUBJECT = "[SFNF] Przypisanie nowego zgłoszenia"
-    url = get_news_url(news)
-    message = render_to_string(template, {"url": url},)
-
-    return EmailMessage(
-        subject=SUBJECT,
-        body=message,
-        from_email=settings.EMAIL_HOST_USER,
-        to=[user.email],
-    )
+    return SUBJECT, template, {"url": get_news_url(news)}, [user.email]
 
 
 def get_news_url(news):
-    return f"https://{settings.PANEL_DOMAIN_NAME}/submissions/{news.id}"
+    return get_news_id_url(news.id)
+
+
+def get_news_id_url(news_id):
+    return f"https://{settings.PANEL_DOMAIN_NAME}/submissions/{news_id}"
 
 
 def send_multiple_assignment_notifications(users, news):
-    messages = [assignment_notification_email_factory(user, news) for user in users]
-    connection = get_connection()
-    connection.send_messages(messages)
+    """
+    Notifies users about assignment of the news, or collects the assignments
+    for digests when ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES is set.
+    """
+    if settings.ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES:
+        from dook.core.users.models import AssignmentNotification
+
+        AssignmentNotification.objects.collect(users, news)
+        return True
+
+    return send_templated_emails(
+        [assignment_notification_email(user, news) for user in users]
+    )
+
+
+def send_due_assignment_digests():
+    """
+    Sends a single e-mail listing all collected assignments to every user
+    whose oldest collected assignment waits longer than the digest window.
+    Returns the number of digests sent.
+    """
+    from dook.core.users.models import AssignmentNotification
+
+    SUBJECT = "[SFNF] Przypisanie nowych zgłoszeń"
+    window = datetime.timedelta(minutes=settings.ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES)
+
+    with transaction.atomic(using="default"):
+        news_ids_by_email = defaultdict(list)
+        for (
+            _,
+            email,
+            allow_subscriptions,
+            news_id,
+        ) in AssignmentNotification.objects.pop_due(window):
+            if allow_subscriptions:
+                news_ids_by_email[email].append(news_id)
+
+        send_templated_emails(
+            [
+                (
+                    SUBJECT,
+                    "assignment_digest_email.html",
+                    {"urls": [get_news_id_url(news_id) for news_id in news_ids]},
+                    [email],
+                )
+                for email, news_ids in news_ids_by_email.items()
+            ]
+        )
+
+    return len(news_ids_by_email)
 
 
 def send_news_verified_notification(user_email, news_pk, verdict_type):
@@ -115,52 +185,35 @@ def send_news_verified_notification(user_email, news_pk, verdict_type):
 
     NEWS_VERIFIED_SUBJECT = "[SFNF] Informacja o weryfikacji zgłoszenia."
 
-    message = render_to_string(EMAIL_TEMPLATES[verdict_type], {"news_url": url,},)
-
-    email = EmailMessage(
-        NEWS_VERIFIED_SUBJECT, message, settings.EMAIL_HOST_USER, to=[user_email]
+    return send_templated_email(
+        NEWS_VERIFIED_SUBJECT,
+        EMAIL_TEMPLATES[verdict_type],
+        {"news_url": url},
+        to=[user_email],
     )
-    email.send()
-    return check_email_status(email.anymail_status.status)
 
 
 def send_news_assignment_for_expert(expert, news):
-    email = assignment_notification_email_factory(
-        user=expert, news=news, template="expert_assignment_notification_email.html"
+    return send_templated_email(
+        *assignment_notification_email(
+            user=expert, news=news, template="expert_assignment_notification_email.html"
+        )
     )
-    email.send()
-
-    return check_email_status(email.anymail_status.status)
 
 
 def send_news_dismissal_for_expert(expert, news):
-    message = render_to_string(
-        "expert_dismissal_notification_email.html", {"url": get_news_url(news)}
-    )
-
-    email = EmailMessage(
-        subject="[SFNF] Zmiana przypisania zgłoszenia",
-        body=message,
-        from_email=settings.EMAIL_HOST_USER,
+    return send_templated_email(
+        "[SFNF] Zmiana przypisania zgłoszenia",
+        "expert_dismissal_notification_email.html",
+        {"url": get_news_url(news)},
         to=[expert.email],
     )
-    email.send()
-
-    return check_email_status(email.anymail_status.status)
 
 
 def send_news_assignment_rejection_for_assignor(assignee, news, assignor_email):
-    message = render_to_string(
+    return send_templated_email(
+        "[SFNF] Zmiana przypisania zgłoszenia",
         "expert_assignment_rejection_email.html",
         {"url": get_news_url(news), "email": assignee.email},
-    )
-
-    email = EmailMessage(
-        subject="[SFNF] Zmiana przypisania zgłoszenia",
-        body=message,
-        from_email=settings.EMAIL_HOST_USER,
         to=[assignor_email],
     )
-    email.send()
-
-    return check_email_status(email.anymail_status.status)
@@ -8,6 +8,8 @@ from dook.core.users.email_service import send_news_verified_notification
 
 
 class NewsNewVerdictSubscriber:
+    outbox = True
+
     @classmethod
     def receive(self, obj, *args, **kwargs):
         logger = logging.getLogger("events")
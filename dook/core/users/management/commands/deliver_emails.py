@@ -0,0 +1,55 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dook.core.events.outbox import OutboxWorker
+from dook.core.users.constants import QueuedEmailStatus
+from dook.core.users.email_queue import EmailQueueDelivery
+from dook.core.users.models import QueuedEmail
+
+
+class Command(BaseCommand):
+    help = "Renders and sends queued e-mails"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--daemon",
+            action="store_true",
+            help="Keep running and send e-mails as they become due",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--poll-interval",
+            type=int,
+            default=None,
+            help="Seconds between polls when the queue is drained (daemon mode)",
+        )
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            default=None,
+            help="Delete e-mails sent more than the given number of days ago",
+        )
+
+    def handle(self, *args, **options):
+        if options["purge_days"] is not None:
+            deleted, _ = QueuedEmail.objects.filter(
+                status=QueuedEmailStatus.SENT,
+                sent_at__lt=timezone.now()
+                - datetime.timedelta(days=options["purge_days"]),
+            ).delete()
+            self.stdout.write(f"Deleted {deleted} sent e-mails")
+
+        delivery = EmailQueueDelivery(batch_size=options["batch_size"])
+        if options["daemon"]:
+            OutboxWorker(
+                delivery=delivery,
+                poll_interval=options["poll_interval"]
+                or settings.EMAIL_QUEUE_POLL_INTERVAL,
+            ).run()
+            return
+
+        delivered = delivery.deliver_all()
+        self.stdout.write(f"Handled {delivered} e-mails")
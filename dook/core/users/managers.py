@@ -1,13 +1,20 @@
 import datetime
-from random import shuffle
+import json
+from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.auth.models import BaseUserManager
 from django.db import models
 from django.db.models import Q
 from django.db.models.functions import Now
+from django.utils import timezone
 
-from dook.core.users.constants import UserRoleType, UserSpecializationType
+from dook.core.database.instrumentation import InstrumentedQuerySet
+from dook.core.users.constants import (
+    QueuedEmailStatus,
+    UserRoleType,
+    UserSpecializationType,
+)
 from dook.core.users.errors import MISSING_EMAIL_ERROR, MISSING_USER_NAME_ERROR
 
 ACTIVE_ASSIGNMENTS_BOUNDARY_EXPR = (
@@ -17,7 +24,7 @@ ACTIVE_ASSIGNMENTS_BOUNDARY_EXPR = (
 )
 
 
-class UserQuerySet(models.QuerySet):
+class UserQuerySet(InstrumentedQuerySet):
     def fact_checkers_with_opinions_count(self):
         return self.annotate(
             verified=models.Count("factcheckeropinion", distinct=True)
@@ -54,15 +61,6 @@ class UserQuerySet(models.QuerySet):
     def _active_assignments_filter(self):
         return Q(usernews_set__created_at__gte=ACTIVE_ASSIGNMENTS_BOUNDARY_EXPR)
 
-    def exclude_assigned_to_news(self, news):
-        return self.exclude(usernews_set__news=news)
-
-    def ordered_by_active_assignments_randomized(self):
-        users = list(self.with_active_assignments_count())
-        shuffle(users)
-        users.sort(key=lambda u: u.active_assignments_count)
-        return users
-
 
 class UserManagerBase(BaseUserManager):
     def create_user(self, email, name, password, specialization=None, role=None):
@@ -113,5 +111,98 @@ class FactCheckersManager(UserManager):
 
 class UserNewsManager(models.Manager):
     def assign_users_to_news(self, users, news):
-        user_news = [self.model(user=user, news=news) for user in users]
+        user_news = [self.model(user_id=user.id, news=news) for user in users]
         self.bulk_create(user_news)
+
+    def assign_users_to_many_news(self, assignments):
+        """
+        Creates assignments given as (users, news) pairs in a single query.
+        """
+        user_news = [
+            self.model(user_id=user.id, news=news)
+            for users, news in assignments
+            for user in users
+        ]
+        self.bulk_create(user_news)
+
+    def get_assigned_user_ids(self, news_ids):
+        assigned_user_ids = defaultdict(set)
+        for news_id, user_id in self.filter(news_id__in=news_ids).values_list(
+            "news_id", "user_id"
+        ):
+            assigned_user_ids[news_id].add(user_id)
+        return assigned_user_ids
+
+
+class QueuedEmailQuerySet(models.QuerySet):
+    def due(self):
+        return self.filter(
+            status=QueuedEmailStatus.QUEUED, available_at__lte=timezone.now()
+        )
+
+    def claim_due(self):
+        """
+        Locks due e-mails on the primary, oldest first, skipping e-mails
+        already locked by other workers. Has to be evaluated in a transaction.
+        """
+        return (
+            self.using("default")
+            .select_for_update(skip_locked=True)
+            .due()
+            .order_by("available_at", "id")
+        )
+
+    def status_counts(self):
+        return dict(
+            self.order_by()
+            .values("status")
+            .annotate(count=models.Count("id"))
+            .values_list("status", "count")
+        )
+
+
+class QueuedEmailManager(models.Manager.from_queryset(QueuedEmailQuerySet)):
+    def build(self, subject, template, context, to):
+        return self.model(
+            subject=subject,
+            template=template,
+            context=json.dumps(context),
+            from_email=settings.EMAIL_HOST_USER,
+            to=json.dumps(list(to)),
+        )
+
+
+class AssignmentNotificationManager(models.Manager):
+    def collect(self, users, news):
+        self.bulk_create(
+            [self.model(user_id=user.id, news=news) for user in users],
+            ignore_conflicts=True,
+        )
+
+    def pop_due(self, window):
+        """
+        Removes and returns (user_id, email, allow_subscriptions, news_id) of
+        notifications of users whose oldest notification waits longer than the
+        window. Has to be called in a transaction.
+        """
+        due_user_ids = (
+            self.order_by()
+            .values("user")
+            .annotate(oldest_created_at=models.Min("created_at"))
+            .filter(oldest_created_at__lte=timezone.now() - window)
+            .values("user")
+        )
+        notifications = list(
+            self.using("default")
+            .select_for_update(skip_locked=True, of=("self",))
+            .filter(user__in=due_user_ids)
+            .order_by("created_at")
+            .values_list(
+                "id", "user_id", "user__email", "user__allow_subscriptions", "news_id"
+            )
+        )
+        self.using("default").filter(
+            id__in=[notification[0] for notification in notifications]
+        ).delete()
+
+        return [notification[1:] for notification in notifications]
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.7 on 2026-10-17 20:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0017_news_search_vector'),
+        ('users', '0015_queuedemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='news.News')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'news')},
+            },
+        ),
+    ]
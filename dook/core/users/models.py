@@ -1,20 +1,32 @@
+import json
 import uuid
 from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.core.mail import EmailMessage
 from django.db import models
+from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.crypto import get_random_string
 from django.utils.translation import gettext_lazy as _
 
 from dook.core.users.constants import (
     InvitationStatusType,
     InvitationUserRoleType,
+    QueuedEmailStatus,
     UserRoleType,
     UserSpecializationType,
 )
 from dook.core.users.email_service import send_registration_invitation_email
-from dook.core.users.managers import FactCheckersManager, UserManager, UserNewsManager
+from dook.core.users.managers import (
+    AssignmentNotificationManager,
+    FactCheckersManager,
+    QueuedEmailManager,
+    UserManager,
+    UserNewsManager,
+)
+from dook.core.users.token_cache import invalidate_user_tokens
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -48,6 +60,18 @@ class User(AbstractBaseUser, PermissionsMixin):
     fact_checkers = FactCheckersManager()
 
     REQUIRED_FIELDS = ["name"]
+    # fields deciding what cached users of tokens may access, other fields of
+    # cached users may be stale for AUTH_TOKEN_CACHE_TIMEOUT
+    AUTH_FIELDS = (
+        "password",
+        "is_active",
+        "is_verified",
+        "role",
+        "domain_id",
+        "is_staff",
+        "is_admin",
+        "is_superuser",
+    )
 
     USERNAME_FIELD = "email"
     EMAIL_FIELD = "email"
@@ -55,6 +79,29 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_auth_state = instance.get_auth_state()
+        return instance
+
+    def get_auth_state(self):
+        return tuple(self.__dict__.get(field) for field in self.AUTH_FIELDS)
+
+    def save(self, *args, **kwargs):
+        # authenticated requests use cached users, see CachedTokenAuthentication
+        auth_state = self.get_auth_state()
+        if not self._state.adding and auth_state != getattr(
+            self, "_loaded_auth_state", None
+        ):
+            invalidate_user_tokens(self)
+        super().save(*args, **kwargs)
+        self._loaded_auth_state = auth_state
+
+    def delete(self, *args, **kwargs):
+        invalidate_user_tokens(self)
+        return super().delete(*args, **kwargs)
+
     def has_perm(self, perm, obj=None):
         return self.is_admin
 
@@ -136,3 +183,84 @@ class UserNews(models.Model):
 
     class Meta:
         unique_together = ["news", "user"]
+
+
+class QueuedEmail(models.Model):
+    """
+    E-mail waiting to be rendered and sent by the deliver_emails worker.
+    """
+
+    objects = QueuedEmailManager()
+
+    subject = models.CharField(max_length=255)
+    template = models.CharField(max_length=255)
+    context = models.TextField(default="{}")
+    from_email = models.CharField(max_length=255)
+    to = models.TextField()
+
+    status = models.CharField(
+        max_length=30,
+        choices=QueuedEmailStatus.choices,
+        default=QueuedEmailStatus.QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    provider_status = models.CharField(max_length=100, blank=True)
+    message_id = models.CharField(max_length=255, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, default=None)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "available_at"])]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to} ({self.status})"
+
+    def render(self):
+        message = render_to_string(self.template, json.loads(self.context))
+        return EmailMessage(
+            subject=self.subject,
+            body=message,
+            from_email=self.from_email,
+            to=json.loads(self.to),
+        )
+
+    def mark_sent(self, provider_status="", message_id=""):
+        self.status = QueuedEmailStatus.SENT
+        self.attempts += 1
+        self.sent_at = timezone.now()
+        self.provider_status = provider_status
+        self.message_id = message_id or ""
+        self.last_error = ""
+
+    def mark_failed(self, error, retry=True, provider_status=""):
+        self.attempts += 1
+        self.last_error = error
+        self.provider_status = provider_status
+
+        if not retry or self.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            self.status = QueuedEmailStatus.FAILED
+        else:
+            self.available_at = timezone.now() + self.get_retry_delay()
+
+    def get_retry_delay(self):
+        # exponential backoff: base delay doubled after every failed attempt
+        delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (self.attempts - 1)
+        return timedelta(seconds=min(delay, settings.EMAIL_QUEUE_MAX_RETRY_DELAY))
+
+
+class AssignmentNotification(models.Model):
+    """
+    Fact checker assignment waiting to be listed in the user's next digest.
+    """
+
+    objects = AssignmentNotificationManager()
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    news = models.ForeignKey("news.News", on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ["user", "news"]
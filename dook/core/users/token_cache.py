@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+AUTH_TOKEN_KEY_PREFIX = "auth_token"
+
+
+def get_auth_token_key(key):
+    return f"{AUTH_TOKEN_KEY_PREFIX}:{key}"
+
+
+def is_token_cache_enabled():
+    return bool(settings.AUTH_TOKEN_CACHE_TIMEOUT and settings.CACHE_SHARED)
+
+
+def get_cached_token(key):
+    """ Returns cached (user, token) of the token key or None. """
+    if not is_token_cache_enabled():
+        return None
+    return cache.get(get_auth_token_key(key))
+
+
+def cache_token(user, token):
+    if is_token_cache_enabled():
+        cache.set(
+            get_auth_token_key(token.key),
+            (user, token),
+            timeout=settings.AUTH_TOKEN_CACHE_TIMEOUT,
+        )
+
+
+def invalidate_tokens(keys):
+    """
+    Drops cached users of the token keys. They are dropped again after
+    commit, so a user cached from not yet committed data by a concurrent
+    request is not served afterwards.
+    """
+    cache_keys = [get_auth_token_key(key) for key in keys]
+    if not cache_keys:
+        return
+
+    cache.delete_many(cache_keys)
+    transaction.on_commit(lambda: cache.delete_many(cache_keys))
+
+
+def invalidate_user_tokens(user):
+    from rest_framework.authtoken.models import Token
+
+    if not is_token_cache_enabled():
+        return
+
+    invalidate_tokens(Token.objects.filter(user=user).values_list("key", flat=True))
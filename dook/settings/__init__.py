@@ -52,17 +52,24 @@ INSTALLED_APPS = DJANGO_APPS + LOCAL_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "dook.api.middleware.QueryInstrumentationMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "dook.api.middleware.ReplicaRoutingMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "dook.api.transactions.TransactionPolicyMiddleware",
 ]
 
 ROOT_URLCONF = "dook.api.urls"
 
+# threads running views under ASGI (dook.asgi), each may hold a database connection
+ASGI_THREADS = env("ASGI_THREADS", default=10, cast=int)
+ASGI_READ_ONLY_THREADS = env("ASGI_READ_ONLY_THREADS", default=20, cast=int)
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -86,39 +93,94 @@ TEMPLATES = [
 WSGI_APPLICATION = "dook.wsgi.application"
 
 
+# connections pooled per process and database by the dook.core.database.postgresql
+# backend, closing a connection at the end of a request returns it to the pool;
+# every ASGI thread may hold a connection of each database, so MAX_SIZE below
+# ASGI_THREADS + ASGI_READ_ONLY_THREADS makes threads wait for TIMEOUT and fail
+DATABASE_POOL = {
+    "MAX_SIZE": env(
+        "DATABASE_POOL_MAX_SIZE", default=ASGI_THREADS + ASGI_READ_ONLY_THREADS, cast=int
+    ),
+    # seconds to wait for a free connection when all are in use
+    "TIMEOUT": env("DATABASE_POOL_TIMEOUT", default=10.0, cast=float),
+    # seconds after which connections are closed on check in
+    "MAX_LIFETIME": env("DATABASE_POOL_MAX_LIFETIME", default=1800, cast=int),
+    # run SELECT 1 on checked out connections
+    "HEALTH_CHECK": env("DATABASE_POOL_HEALTH_CHECK", default=True, cast=bool),
+    # seconds between pool stats in the database log
+    "STATS_LOG_INTERVAL": env("DATABASE_POOL_STATS_LOG_INTERVAL", default=300, cast=int),
+}
+
 DATABASES = {
     "default": {
-        "ENGINE": env(
-            "DATABASE_BACKEND", default="django.db.backends.postgresql_psycopg2"
-        ),
+        "ENGINE": env("DATABASE_BACKEND", default="dook.core.database.postgresql"),
         "NAME": env("POSTGRES_DB", default="postgres"),
         "HOST": env("POSTGRES_HOST", default="db"),
         "USER": env("POSTGRES_USER", default="postgres"),
         "PASSWORD": env("POSTGRES_PASSWORD", default="postgres"),
         "ATOMIC_REQUESTS": True,
+        "POOL": DATABASE_POOL,
     },
     "readonly": {
-        "ENGINE": env(
-            "DATABASE_BACKEND", default="django.db.backends.postgresql_psycopg2"
-        ),
+        "ENGINE": env("DATABASE_BACKEND", default="dook.core.database.postgresql"),
         "NAME": env("POSTGRES_DB", default="postgres"),
         "HOST": env("POSTGRES_READONLY_HOST", default="db"),
         "USER": env("POSTGRES_USER", default="postgres"),
         "PASSWORD": env("POSTGRES_PASSWORD", default="postgres"),
+        "POOL": DATABASE_POOL,
         "TEST": {"MIRROR": "default",},
     },
 }
 
+DATABASE_ROUTERS = ["dook.core.routers.ReplicaRouter"]
+
+# list views read from the readonly replica, see ReplicaRoutingMiddleware; off
+# without CACHE_SHARED, as pins of clients would not reach other processes
+REPLICA_READS = env("REPLICA_READS", default=True, cast=bool)
+# seconds a client reads from the primary after its writes
+REPLICA_PIN_SECONDS = env("REPLICA_PIN_SECONDS", default=5, cast=int)
+# seconds of replica lag above which all clients read from the primary
+REPLICA_MAX_LAG = env("REPLICA_MAX_LAG", default=2.0, cast=float)
+REPLICA_LAG_CHECK_INTERVAL = 5  # seconds
+
+# queries of each request and processor run in the database log, see
+# QueryInstrumentationMiddleware
+QUERY_INSTRUMENTATION = env("QUERY_INSTRUMENTATION", default=False, cast=bool)
+QUERY_INSTRUMENTATION_SLOWEST = 3  # slowest statements logged
+
+CACHES = {
+    "default": {
+        "BACKEND": env(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": env("CACHE_LOCATION", default=""),
+    },
+}
+# whether all processes share the cache, token caching and replica reads rely
+# on invalidations and pins reaching every process
+CACHE_SHARED = env(
+    "CACHE_SHARED",
+    default=CACHES["default"]["BACKEND"]
+    not in (
+        "django.core.cache.backends.locmem.LocMemCache",
+        "django.core.cache.backends.dummy.DummyCache",
+    ),
+    cast=bool,
+)
+
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.TokenAuthentication",
+        "dook.api.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "dook.api.paginations.CustomPageNumberPagination",
     "PAGE_SIZE": 20,
 }
 
-ATOMIC_REQUESTS = True
+# views of databases with ATOMIC_REQUESTS run with their transaction policy,
+# see TransactionPolicyMiddleware; the guard makes writes of read only views
+# raise, eg. in tests
+TRANSACTION_POLICY_GUARD = env("TRANSACTION_POLICY_GUARD", default=False, cast=bool)
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "UTC"
@@ -173,6 +235,18 @@ LOGGING = {
             "handlers": ["console"],
             "level": "INFO",
         },
+        "chatbot": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+        "emails": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
+        "database": {
+            "handlers": ["console"],
+            "level": "INFO",
+        },
     }
 }
 # fmt: on
@@ -180,6 +254,13 @@ LOGGING = {
 INVITATION_EXPIRY = 7
 ASSIGNMENT_ACTIVITY_PERIOD_MINUTES = 60  # minutes
 TARGET_ASSIGNMENTS_PER_NEWS_COUNT = 4
+# minutes of collecting fact checker assignments into a single digest e-mail,
+# 0 notifies about every assignment separately
+ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES = env(
+    "ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES", default=0, cast=int
+)
+# seconds the processor daemon waits for news draft notifications before polling
+PROCESSOR_POLL_INTERVAL = env("PROCESSOR_POLL_INTERVAL", default=30, cast=int)
 
 PANEL_DOMAIN_NAME = env("DOMAIN_NAME", default="panel.app.fakehunter.pap.pl")
 
@@ -192,7 +273,52 @@ EVENTS = {
     "news_edit_verdict": [
         "dook.core.integrations.chatbot.events.ChatbotNewsEditVerdictSubscriber",
     ],
+    "news_screenshot_attached": [
+        "dook.core.news.events.ScreenshotDerivativesSubscriber",
+    ],
 }
 
+# subscribers with `outbox = True` are delivered by the deliver_events worker
+EVENTS_OUTBOX = env("EVENTS_OUTBOX", default=True, cast=bool)
+EVENTS_OUTBOX_BATCH_SIZE = 100
+EVENTS_OUTBOX_POLL_INTERVAL = env("EVENTS_OUTBOX_POLL_INTERVAL", default=5, cast=int)
+EVENTS_OUTBOX_MAX_ATTEMPTS = 10
+EVENTS_OUTBOX_RETRY_DELAY = 10  # seconds, doubled after every failed attempt
+EVENTS_OUTBOX_MAX_RETRY_DELAY = 3600  # seconds
+# seconds a batch of events is leased to a worker delivering it, longer than
+# the delivery of a batch takes; events of a stopped worker are redelivered after
+EVENTS_OUTBOX_LEASE = 600
+
+# PostgreSQL text search configuration of news search, eg. "polish" when
+# a Polish dictionary is installed in the database
+NEWS_SEARCH_CONFIG = env("NEWS_SEARCH_CONFIG", default="simple")
+
+# seconds pages of the published feed are cached for, 0 disables caching;
+# caching is off without CACHE_SHARED, as invalidations would not reach other
+# processes
+PUBLISHED_FEED_CACHE_TIMEOUT = env("PUBLISHED_FEED_CACHE_TIMEOUT", default=300, cast=int)
+PUBLISHED_FEED_CACHE_LOCK_TIMEOUT = 30  # seconds
+PUBLISHED_FEED_CACHE_LOCK_WAIT = 5  # seconds
+PUBLISHED_FEED_CACHE_POLL_INTERVAL = 0.05  # seconds
+
+# seconds users of auth tokens are cached for, 0 disables caching; caching is
+# off without CACHE_SHARED, as invalidations would not reach other processes
+AUTH_TOKEN_CACHE_TIMEOUT = env("AUTH_TOKEN_CACHE_TIMEOUT", default=60, cast=int)
+
 CHATBOT_API_URL = env("CHATBOT_API_URL", default="")
 CHATBOT_API_KEY = env("CHATBOT_API_KEY", default="")
+CHATBOT_API_CONNECT_TIMEOUT = env("CHATBOT_API_CONNECT_TIMEOUT", default=2.0, cast=float)
+CHATBOT_API_READ_TIMEOUT = env("CHATBOT_API_READ_TIMEOUT", default=5.0, cast=float)
+CHATBOT_API_POOL_SIZE = 10
+# POST verdict events delivered together in one request to the batch endpoint
+CHATBOT_API_BATCH = env("CHATBOT_API_BATCH", default=False, cast=bool)
+CHATBOT_API_BATCH_PATH = "/news/batch"
+CHATBOT_API_CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failed requests
+CHATBOT_API_CIRCUIT_RESET_TIMEOUT = 30  # seconds
+# resync_chatbot command progress, to resume an interrupted resync
+CHATBOT_RESYNC_CHECKPOINT = env(
+    "CHATBOT_RESYNC_CHECKPOINT", default="chatbot_resync_checkpoint.json"
+)
+CHATBOT_RESYNC_CHUNK_SIZE = 500
+CHATBOT_RESYNC_BATCH_SIZE = 50
+CHATBOT_RESYNC_CONCURRENCY = 4  # requests in flight
@@ -13,3 +13,14 @@ ANYMAIL = {
         "config": {"connect_timeout": 30, "read_timeout": 30,},
     },
 }
+
+# e-mails are queued in the database and sent by the deliver_emails worker
+EMAIL_QUEUE = env("EMAIL_QUEUE", default=True, cast=bool)
+EMAIL_QUEUE_BATCH_SIZE = 50
+EMAIL_QUEUE_POLL_INTERVAL = env("EMAIL_QUEUE_POLL_INTERVAL", default=5, cast=int)
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_RETRY_DELAY = 60  # seconds, doubled after every failed attempt
+EMAIL_QUEUE_MAX_RETRY_DELAY = 3600  # seconds
+# seconds a batch of e-mails is leased to a worker sending it, longer than
+# sending a batch takes; e-mails of a stopped worker are sent again after
+EMAIL_QUEUE_LEASE = 600
@@ -2,3 +2,22 @@ from envparse import env
 
 REGION_NAME = env("REGION_NAME", default="")
 BUCKET_NAME = env("BUCKET_NAME", default="")
+# S3 compatible endpoint, eg. a local stand-in in development, None for AWS
+AWS_S3_ENDPOINT_URL = env("AWS_S3_ENDPOINT_URL", default="") or None
+AWS_S3_MAX_POOL_CONNECTIONS = env("AWS_S3_MAX_POOL_CONNECTIONS", default=10, cast=int)
+AWS_S3_CONNECT_TIMEOUT = 5  # seconds
+AWS_S3_READ_TIMEOUT = 30  # seconds
+AWS_S3_MAX_RETRIES = 3
+# larger files are uploaded in streamed parts instead of a single PUT
+AWS_S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024  # bytes
+AWS_S3_MULTIPART_CHUNKSIZE = 8 * 1024 * 1024  # bytes
+AWS_S3_MAX_CONCURRENCY = 4  # parts uploaded concurrently
+
+# derivatives generated for news screenshots, see dook.core.news.screenshots
+SCREENSHOT_THUMBNAIL_SIZE = (480, 480)  # bounding box in pixels
+SCREENSHOT_JPEG_QUALITY = 80
+SCREENSHOT_WEBP_QUALITY = 80
+
+# screenshots uploaded by clients straight to the bucket with a presigned POST
+SCREENSHOT_UPLOAD_MAX_SIZE = 20 * 1024 * 1024  # bytes
+SCREENSHOT_UPLOAD_EXPIRES_IN = 600  # seconds
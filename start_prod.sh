@@ -1,4 +1,8 @@
 #!/bin/sh
 python manage.py migrate
-uwsgi --http 0.0.0.0:8000 --wsgi-file dook/wsgi.py
+if [ "$SERVER_INTERFACE" = "asgi" ]; then
+    uvicorn dook.asgi:application --host 0.0.0.0 --port 8000
+else
+    uwsgi --http 0.0.0.0:8000 --wsgi-file dook/wsgi.py
+fi
 exec "$@"
@@ -58,3 +58,89 @@ def no_chat_bot_api_client_send(monkeypatch):
     monkeypatch.setattr(
         "dook.core.integrations.chatbot.client.ApiClient._send", mocked_send
     )
+
+
+@pytest.fixture(autouse=True)
+def no_replica_reads(settings):
+    # the replica mirrors default in tests over another connection, which does
+    # not see data of not committed test transactions
+    settings.REPLICA_READS = False
+
+
+@pytest.fixture(autouse=True)
+def transaction_policy_guard(settings):
+    settings.TRANSACTION_POLICY_GUARD = True
+
+
+@pytest.fixture(autouse=True)
+def query_budgets(monkeypatch):
+    """Checks queries of requests of test clients against QUERY_BUDGETS."""
+    from django.apps import apps
+    from django.contrib.contenttypes.models import ContentType
+    from django.test import Client
+    from django.urls import Resolver404, resolve
+
+    from dook.core.database.instrumentation import record_queries
+    from tests.query_budgets import (
+        BudgetQueryRecorder,
+        check_query_budget,
+        get_endpoint,
+    )
+
+    request = Client.request
+
+    def budgeted_request(self, **kwargs):
+        # content types are cached per process, so budgets count warm processes
+        ContentType.objects.get_for_models(*apps.get_models())
+        with record_queries(BudgetQueryRecorder(slowest_count=5)) as recorder:
+            response = request(self, **kwargs)
+
+        try:
+            match = resolve(kwargs["PATH_INFO"])
+        except Resolver404:
+            return response
+        if match.view_name:
+            endpoint = get_endpoint(match.view_name, match.func, kwargs["REQUEST_METHOD"])
+            check_query_budget(endpoint, recorder)
+        return response
+
+    monkeypatch.setattr(Client, "request", budgeted_request)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture()
+def deliver_outbox_events(db):
+    """Delivers all due outbox events, like the deliver_events worker."""
+    from dook.core.events.outbox import OutboxDelivery
+
+    return OutboxDelivery().deliver_all
+
+
+@pytest.fixture()
+def stub_s3(settings):
+    """A local S3 stand-in the shared S3 client is pointed at."""
+    from dook.core.integrations.storage.client import reset_boto3_client
+    from tests.stub_s3 import start_stub_s3
+
+    server = start_stub_s3()
+
+    settings.AWS_S3_ENDPOINT_URL = f"http://127.0.0.1:{server.server_port}"
+    settings.AWS_ACCESS_KEY_ID = "key"
+    settings.AWS_SECRET_ACCESS_KEY = "secret"
+    settings.REGION_NAME = "eu-central-1"
+    settings.BUCKET_NAME = "screenshots"
+    reset_boto3_client()
+
+    yield server
+
+    reset_boto3_client()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,148 @@
+"""
+Query budgets of API endpoints, ie. the most queries a request to an endpoint
+may run in tests. Every request of the API test client is checked against the
+budget of its endpoint, keyed by view name and viewset action or method.
+
+Running tests with QUERY_BUDGETS_RECORD=<path> records the most queries seen
+per endpoint to the JSON file, instead of checking budgets.
+"""
+import json
+import os
+import re
+
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from dook.core.database.instrumentation import QueryRecorder
+
+QUERY_BUDGETS = {
+    ("auth:internal_password_reset", "post"): 2,
+    ("auth:login", "post"): 5,
+    ("auth:logout", "post"): 2,
+    ("auth:password_reset", "get"): 1,
+    ("auth:password_reset", "post"): 4,
+    ("auth:password_reset_request", "post"): 2,
+    ("auth:send_invite", "post"): 5,
+    ("auth:sign_up", "get"): 2,
+    ("auth:sign_up", "post"): 5,
+    ("news:crew:expert-news", "list"): 14,
+    ("news:crew:expert-news", "retrieve"): 6,
+    ("news:crew:expert-news-assign-tags", "patch"): 13,
+    ("news:crew:expert-news-create-opinion", "post"): 9,
+    ("news:crew:expert-news-dismiss-assignment", "patch"): 4,
+    ("news:crew:fact-checker-news", "list"): 9,
+    ("news:crew:fact-checker-news", "retrieve"): 5,
+    ("news:crew:fact-checker-news-create-opinion", "post"): 11,
+    ("news:keywords:domains", "create"): 2,
+    ("news:keywords:domains", "destroy"): 8,
+    ("news:keywords:domains", "list"): 2,
+    ("news:keywords:domains", "partial_update"): 3,
+    ("news:keywords:domains", "retrieve"): 1,
+    ("news:keywords:sensitive-keywords", "create"): 2,
+    ("news:keywords:sensitive-keywords", "destroy"): 3,
+    ("news:keywords:sensitive-keywords", "list"): 2,
+    ("news:keywords:sensitive-keywords", "partial_update"): 3,
+    ("news:keywords:sensitive-keywords", "retrieve"): 1,
+    ("news:keywords:tags", "create"): 3,
+    ("news:keywords:tags", "destroy"): 3,
+    ("news:keywords:tags", "list"): 3,
+    ("news:keywords:tags", "partial_update"): 3,
+    ("news:keywords:tags", "retrieve"): 1,
+    ("news:management:expert-opinion-detail", "put"): 9,
+    ("news:management:fact-checker-opinion-detail", "put"): 9,
+    ("news:management:news", "list"): 9,
+    ("news:management:news", "partial_update"): 21,
+    ("news:management:news", "retrieve"): 6,
+    ("news:management:news-assign", "patch"): 7,
+    ("news:management:news-dismiss-assignment", "delete"): 4,
+    ("news:management:news-image", "patch"): 3,
+    ("news:management:news-image", "put"): 3,  # updates like patch
+    ("news:management:news-image-upload", "post"): 1,
+    ("news:management:news-image-upload-confirm", "post"): 3,
+    ("news:published:news", "list"): 7,
+    ("news:published:news", "retrieve"): 5,
+    ("news:verified:news", "list"): 5,
+    ("news:verified:news", "retrieve"): 3,
+    ("users:allow-subscriptions", "patch"): 2,
+    ("users:current-user", "get"): 1,
+    ("users:expert-list", "get"): 2,
+    ("users:fact-checker-list", "get"): 2,
+    ("users:invitation-list", "get"): 2,
+    ("users:moderator-list", "get"): 2,
+    ("users:specialist-list", "get"): 4,
+    ("users:user-detail", "get"): 1,
+    ("users:user-detail", "patch"): 7,
+    ("users:user-detail", "put"): 7,  # updates like patch
+}
+
+# run by the test transaction around views, not by the views
+NOT_COUNTED_STATEMENT = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO)\b")
+RECORD_PATH = os.environ.get("QUERY_BUDGETS_RECORD")
+
+
+class BudgetQueryRecorder(QueryRecorder):
+    def record(self, sql, duration, origin):
+        if not NOT_COUNTED_STATEMENT.match(sql):
+            super().record(sql, duration, origin)
+
+
+def get_endpoint(view_name, view_func, method):
+    actions = getattr(view_func, "actions", None)
+    if actions is not None:
+        return view_name, actions.get(method.lower(), method.lower())
+    return view_name, method.lower()
+
+
+def get_view_endpoints(view_name, view_func):
+    actions = getattr(view_func, "actions", None)
+    if actions is not None:
+        return {(view_name, action) for action in actions.values()}
+
+    view = getattr(view_func, "cls", None)
+    if view is None:
+        return set()
+    return {
+        (view_name, method)
+        for method in view.http_method_names
+        if method not in ("head", "options") and hasattr(view, method)
+    }
+
+
+def get_api_endpoints(resolver=None, namespace=""):
+    endpoints = set()
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            endpoints |= get_api_endpoints(
+                pattern,
+                f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace,
+            )
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            endpoints |= get_view_endpoints(
+                f"{namespace}{pattern.name}", pattern.callback
+            )
+    return endpoints
+
+
+def check_query_budget(endpoint, recorder):
+    if RECORD_PATH:
+        record_query_count(endpoint, recorder.count)
+        return
+
+    assert endpoint in QUERY_BUDGETS, f"No query budget of {endpoint}"
+    budget = QUERY_BUDGETS[endpoint]
+    assert recorder.count <= budget, (
+        f"{endpoint} ran {recorder.count} queries over its budget of {budget}: "
+        f"{recorder.summary()}"
+    )
+
+
+def record_query_count(endpoint, count):
+    try:
+        with open(RECORD_PATH) as recorded_file:
+            recorded = json.load(recorded_file)
+    except FileNotFoundError:
+        recorded = {}
+
+    key = " ".join(endpoint)
+    recorded[key] = max(recorded.get(key, 0), count)
+    with open(RECORD_PATH, "w") as recorded_file:
+        json.dump(recorded, recorded_file, indent=2, sort_keys=True)
@@ -0,0 +1,134 @@
+import threading
+import uuid
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class StubS3Handler(BaseHTTPRequestHandler):
+    """
+    Serves the subset of the S3 API used by upload_fileobj and
+    download_fileobj, with path style addressing: single PUT and multipart
+    uploads, HEAD and GET of stored objects. Browser form uploads made with
+    a presigned POST are stored without checking the policy.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self):
+        stored = self.get_stored()
+        if stored is not None:
+            self.respond(headers=self.object_headers(stored), length=len(stored["body"]))
+
+    def do_GET(self):
+        stored = self.get_stored()
+        if stored is not None:
+            self.respond(stored["body"], headers=self.object_headers(stored))
+
+    def do_PUT(self):
+        path, query = self.parse_path()
+        body = self.read_body()
+        if "partNumber" in query:
+            upload = self.server.uploads[query["uploadId"]]
+            upload["parts"][int(query["partNumber"])] = body
+        else:
+            self.server.objects[path] = {
+                "body": body,
+                "content_type": self.headers["Content-Type"],
+                "acl": self.headers["x-amz-acl"],
+            }
+        self.respond(headers={"ETag": '"etag"'})
+
+    def do_POST(self):
+        path, query = self.parse_path()
+        body = self.read_body()
+        if not query:
+            self.store_form_upload(path, body)
+            self.respond(status=204)
+        elif "uploads" in query:
+            upload_id = uuid.uuid4().hex
+            self.server.uploads[upload_id] = {
+                "parts": {},
+                "content_type": self.headers["Content-Type"],
+                "acl": self.headers["x-amz-acl"],
+            }
+            self.respond(
+                "<InitiateMultipartUploadResult>"
+                f"<UploadId>{upload_id}</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            )
+        else:
+            upload = self.server.uploads.pop(query["uploadId"])
+            parts = upload.pop("parts")
+            self.server.objects[path] = {
+                "body": b"".join(parts[number] for number in sorted(parts)),
+                "parts_count": len(parts),
+                **upload,
+            }
+            self.respond(
+                "<CompleteMultipartUploadResult><ETag>etag</ETag>"
+                "</CompleteMultipartUploadResult>"
+            )
+
+    def store_form_upload(self, path, body):
+        form = BytesParser().parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        fields = {
+            part.get_param("name", header="content-disposition"): part.get_payload(
+                decode=True
+            )
+            for part in form.get_payload()
+        }
+        self.server.objects[f"{path}/{fields['key'].decode()}"] = {
+            "body": fields["file"],
+            "content_type": fields["Content-Type"].decode(),
+            "acl": fields["acl"].decode(),
+            "fields": fields,
+        }
+
+    def get_stored(self):
+        path, _ = self.parse_path()
+        stored = self.server.objects.get(path)
+        if stored is None:
+            self.respond(b"<Error><Code>NoSuchKey</Code></Error>", status=404)
+        return stored
+
+    def object_headers(self, stored):
+        return {"Content-Type": stored["content_type"], "ETag": '"etag"'}
+
+    def parse_path(self):
+        url = urlsplit(self.path)
+        query = {
+            key: values[0]
+            for key, values in parse_qs(url.query, keep_blank_values=True).items()
+        }
+        return url.path, query
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def respond(self, body=b"", headers=None, status=200, length=None):
+        if isinstance(body, str):
+            body = body.encode()
+        self.send_response(status)
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(len(body) if length is None else length))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_s3():
+    """
+    Starts a local S3 stand-in, objects are kept in server.objects by path.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubS3Handler)
+    server.objects = {}
+    server.uploads = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
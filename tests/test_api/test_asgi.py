@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+
+from dook.api.asgi import PooledASGIHandler, is_public_read_only
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("get", "/news/published/news", True),
+        ("head", "/news/keywords/tags", True),
+        ("get", "/news/keywords/domains", True),
+        ("post", "/news/published/news", False),
+        ("get", "/users/current-user", False),
+        ("get", "/not-found", False),
+    ],
+)
+def test_is_public_read_only(api_rf, method, path, expected):
+    request = getattr(api_rf, method)(path)
+
+    assert is_public_read_only(request) is expected
+
+
+def send_request(handler, path):
+    async def request():
+        communicator = ApplicationCommunicator(
+            handler,
+            {
+                "type": "http",
+                "method": "GET",
+                "path": path,
+                "query_string": b"",
+                "headers": [],
+            },
+        )
+        await communicator.send_input({"type": "http.request"})
+        start = await communicator.receive_output(timeout=5)
+        body = await communicator.receive_output(timeout=5)
+        return start, body
+
+    return async_to_sync(request)()
+
+
+@pytest.mark.parametrize(
+    "path, expected_status, expected_thread",
+    [
+        ("/news/keywords/tags", 200, "asgi-read-only_"),
+        ("/users/current-user", 401, "asgi_"),
+    ],
+)
+def test_pooled_handler_runs_views_in_pools(
+    transactional_db, path, expected_status, expected_thread
+):
+    handler = PooledASGIHandler()
+    thread_names = []
+    get_response_in_thread = handler.get_response_in_thread
+
+    def record_thread(request):
+        thread_names.append(threading.current_thread().name)
+        return get_response_in_thread(request)
+
+    handler.get_response_in_thread = record_thread
+
+    start, _ = send_request(handler, path)
+
+    assert start["type"] == "http.response.start"
+    assert start["status"] == expected_status
+    assert thread_names[0].startswith(expected_thread)
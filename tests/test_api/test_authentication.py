@@ -0,0 +1,130 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from dook.core.users.constants import UserRoleType
+from tests.factories.users import UserFactory
+
+
+@pytest.mark.django_db
+class TestCachedTokenAuthentication:
+    url = reverse("users:current-user")
+
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, settings):
+        settings.CACHE_SHARED = True
+
+    @pytest.fixture
+    def user(self):
+        return UserFactory(role=UserRoleType.EXPERT)
+
+    @pytest.fixture
+    def token_client(self, user):
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return client
+
+    def test_cached_user_does_not_query(self, token_client):
+        token_client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = token_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        # only savepoints of the atomic request are left
+        assert all("SAVEPOINT" in query["sql"] for query in context.captured_queries)
+        assert response.data["role"] == UserRoleType.EXPERT
+
+    def test_not_cached_without_shared_cache(self, settings, token_client):
+        settings.CACHE_SHARED = False
+        token_client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = token_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert any(
+            "authtoken_token" in query["sql"] for query in context.captured_queries
+        )
+
+    def test_logout_invalidates_token(self, token_client):
+        token_client.get(self.url)
+
+        response = token_client.post(reverse("auth:logout"))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = token_client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_login_rotation_invalidates_previous_token(self, user, token_client):
+        user.set_password("password")
+        user.save()
+        token_client.get(self.url)
+
+        response = APIClient().post(
+            reverse("auth:login"), {"email": user.email, "password": "password"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = token_client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deactivation_invalidates_user(self, user, token_client, admin_api_client):
+        token_client.get(self.url)
+
+        response = admin_api_client.patch(
+            reverse("users:user-detail", args=[user.pk]), {"is_active": False}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = token_client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_role_change_invalidates_user(self, user, token_client, admin_api_client):
+        token_client.get(self.url)
+
+        response = admin_api_client.patch(
+            reverse("users:user-detail", args=[user.pk]),
+            {"role": UserRoleType.MODERATOR},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = token_client.get(self.url)
+        assert response.data["role"] == UserRoleType.MODERATOR
+
+    def test_deleted_user_is_invalidated(self, user, token_client):
+        token_client.get(self.url)
+
+        user.delete()
+
+        response = token_client.get(self.url)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_save_without_auth_changes_keeps_cached_user(self, user, token_client):
+        token_client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            user.name = "Renamed"
+            user.save()
+
+        assert not any(
+            "authtoken_token" in query["sql"] for query in context.captured_queries
+        )
+        response = token_client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_save_without_shared_cache_does_not_query_tokens(self, settings, user):
+        settings.CACHE_SHARED = False
+
+        with CaptureQueriesContext(connection) as context:
+            user.is_active = False
+            user.save()
+
+        assert not any(
+            "authtoken_token" in query["sql"] for query in context.captured_queries
+        )
@@ -0,0 +1,150 @@
+import logging
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from dook.core.news.models import Tag
+from dook.core.routers import (
+    ReplicaLagGuard,
+    ReplicaRouter,
+    is_reading_from_replica,
+    replica_lag_guard,
+    replica_reads,
+)
+from dook.core.users.constants import UserRoleType
+from tests.factories.news import TagFactory
+from tests.factories.users import UserFactory
+
+
+def queried_table(context, table):
+    return any(table in query["sql"] for query in context.captured_queries)
+
+
+@pytest.fixture
+def replica_reads_enabled(settings, transactional_db, monkeypatch):
+    settings.REPLICA_READS = True
+    settings.CACHE_SHARED = True
+    monkeypatch.setattr(replica_lag_guard, "checked_at", None)
+
+
+class TestReplicaRoutingMiddleware:
+    list_url = reverse("news:keywords:tags")
+
+    def get_tag_databases(self, client, url):
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["readonly"]) as replica:
+                response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        databases = {"default": primary, "readonly": replica}
+        return {
+            alias
+            for alias, context in databases.items()
+            if queried_table(context, "news_tag")
+        }
+
+    def test_list_reads_from_replica(self, replica_reads_enabled, api_client):
+        TagFactory()
+
+        assert self.get_tag_databases(api_client, self.list_url) == {"readonly"}
+
+    def test_detail_reads_from_primary(self, replica_reads_enabled, api_client):
+        tag = TagFactory()
+        api_client.force_authenticate(user=UserFactory(role=UserRoleType.ADMIN))
+
+        url = reverse("news:keywords:tags", args=[tag.pk])
+        assert self.get_tag_databases(api_client, url) == {"default"}
+
+    def test_client_reads_from_primary_after_write(
+        self, replica_reads_enabled, api_client
+    ):
+        api_client.force_authenticate(user=UserFactory(role=UserRoleType.ADMIN))
+
+        response = api_client.post(self.list_url, data={"name": "tag"})
+        assert response.status_code == status.HTTP_201_CREATED
+
+        assert self.get_tag_databases(api_client, self.list_url) == {"default"}
+
+    def test_anonymous_client_reads_from_primary_after_write(
+        self, replica_reads_enabled, api_client
+    ):
+        # the write fails, but the client may have written before failing
+        api_client.post(reverse("auth:login"), data={})
+
+        assert self.get_tag_databases(api_client, self.list_url) == {"default"}
+        assert self.get_tag_databases(APIClient(), self.list_url) == {"readonly"}
+
+    def test_lagging_replica_falls_back_to_primary(
+        self, replica_reads_enabled, api_client, monkeypatch
+    ):
+        monkeypatch.setattr(ReplicaLagGuard, "get_lag", lambda self: 10.0)
+
+        assert self.get_tag_databases(api_client, self.list_url) == {"default"}
+
+    def test_disabled(self, replica_reads_enabled, settings, api_client):
+        settings.REPLICA_READS = False
+
+        assert self.get_tag_databases(api_client, self.list_url) == {"default"}
+
+    def test_disabled_without_shared_cache(
+        self, replica_reads_enabled, settings, api_client
+    ):
+        settings.CACHE_SHARED = False
+
+        assert self.get_tag_databases(api_client, self.list_url) == {"default"}
+
+
+class TestReplicaRouter:
+    def test_write_pins_block_to_primary(self, db):
+        with replica_reads():
+            assert Tag.objects.all().db == "readonly"
+
+            Tag.objects.all().update(name="tag")
+
+            assert Tag.objects.all().db == "default"
+
+        assert Tag.objects.all().db == "default"
+
+    def test_routing_write_does_not_change_reads(self):
+        with replica_reads():
+            assert ReplicaRouter().db_for_write(Tag) == "default"
+
+            assert is_reading_from_replica() is True
+
+
+class TestReplicaLagGuard:
+    def test_lag_is_checked_once_per_interval(self, settings, monkeypatch):
+        settings.REPLICA_MAX_LAG = 2.0
+        settings.REPLICA_LAG_CHECK_INTERVAL = 60
+        lags = [10.0, 0.0]
+        monkeypatch.setattr(ReplicaLagGuard, "get_lag", lambda self: lags.pop(0))
+        guard = ReplicaLagGuard()
+
+        assert guard.is_available() is False
+        assert guard.is_available() is False
+        assert lags == [0.0]
+
+
+class TestQueryInstrumentationMiddleware:
+    def test_logs_queries_of_view(self, db, settings, api_client, caplog):
+        settings.QUERY_INSTRUMENTATION = True
+
+        with caplog.at_level(logging.INFO, logger="database"):
+            response = api_client.get(reverse("news:keywords:tags"))
+
+        assert response.status_code == status.HTTP_200_OK
+        message = caplog.messages[-1]
+        assert message.startswith("GET news:keywords:tags 200: ")
+        assert 'FROM "news_tag"' in message
+
+    def test_disabled(self, db, settings, api_client, caplog):
+        settings.QUERY_INSTRUMENTATION = False
+
+        with caplog.at_level(logging.INFO, logger="database"):
+            api_client.get(reverse("news:keywords:tags"))
+
+        assert caplog.messages == []
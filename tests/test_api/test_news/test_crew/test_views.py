@@ -372,6 +372,7 @@ class TestExpertNewsCreateOpinionView:
         self,
         api_client,
         test_opinion_payload,
+        deliver_outbox_events,
         opinion_type,
         missing_field,
         expected_status,
@@ -394,6 +395,7 @@ class TestExpertNewsCreateOpinionView:
                 )
 
                 response = api_client.post(url, data=payload)
+                deliver_outbox_events()
 
                 assert response.status_code == expected_status
                 response_data = response.json()
@@ -549,6 +551,31 @@ class TestFactCheckerNewsViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 2
 
+    def test_list_cursor_pagination(self, api_client):
+        user = UserFactory(role=UserRoleType.FACT_CHECKER)
+        assignments = [
+            UserNewsFactory(user=user, news=news) for news in NewsFactory.create_batch(3)
+        ]
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(
+            self.list_url, data={"pagination": "cursor", "page_size": 2}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert len(first_page["results"]) == 2
+
+        response = api_client.get(
+            self.list_url, data={"cursor": first_page["next"], "page_size": 2}
+        )
+
+        second_page = response.json()
+        assert second_page["next"] is None
+        assert [
+            item["id"] for item in first_page["results"] + second_page["results"]
+        ] == [str(assignment.news.id) for assignment in reversed(assignments)]
+
     def test_list_filter_by_tags(self, api_client):
         user = UserFactory(role=UserRoleType.FACT_CHECKER)
         api_client.force_authenticate(user=user)
@@ -707,7 +734,7 @@ class TestFactCheckerNewsCreateOpinionView:
                         assert response_data["is_duplicate"] is False
                         assert response_data["duplicate_reference"] is None
 
-    def test_notification(self, api_client, default_opinion_data):
+    def test_notification(self, api_client, default_opinion_data, deliver_outbox_events):
         with mock.patch.multiple(
             "dook.core.users.events", send_news_verified_notification=mock.DEFAULT
         ) as mocked:
@@ -725,11 +752,13 @@ class TestFactCheckerNewsCreateOpinionView:
 
                 api_client.force_authenticate(user=user_1)
                 api_client.post(url, default_opinion_data, format="json")
+                deliver_outbox_events()
 
                 assert mocked["send_news_verified_notification"].called is False
 
                 api_client.force_authenticate(user=user_2)
                 response = api_client.post(url, default_opinion_data, format="json")
+                deliver_outbox_events()
 
                 assert response.status_code == 201
 
@@ -0,0 +1,35 @@
+from unittest import mock
+
+from assertpy import assert_that
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from dook.api.news.filters import NewsSearchFilter
+from dook.core.news.models import News
+
+
+class TestNewsSearchFilter:
+    def filter_queryset(self, query_params):
+        request = Request(APIRequestFactory().get("/", data=query_params))
+        queryset = News.objects.order_by("-reported_at")
+
+        with mock.patch(
+            "dook.api.news.filters.is_search_vector_supported", return_value=True
+        ):
+            return NewsSearchFilter().filter_queryset(request, queryset, view=None)
+
+    def test_ranks_results(self):
+        queryset = self.filter_queryset({"search": "fake news"})
+
+        assert_that(queryset.query.annotations).contains_key("search_rank")
+        assert_that(queryset.query.order_by).is_equal_to(("-search_rank", "-reported_at"))
+
+    def test_keeps_requested_ordering(self):
+        queryset = self.filter_queryset({"search": "fake", "ordering": "reported_at"})
+
+        assert_that(queryset.query.order_by).is_equal_to(("-reported_at",))
+
+    def test_no_search_terms(self):
+        queryset = self.filter_queryset({})
+
+        assert_that(queryset.query.annotations).does_not_contain_key("search_rank")
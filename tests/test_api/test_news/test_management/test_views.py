@@ -1,11 +1,14 @@
+import io
 import tempfile
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest import mock
 from uuid import uuid4
 
 import pytest
+import requests
 from assertpy import assert_that
 from django.urls import reverse
+from django.utils import timezone
 from PIL import Image
 from rest_framework import status
 
@@ -16,9 +19,14 @@ from dook.api.news.exceptions import (
 )
 from dook.api.news.management.exceptions import (
     AssigningNewsToInactiveUserException,
+    InvalidScreenshotUploadException,
     NewsAlreadyAssignedException,
     NewsAlreadyAssignedToRequestedUserException,
+    ScreenshotUploadNotFoundException,
 )
+from dook.api.news.management.serializers import NewsSerializer
+from dook.core.events.models import OutboxEvent
+from dook.core.integrations.storage.client import S3ApiClient
 from dook.core.news.constants import NewsOrigin, VerdictType
 from dook.core.news.models import News, NewsTag, Tag
 from dook.core.users.constants import UserRoleType
@@ -89,6 +97,16 @@ class TestNewsViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data["results"]) == 2
 
+    def test_serializer_falls_back_to_stored_verdict(self):
+        news = NewsFactory()
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_FALSE)
+
+        current_verdict = NewsSerializer().get_current_verdict(
+            News.objects.get(pk=news.pk)
+        )
+
+        assert current_verdict == VerdictType.VERIFIED_FALSE
+
     def test_list_with_domains(self, admin_api_client):
         news = NewsFactory()
         domains = DomainFactory.create_batch(2)
@@ -110,6 +128,56 @@ class TestNewsViewSet:
         assert len(response_data["results"]) == 1
         assert response_data["results"][0]["id"] == str(not_pinned.id)
 
+    def test_list_cursor_pagination(self, admin_api_client):
+        reported_at = datetime(2020, 6, 1, tzinfo=timezone.utc)
+        older = NewsFactory(reported_at=reported_at - timedelta(days=1))
+        same_time = NewsFactory.create_batch(3, reported_at=reported_at)
+        expected_ids = [
+            *sorted((str(news.id) for news in same_time), reverse=True),
+            str(older.id),
+        ]
+
+        response = admin_api_client.get(
+            self.list_url, data={"pagination": "cursor", "page_size": 2}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert "total" not in first_page
+        assert first_page["previous"] is None
+        assert [item["id"] for item in first_page["results"]] == expected_ids[:2]
+
+        response = admin_api_client.get(
+            self.list_url, data={"cursor": first_page["next"], "page_size": 2}
+        )
+
+        second_page = response.json()
+        assert second_page["next"] is None
+        assert [item["id"] for item in second_page["results"]] == expected_ids[2:]
+
+        response = admin_api_client.get(
+            self.list_url, data={"cursor": second_page["previous"], "page_size": 2}
+        )
+
+        assert response.json()["next"] == first_page["next"]
+        assert [item["id"] for item in response.json()["results"]] == expected_ids[:2]
+
+    def test_list_invalid_cursor(self, admin_api_client):
+        response = admin_api_client.get(self.list_url, data={"cursor": "invalid"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_search(self, admin_api_client):
+        news = NewsFactory(text="Vaccines contain microchips")
+        NewsFactory(text="Unrelated news")
+
+        response = admin_api_client.get(self.list_url, data={"search": "microchips"})
+
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()["results"]
+        assert len(response_data) == 1
+        assert response_data[0]["id"] == str(news.id)
+
     def test_list_filter_by_tags(self, admin_api_client):
         tag_1, tag_2 = TagFactory.create_batch(2)
         news_1, news_2, news_3, news_4 = NewsFactory.create_batch(4)
@@ -547,6 +615,92 @@ class TestNewsImageView:
             assert_that(news.screenshot_url).is_equal_to(image_url)
 
 
+@pytest.mark.django_db
+class TestNewsImageUploadView:
+    @pytest.fixture
+    def image_content(self):
+        image_file = io.BytesIO()
+        Image.new("RGB", (100, 100)).save(image_file, format="PNG")
+        return image_file.getvalue()
+
+    def request_upload(self, api_client, news):
+        url = reverse("news:management:news-image-upload", kwargs={"pk": news.id})
+        return api_client.post(url)
+
+    def confirm_upload(self, api_client, news, object_name):
+        url = reverse("news:management:news-image-upload-confirm", kwargs={"pk": news.id})
+        return api_client.post(url, {"object_name": object_name}, format="json")
+
+    def test_direct_upload(self, stub_s3, admin_api_client, image_content):
+        news = NewsFactory()
+
+        response = self.request_upload(admin_api_client, news)
+
+        assert_that(response.status_code).is_equal_to(status.HTTP_201_CREATED)
+        upload = response.data
+        assert_that(upload["object_name"]).starts_with(f"image_{news.id}_")
+        assert_that(upload["fields"]).contains_key("policy", "acl")
+
+        requests.post(
+            upload["url"],
+            data={**upload["fields"], "Content-Type": "image/png"},
+            files={"file": image_content},
+        ).raise_for_status()
+        response = self.confirm_upload(admin_api_client, news, upload["object_name"])
+
+        assert_that(response.status_code).is_equal_to(status.HTTP_204_NO_CONTENT)
+        news.refresh_from_db()
+        assert_that(news.screenshot_url).is_equal_to(
+            S3ApiClient().get_object_url(upload["object_name"])
+        )
+        assert_that(
+            OutboxEvent.objects.filter(event_name="news_screenshot_attached").exists()
+        ).is_true()
+
+    def test_confirm_missing_upload(self, stub_s3, admin_api_client):
+        news = NewsFactory()
+        object_name = self.request_upload(admin_api_client, news).data["object_name"]
+
+        response = self.confirm_upload(admin_api_client, news, object_name)
+
+        assert_that(response.status_code).is_equal_to(status.HTTP_400_BAD_REQUEST)
+        assert_that(response.data["detail"]).is_equal_to(
+            ScreenshotUploadNotFoundException.default_detail
+        )
+
+    def test_confirm_upload_of_other_news(self, stub_s3, admin_api_client, image_content):
+        news, other_news = NewsFactory.create_batch(2)
+        object_name = self.request_upload(admin_api_client, other_news).data[
+            "object_name"
+        ]
+        S3ApiClient().upload_file(io.BytesIO(image_content), object_name, "image/png")
+
+        response = self.confirm_upload(admin_api_client, news, object_name)
+
+        assert_that(response.status_code).is_equal_to(status.HTTP_400_BAD_REQUEST)
+        assert_that(response.data["detail"]).is_equal_to(
+            InvalidScreenshotUploadException.default_detail
+        )
+
+    def test_confirm_upload_which_is_not_image(self, stub_s3, admin_api_client):
+        news = NewsFactory()
+        object_name = self.request_upload(admin_api_client, news).data["object_name"]
+        S3ApiClient().upload_file(io.BytesIO(b"text"), object_name, "text/plain")
+
+        response = self.confirm_upload(admin_api_client, news, object_name)
+
+        assert_that(response.status_code).is_equal_to(status.HTTP_400_BAD_REQUEST)
+        news.refresh_from_db()
+        assert_that(news.screenshot_url).does_not_contain(object_name)
+
+    def test_upload_requires_moderator(self, api_client):
+        api_client.force_authenticate(user=UserFactory(role=UserRoleType.FACT_CHECKER))
+
+        response = self.request_upload(api_client, NewsFactory())
+
+        assert_that(response.status_code).is_equal_to(status.HTTP_403_FORBIDDEN)
+
+
 @pytest.mark.django_db
 class TestNewsAssignView:
     @pytest.mark.parametrize(
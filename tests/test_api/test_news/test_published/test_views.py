@@ -5,6 +5,7 @@ from django.urls import reverse
 from rest_framework import status
 
 from dook.core.news.constants import VerdictType
+from dook.core.news.models import News
 from tests.factories.news import (
     DomainFactory,
     ExpertOpinionFactory,
@@ -247,3 +248,107 @@ class TestNewsPublishedViewSet:
         )
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_list_cached(self, api_client, settings):
+        settings.CACHE_SHARED = True
+        news = NewsFactory(is_published=True)
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        response = api_client.get(self.list_url)
+
+        assert len(response.json()["results"]) == 1
+
+        News.objects.filter(pk=news.pk).update(deleted=True)
+
+        response = api_client.get(self.list_url)
+
+        assert len(response.json()["results"]) == 1
+
+        response = api_client.get(self.list_url, data={"is_pinned": False})
+
+        assert len(response.json()["results"]) == 0
+
+    def test_list_not_cached_without_shared_cache(self, api_client, settings):
+        settings.CACHE_SHARED = False
+        news = NewsFactory(is_published=True)
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        assert len(api_client.get(self.list_url).json()["results"]) == 1
+
+        News.objects.filter(pk=news.pk).update(deleted=True)
+
+        assert len(api_client.get(self.list_url).json()["results"]) == 0
+
+    def test_list_cache_invalidated_by_management_update(
+        self, api_client, admin_api_client, settings
+    ):
+        settings.CACHE_SHARED = True
+        news = NewsFactory(is_published=True, is_pinned=False)
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        response = api_client.get(self.list_url, data={"is_pinned": True})
+
+        assert len(response.json()["results"]) == 0
+
+        admin_api_client.patch(
+            reverse("news:management:news", kwargs={"pk": news.pk}),
+            {"is_pinned": True},
+            format="json",
+        )
+
+        response = api_client.get(self.list_url, data={"is_pinned": True})
+
+        assert len(response.json()["results"]) == 1
+
+
+@pytest.mark.django_db
+class TestNewsPublishedCacheInvalidation:
+    list_url = reverse("news:published:news")
+
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, settings):
+        settings.CACHE_SHARED = True
+
+    def get_ids(self, api_client):
+        return [item["id"] for item in api_client.get(self.list_url).json()["results"]]
+
+    def test_news_becoming_dispute_leaves_feed(self, api_client):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        assert self.get_ids(api_client) == [str(news.id)]
+
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_FALSE)
+
+        assert self.get_ids(api_client) == []
+
+    def test_news_becoming_spam_leaves_feed(self, api_client):
+        news = NewsFactory(is_published=True)
+        opinion = ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+        assert self.get_ids(api_client) == [str(news.id)]
+
+        opinion.verdict = VerdictType.SPAM
+        opinion.save()
+
+        assert self.get_ids(api_client) == []
+
+    def test_news_with_expert_verdict_while_unpublished_leaves_feed(self, api_client):
+        news = NewsFactory(is_published=False)
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        assert self.get_ids(api_client) == [str(news.id)]
+
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        assert self.get_ids(api_client) == []
+
+    def test_deleted_news_leaves_feed(self, api_client):
+        news = NewsFactory(is_published=True)
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+        assert self.get_ids(api_client) == [str(news.id)]
+
+        news.delete()
+
+        assert self.get_ids(api_client) == []
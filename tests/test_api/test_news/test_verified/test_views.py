@@ -125,6 +125,9 @@ class TestNewsVerifiedViewSet:
         response = api_client.get(self.list_url, data={"tags[]": [uuid4()]})
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+        response = api_client.get(self.list_url, data={"tags[]": [tag_1.name, uuid4()]})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_list_filter_by_domains(self, api_client):
         user = UserFactory(role=UserRoleType.FACT_CHECKER)
         api_client.force_authenticate(user=user)
@@ -0,0 +1,39 @@
+from datetime import date
+
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from dook.api.paginations import KeysetCursorPagination
+from dook.core.users.models import Invitation
+from tests.factories.users import InvitationFactory
+
+
+def paginate(queryset, **params):
+    paginator = KeysetCursorPagination(1, "page_size", 200)
+    request = Request(APIRequestFactory().get("/", params))
+    results = paginator.paginate_queryset(queryset, request)
+    return results, paginator
+
+
+@pytest.mark.django_db
+class TestKeysetCursorPagination:
+    def test_nullable_ordering_field(self):
+        not_sent = InvitationFactory.create_batch(2, sent_at=None)
+        sent = [InvitationFactory(sent_at=date(2020, 6, day)) for day in (1, 2)]
+        # NULLs are ordered as the largest values, ie. first in descending order
+        expected_ids = [
+            *sorted((invitation.id for invitation in not_sent), reverse=True),
+            *(invitation.id for invitation in reversed(sent)),
+        ]
+        queryset = Invitation.objects.order_by("-sent_at")
+
+        pages = [paginate(queryset, pagination="cursor")]
+        while pages[-1][1].next_cursor:
+            pages.append(paginate(queryset, cursor=pages[-1][1].next_cursor))
+
+        assert [results[0].id for results, _ in pages] == expected_ids
+
+        results, _ = paginate(queryset, cursor=pages[-1][1].previous_cursor, page_size=3)
+
+        assert [invitation.id for invitation in results] == expected_ids[:3]
@@ -0,0 +1,89 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from dook.core.database.instrumentation import record_queries
+from dook.core.news.constants import VerdictType
+from dook.core.users.constants import UserRoleType
+from tests.factories.news import (
+    ExpertOpinionFactory,
+    FactCheckerOpinionFactory,
+    NewsDomainFactory,
+    NewsFactory,
+    NewsTagFactory,
+)
+from tests.factories.users import InvitationFactory, UserFactory, UserNewsFactory
+from tests.query_budgets import QUERY_BUDGETS, BudgetQueryRecorder, get_api_endpoints
+
+LIST_ENDPOINTS = [
+    ("news:crew:expert-news", UserRoleType.EXPERT),
+    ("news:crew:fact-checker-news", UserRoleType.FACT_CHECKER),
+    ("news:management:news", UserRoleType.ADMIN),
+    ("news:published:news", None),
+    ("news:verified:news", UserRoleType.EXPERT),
+    ("users:expert-list", UserRoleType.ADMIN),
+    ("users:fact-checker-list", UserRoleType.ADMIN),
+    ("users:invitation-list", UserRoleType.ADMIN),
+    ("users:moderator-list", UserRoleType.ADMIN),
+    ("users:specialist-list", UserRoleType.ADMIN),
+]
+
+
+def test_every_api_endpoint_has_a_budget():
+    assert get_api_endpoints() - set(QUERY_BUDGETS) == set()
+
+
+def create_rows(count, users):
+    """
+    Creates news with opinions, assignments and keywords of the users, and
+    users and invitations of every role.
+    """
+    for _ in range(count):
+        news = NewsFactory(is_published=True)
+        NewsTagFactory(news=news)
+        NewsDomainFactory(news=news)
+        for role in (UserRoleType.FACT_CHECKER, UserRoleType.FACT_CHECKER):
+            fact_checker = UserFactory(role=role)
+            UserNewsFactory(user=fact_checker, news=news)
+            FactCheckerOpinionFactory(
+                judge=fact_checker, news=news, verdict=VerdictType.VERIFIED_TRUE
+            )
+        for user in users.values():
+            UserNewsFactory(user=user, news=news)
+        ExpertOpinionFactory(
+            judge=users[UserRoleType.EXPERT], news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        for role in (
+            UserRoleType.EXPERT,
+            UserRoleType.SPECIALIST,
+            UserRoleType.MODERATOR,
+        ):
+            UserFactory(role=role)
+        InvitationFactory()
+
+
+def count_queries(api_client, url):
+    with record_queries(BudgetQueryRecorder()) as recorder:
+        response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    return recorder.count
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name, role", LIST_ENDPOINTS)
+def test_list_queries_do_not_grow_with_rows(api_client, view_name, role):
+    users = {
+        user_role: UserFactory(role=user_role, is_active=True, is_verified=True)
+        for user_role in (UserRoleType.EXPERT, UserRoleType.FACT_CHECKER)
+    }
+    if role is not None:
+        user = users.get(role) or UserFactory(role=role)
+        api_client.force_authenticate(user=user)
+    url = reverse(view_name)
+
+    create_rows(1, users)
+    queries_count = count_queries(api_client, url)
+
+    create_rows(4, users)
+    assert count_queries(api_client, url) == queries_count
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from dook.api.transactions import (
+    ReadOnlyViewWriteError,
+    TransactionPolicy,
+    TransactionPolicyMiddleware,
+    get_transaction_policy,
+)
+from dook.core.news.models import Tag
+
+
+class RecordingView(APIView):
+    authentication_classes = ()
+    permission_classes = ()
+    transaction_policies = {"PUT": TransactionPolicy.AUTOCOMMIT}
+
+    def handle(self, request):
+        Tag.objects.count()
+        if request.query_params.get("write"):
+            Tag.objects.create(name="tag")
+        return Response({"in_atomic_block": connection.in_atomic_block})
+
+    get = post = put = handle
+
+
+def call_view(api_rf, method, write=False):
+    request = getattr(api_rf, method)("/?write=1" if write else "/")
+    middleware = TransactionPolicyMiddleware(lambda request: None)
+    return middleware.process_view(request, RecordingView.as_view(), (), {})
+
+
+@pytest.mark.parametrize(
+    "method, expected",
+    [
+        ("GET", TransactionPolicy.READ_ONLY),
+        ("OPTIONS", TransactionPolicy.READ_ONLY),
+        ("POST", TransactionPolicy.ATOMIC),
+        ("PUT", TransactionPolicy.AUTOCOMMIT),
+    ],
+)
+def test_get_transaction_policy(method, expected):
+    assert get_transaction_policy(RecordingView.as_view(), method) == expected
+
+
+@pytest.mark.parametrize(
+    "method, in_atomic_block", [("get", False), ("post", True), ("put", False)]
+)
+def test_views_run_with_their_policy(transactional_db, api_rf, method, in_atomic_block):
+    response = call_view(api_rf, method)
+
+    assert response.data == {"in_atomic_block": in_atomic_block}
+
+
+def test_write_in_read_only_view_raises(db, api_rf):
+    with pytest.raises(ReadOnlyViewWriteError):
+        call_view(api_rf, "get", write=True)
+
+
+@pytest.mark.parametrize("method", ["post", "put"])
+def test_write_in_other_views(db, api_rf, method):
+    call_view(api_rf, method, write=True)
+
+    assert Tag.objects.count() == 1
+
+
+def test_guard_disabled(db, api_rf, settings):
+    settings.TRANSACTION_POLICY_GUARD = False
+
+    call_view(api_rf, "get", write=True)
+
+    assert Tag.objects.count() == 1
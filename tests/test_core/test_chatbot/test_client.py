@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from assertpy import assert_that
+
+from dook.core.integrations.chatbot.client import ApiClient, reset_client_state
+from dook.core.integrations.chatbot.exceptions import (
+    ChatbotApiError,
+    ChatbotUnavailableError,
+)
+from dook.core.integrations.circuit_breaker import CircuitBreaker
+
+
+class StubChatbotHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server.requests.append(
+            {
+                "path": self.path,
+                "json": json.loads(body),
+                "api_key": self.headers["x-api-key"],
+                "client_port": self.client_address[1],
+            }
+        )
+        time.sleep(server.delay)
+
+        self.send_response(server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture()
+def stub_server(settings):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubChatbotHandler)
+    server.requests = []
+    server.status = 200
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    settings.CHATBOT_API_URL = f"http://127.0.0.1:{server.server_port}"
+    settings.CHATBOT_API_READ_TIMEOUT = 0.5
+    settings.CHATBOT_API_CIRCUIT_FAILURE_THRESHOLD = 2
+    settings.CHATBOT_API_CIRCUIT_RESET_TIMEOUT = 60
+    reset_client_state()
+
+    yield server
+
+    reset_client_state()
+    server.shutdown()
+    server.server_close()
+
+
+class TestApiClient:
+    def test_post_reuses_connection(self, stub_server):
+        ApiClient().post("/news", {"type": "new_verdict"})
+        ApiClient().post("/news", {"type": "edit_verdict"})
+
+        requests = stub_server.requests
+        assert_that(requests).extracting("path").is_equal_to(["/news", "/news"])
+        assert_that(requests).extracting("json").is_equal_to(
+            [{"type": "new_verdict"}, {"type": "edit_verdict"}]
+        )
+        assert_that(requests[0]["client_port"]).is_equal_to(requests[1]["client_port"])
+
+    def test_post_error_status(self, stub_server):
+        stub_server.status = 500
+
+        with pytest.raises(ChatbotApiError):
+            ApiClient().post("/news", {})
+
+    def test_post_read_timeout(self, stub_server):
+        stub_server.delay = 1
+
+        started_at = time.monotonic()
+        with pytest.raises(ChatbotApiError):
+            ApiClient().post("/news", {})
+
+        assert_that(time.monotonic() - started_at).is_less_than(1)
+
+    def test_open_circuit_skips_requests(self, stub_server):
+        stub_server.status = 503
+        for _ in range(2):
+            with pytest.raises(ChatbotApiError):
+                ApiClient().post("/news", {})
+
+        with pytest.raises(ChatbotUnavailableError):
+            ApiClient().post("/news", {})
+
+        assert_that(stub_server.requests).is_length(2)
+
+    def test_send_news_verdicts_batch(self, settings):
+        settings.CHATBOT_API_BATCH = True
+        events = [{"type": "new_verdict"}, {"type": "edit_verdict"}]
+
+        with mock.patch.object(ApiClient, "_send") as mocked:
+            ApiClient().send_news_verdicts(events)
+
+        assert_that(mocked.call_args_list).is_equal_to(
+            [mock.call({"events": events}, path="/news/batch")]
+        )
+
+    def test_send_news_verdicts_one_by_one(self, settings):
+        settings.CHATBOT_API_BATCH = False
+        events = [{"type": "new_verdict"}, {"type": "edit_verdict"}]
+
+        with mock.patch.object(ApiClient, "_send") as mocked:
+            ApiClient().send_news_verdicts(events)
+
+        assert_that(mocked.call_args_list).is_equal_to(
+            [mock.call(event, path="/news") for event in events]
+        )
+
+
+class TestCircuitBreaker:
+    def test_half_open_after_reset_timeout(self):
+        now = [0]
+        circuit_breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+        )
+
+        circuit_breaker.record_failure()
+        assert_that(circuit_breaker.allow_request()).is_false()
+
+        now[0] = 10
+        assert_that(circuit_breaker.allow_request()).is_true()
+        # only a single trial request while half open
+        assert_that(circuit_breaker.allow_request()).is_false()
+
+        circuit_breaker.record_success()
+        assert_that(circuit_breaker.state).is_equal_to(CircuitBreaker.CLOSED)
+
+    def test_failed_trial_opens_again(self):
+        now = [0]
+        circuit_breaker = CircuitBreaker(
+            failure_threshold=3, reset_timeout=10, clock=lambda: now[0]
+        )
+        for _ in range(3):
+            circuit_breaker.record_failure()
+
+        now[0] = 10
+        assert_that(circuit_breaker.allow_request()).is_true()
+        circuit_breaker.record_failure()
+
+        assert_that(circuit_breaker.state).is_equal_to(CircuitBreaker.OPEN)
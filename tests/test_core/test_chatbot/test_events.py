@@ -3,7 +3,14 @@ from unittest import mock
 import pytest
 from django.urls import reverse
 
+from rest_framework import status
+
 from dook.api.news.consts import OpinionType
+from dook.core.events.models import OutboxEvent
+from dook.core.integrations.chatbot.exceptions import (
+    ChatbotApiError,
+    ChatbotUnavailableError,
+)
 from dook.core.integrations.chatbot.serializers import ChatbotNewsSerializer
 from dook.core.news.constants import VerdictType
 from dook.core.users.constants import UserRoleType
@@ -28,7 +35,9 @@ def default_opinion_data():
 
 class TestChatbotNewsSubscriber:
     @pytest.mark.django_db
-    def test_new_expert_verdict(self, default_opinion_data, api_client):
+    def test_new_expert_verdict(
+        self, default_opinion_data, api_client, deliver_outbox_events
+    ):
         with mock.patch(
             "dook.core.integrations.chatbot.client.ApiClient._send"
         ) as mocked:
@@ -46,6 +55,7 @@ class TestChatbotNewsSubscriber:
                     "news:crew:expert-news-create-opinion", kwargs={"pk": news.pk}
                 )
                 api_client.post(url, default_opinion_data)
+                deliver_outbox_events()
 
                 news.refresh_from_db()
                 news.is_with_verdict()
@@ -57,7 +67,9 @@ class TestChatbotNewsSubscriber:
                 )
 
     @pytest.mark.django_db
-    def test_new_factcheckers_verdict(self, default_opinion_data, api_client):
+    def test_new_factcheckers_verdict(
+        self, default_opinion_data, api_client, deliver_outbox_events
+    ):
         with mock.patch(
             "dook.core.integrations.chatbot.client.ApiClient._send"
         ) as mocked:
@@ -80,11 +92,13 @@ class TestChatbotNewsSubscriber:
 
                 api_client.force_authenticate(user=user_1)
                 api_client.post(url, default_opinion_data)
+                deliver_outbox_events()
 
                 assert mocked.called is False
 
                 api_client.force_authenticate(user=user_2)
                 api_client.post(url, default_opinion_data)
+                deliver_outbox_events()
 
                 news.refresh_from_db()
                 news.is_with_verdict()
@@ -96,7 +110,9 @@ class TestChatbotNewsSubscriber:
                 )
 
     @pytest.mark.django_db
-    def test_edit_expert_verdict(self, default_opinion_data, admin_api_client):
+    def test_edit_expert_verdict(
+        self, default_opinion_data, admin_api_client, deliver_outbox_events
+    ):
         with mock.patch(
             "dook.core.integrations.chatbot.client.ApiClient._send"
         ) as mocked:
@@ -105,12 +121,14 @@ class TestChatbotNewsSubscriber:
 
             update_opinion_data = default_opinion_data
             update_opinion_data["title"] = "Prohibition Ends At Last"
+            update_opinion_data["verdict"] = VerdictType.VERIFIED_FALSE
             update_opinion_data["type"] = OpinionType.VERDICT.value
 
             url = reverse(
                 f"news:management:expert-opinion-detail", kwargs={"pk": opinion.id}
             )
             admin_api_client.put(url, update_opinion_data)
+            deliver_outbox_events()
 
             opinion.refresh_from_db()
             opinion.news.is_with_verdict()
@@ -125,7 +143,9 @@ class TestChatbotNewsSubscriber:
             )
 
     @pytest.mark.django_db
-    def test_edit_factchecker_verdict(self, default_opinion_data, admin_api_client):
+    def test_edit_factchecker_verdict(
+        self, default_opinion_data, admin_api_client, deliver_outbox_events
+    ):
         with mock.patch(
             "dook.core.integrations.chatbot.client.ApiClient._send"
         ) as mocked:
@@ -133,15 +153,21 @@ class TestChatbotNewsSubscriber:
             news = NewsFactory()
             FactCheckerOpinionFactory(**default_opinion_data, news=news)
             opinion = FactCheckerOpinionFactory(**default_opinion_data, news=news)
+            FactCheckerOpinionFactory(
+                **{**default_opinion_data, "verdict": VerdictType.VERIFIED_FALSE},
+                news=news,
+            )
 
             update_opinion_data = default_opinion_data
             update_opinion_data["title"] = "Prohibition Ends At Last"
+            update_opinion_data["verdict"] = VerdictType.VERIFIED_FALSE
             update_opinion_data["type"] = OpinionType.VERDICT.value
 
             url = reverse(
                 f"news:management:fact-checker-opinion-detail", kwargs={"pk": opinion.id}
             )
             admin_api_client.put(url, update_opinion_data)
+            deliver_outbox_events()
 
             opinion.refresh_from_db()
             opinion.news.is_with_verdict()
@@ -156,7 +182,9 @@ class TestChatbotNewsSubscriber:
             )
 
     @pytest.mark.django_db
-    def test_edit_news_with_verdict(self, default_opinion_data, admin_api_client):
+    def test_edit_news_with_verdict_sends_no_verdict_event(
+        self, default_opinion_data, admin_api_client, deliver_outbox_events
+    ):
         with mock.patch(
             "dook.core.integrations.chatbot.client.ApiClient._send"
         ) as mocked:
@@ -167,19 +195,18 @@ class TestChatbotNewsSubscriber:
             data = {"text": "new text", "is_pinned": True}
 
             url = reverse(f"news:management:news", kwargs={"pk": news.id})
-            admin_api_client.put(url, data)
+            admin_api_client.patch(url, data, format="json")
+            deliver_outbox_events()
 
-            news.refresh_from_db()
-            news.is_with_verdict()
-
-            assert mocked.called
-            assert mocked.call_args == mock.call(
-                {"type": "edit_verdict", "data": ChatbotNewsSerializer(news).data},
-                path="/news",
-            )
+            # only the verdict given by the opinions is sent
+            assert [call[0][0]["type"] for call in mocked.call_args_list] == [
+                "new_verdict"
+            ]
 
     @pytest.mark.django_db
-    def test_edit_news_without_verdict(self, default_opinion_data, admin_api_client):
+    def test_edit_news_without_verdict(
+        self, default_opinion_data, admin_api_client, deliver_outbox_events
+    ):
         with mock.patch(
             "dook.core.integrations.chatbot.client.ApiClient._send"
         ) as mocked:
@@ -190,6 +217,54 @@ class TestChatbotNewsSubscriber:
             data = {"text": "new text", "is_pinned": True}
 
             url = reverse(f"news:management:news", kwargs={"pk": news.id})
-            admin_api_client.put(url, data)
+            admin_api_client.patch(url, data, format="json")
+            deliver_outbox_events()
 
             assert mocked.called is False
+
+
+@pytest.mark.django_db
+class TestChatbotNewsSubscriberFailures:
+    url_name = "news:crew:expert-news-create-opinion"
+
+    def post_verdict(self, api_client, default_opinion_data):
+        news = NewsFactory()
+        api_client.force_authenticate(user=UserFactory(role=UserRoleType.EXPERT))
+        return api_client.post(
+            reverse(self.url_name, kwargs={"pk": news.pk}),
+            {**default_opinion_data, "type": OpinionType.VERDICT.value},
+        )
+
+    @pytest.mark.parametrize(
+        "error",
+        [ChatbotApiError("timed out"), ChatbotUnavailableError("circuit is open")],
+    )
+    def test_opinion_is_saved_while_chatbot_fails(
+        self, error, default_opinion_data, api_client, settings
+    ):
+        settings.EVENTS_OUTBOX = False
+
+        with mock.patch(
+            "dook.core.integrations.chatbot.client.ApiClient._send", side_effect=error
+        ) as mocked:
+            with mock.patch("dook.core.users.events.NewsNewVerdictSubscriber"):
+                response = self.post_verdict(api_client, default_opinion_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert mocked.called
+
+    def test_failure_is_retried_by_outbox(
+        self, default_opinion_data, api_client, deliver_outbox_events
+    ):
+        with mock.patch(
+            "dook.core.integrations.chatbot.client.ApiClient._send",
+            side_effect=ChatbotApiError("timed out"),
+        ):
+            with mock.patch("dook.core.users.events.NewsNewVerdictSubscriber"):
+                response = self.post_verdict(api_client, default_opinion_data)
+                deliver_outbox_events()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        outbox_event = OutboxEvent.objects.get(subscriber__contains="Chatbot")
+        assert outbox_event.attempts == 1
+        assert "timed out" in outbox_event.last_error
@@ -0,0 +1,96 @@
+import json
+from unittest import mock
+
+import pytest
+from assertpy import assert_that
+
+from dook.core.integrations.chatbot.client import ApiClient
+from dook.core.integrations.chatbot.exceptions import ChatbotApiError
+from dook.core.integrations.chatbot.resync import ChatbotResync
+from dook.core.news.constants import VerdictType
+from tests.factories.news import (
+    ExpertOpinionFactory,
+    FactCheckerOpinionFactory,
+    NewsFactory,
+)
+
+
+@pytest.fixture()
+def news_with_verdicts():
+    news_list = NewsFactory.create_batch(4)
+    for news in news_list:
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_FALSE
+        )
+    expert_news = NewsFactory()
+    ExpertOpinionFactory(news=expert_news, verdict=VerdictType.VERIFIED_TRUE)
+
+    return sorted(news_list + [expert_news], key=lambda news: news.pk)
+
+
+@pytest.fixture()
+def checkpoint_path(tmp_path):
+    return str(tmp_path / "checkpoint.json")
+
+
+def sent_news_ids(mocked):
+    return [data["data"]["id"] for call in mocked.call_args_list for data in call.args[0]]
+
+
+@pytest.mark.django_db
+class TestChatbotResync:
+    def test_sends_news_with_verdict(self, news_with_verdicts, checkpoint_path):
+        FactCheckerOpinionFactory(news=NewsFactory(), verdict=VerdictType.VERIFIED_TRUE)
+
+        with mock.patch.object(ApiClient, "send_news_verdicts") as mocked:
+            sent = ChatbotResync(
+                checkpoint_path=checkpoint_path, chunk_size=2, batch_size=1
+            ).run()
+
+        assert_that(sent).is_equal_to(5)
+        assert_that(mocked.call_count).is_equal_to(5)
+        assert_that(sent_news_ids(mocked)).is_equal_to(
+            [str(news.pk) for news in news_with_verdicts]
+        )
+        data = mocked.call_args_list[0].args[0][0]
+        assert_that(data["type"]).is_equal_to("new_verdict")
+        assert_that(data["data"]["current_verdict"]).is_not_none()
+
+    def test_chunk_queries_do_not_depend_on_news_count(
+        self, news_with_verdicts, checkpoint_path, django_assert_max_num_queries
+    ):
+        with mock.patch.object(ApiClient, "send_news_verdicts"):
+            # chunk, opinions, expert opinions, tags and the final empty chunk
+            with django_assert_max_num_queries(5):
+                ChatbotResync(checkpoint_path=checkpoint_path, chunk_size=10).run()
+
+    def test_resumes_after_failure(self, news_with_verdicts, checkpoint_path):
+        with mock.patch.object(
+            ApiClient,
+            "send_news_verdicts",
+            side_effect=[None, None, ChatbotApiError("timeout")],
+        ):
+            with pytest.raises(ChatbotApiError):
+                ChatbotResync(
+                    checkpoint_path=checkpoint_path, chunk_size=2, batch_size=2
+                ).run()
+
+        with open(checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        assert_that(checkpoint).is_equal_to(
+            {"last_pk": str(news_with_verdicts[3].pk), "sent": 4}
+        )
+
+        with mock.patch.object(ApiClient, "send_news_verdicts") as mocked:
+            sent = ChatbotResync(checkpoint_path=checkpoint_path, chunk_size=2).run()
+
+        assert_that(sent).is_equal_to(5)
+        assert_that(sent_news_ids(mocked)).is_equal_to([str(news_with_verdicts[4].pk)])
+
+    def test_dry_run(self, news_with_verdicts, checkpoint_path, tmp_path):
+        with mock.patch.object(ApiClient, "send_news_verdicts") as mocked:
+            sent = ChatbotResync(checkpoint_path=checkpoint_path, dry_run=True).run()
+
+        assert_that(sent).is_equal_to(5)
+        assert_that(mocked.called).is_false()
+        assert_that(list(tmp_path.iterdir())).is_empty()
@@ -0,0 +1,55 @@
+import pytest
+
+from dook.core.database.instrumentation import NO_ORIGIN, QueryRecorder, record_queries
+from dook.core.news.constants import VerdictType
+from dook.core.news.models import News
+from tests.factories.news import ExpertOpinionFactory, NewsFactory
+
+
+@pytest.mark.django_db
+class TestQueryOrigins:
+    def test_queries_are_attributed_to_manager_method(self):
+        ExpertOpinionFactory(
+            news=NewsFactory(is_published=True), verdict=VerdictType.VERIFIED_TRUE
+        )
+
+        with record_queries() as recorder:
+            list(News.objects.published())
+
+        # prefetches run with the news query
+        assert recorder.origins == {"NewsManager.published": 3}
+
+    def test_first_method_stays_origin_of_chained_querysets(self):
+        with record_queries() as recorder:
+            News.objects.with_keywords().verified_by_expert().filter(
+                deleted=False
+            ).count()
+
+        assert recorder.origins == {"NewsQuerySet.with_keywords": 1}
+
+    def test_queries_run_by_method_are_attributed_to_it(self):
+        NewsFactory()
+
+        with record_queries() as recorder:
+            News.objects.recompute_verdict_state(dry_run=True)
+
+        # labeled methods called by it do not take over the origin
+        assert recorder.origins == {"NewsManager.recompute_verdict_state": 3}
+
+    def test_other_queries_have_no_origin(self):
+        with record_queries() as recorder:
+            News.objects.filter(deleted=False).count()
+
+        assert recorder.origins == {NO_ORIGIN: 1}
+
+
+class TestQueryRecorder:
+    def test_keeps_slowest_statements(self):
+        recorder = QueryRecorder(slowest_count=2)
+
+        for duration, sql in ((0.2, "a"), (0.1, "b"), (0.3, "c"), (0.05, "d")):
+            recorder.record(sql, duration, NO_ORIGIN)
+
+        assert recorder.count == 4
+        assert recorder.duration == pytest.approx(0.65)
+        assert recorder.get_slowest() == [(0.3, "c", NO_ORIGIN), (0.2, "a", NO_ORIGIN)]
@@ -0,0 +1,144 @@
+import threading
+
+import psycopg2
+import pytest
+from psycopg2 import extensions
+
+from dook.core.database.pool import ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        if self.connection.broken:
+            raise psycopg2.OperationalError("server closed the connection")
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+        self.rolled_back = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return self.transaction_status
+
+    def rollback(self):
+        self.rolled_back = True
+        self.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def pool():
+    return ConnectionPool("default", {"MAX_SIZE": 2, "TIMEOUT": 0.1})
+
+
+def test_reuses_connections(pool):
+    connection = pool.checkout(FakeConnection)
+    pool.checkin(connection)
+
+    assert pool.checkout(FakeConnection) is connection
+    assert pool.get_stats()["checkouts"] == 2
+    assert pool.get_stats()["connects"] == 1
+
+
+def test_evicts_unhealthy_connection_on_checkout(pool):
+    connection = pool.checkout(FakeConnection)
+    pool.checkin(connection)
+    connection.broken = True
+
+    new_connection = pool.checkout(FakeConnection)
+
+    assert new_connection is not connection
+    assert connection.closed
+    stats = pool.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["size"] == 1
+
+
+def test_rolls_back_connection_left_in_transaction(pool):
+    connection = pool.checkout(FakeConnection)
+    connection.transaction_status = extensions.TRANSACTION_STATUS_INERROR
+
+    pool.checkin(connection)
+
+    assert connection.rolled_back
+    assert pool.checkout(FakeConnection) is connection
+
+
+@pytest.mark.parametrize(
+    "options, discard", [({}, True), ({"MAX_LIFETIME": -1}, False)],
+)
+def test_evicts_connection_on_checkin(options, discard):
+    pool = ConnectionPool("default", options)
+    connection = pool.checkout(FakeConnection)
+
+    pool.checkin(connection, discard=discard)
+
+    assert connection.closed
+    assert pool.get_stats()["evictions"] == 1
+    assert pool.get_stats()["size"] == 0
+
+
+def test_times_out_when_exhausted(pool):
+    pool.checkout(FakeConnection)
+    pool.checkout(FakeConnection)
+
+    with pytest.raises(psycopg2.OperationalError):
+        pool.checkout(FakeConnection)
+
+    stats = pool.get_stats()
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["in_use"] == 2
+
+
+def test_waits_for_checked_in_connection(pool):
+    pool.options["TIMEOUT"] = 5
+    connection = pool.checkout(FakeConnection)
+    pool.checkout(FakeConnection)
+    checked_out = []
+
+    thread = threading.Thread(target=lambda: checked_out.append(pool.checkout(None)))
+    thread.start()
+    pool.checkin(connection)
+    thread.join(5)
+
+    assert checked_out == [connection]
+    assert pool.get_stats()["size"] == 2
+
+
+def test_failed_connect_releases_slot(pool):
+    def connect():
+        raise psycopg2.OperationalError("could not connect")
+
+    with pytest.raises(psycopg2.OperationalError):
+        pool.checkout(connect)
+
+    assert pool.get_stats()["size"] == 0
+
+
+def test_close_idle(pool):
+    connection = pool.checkout(FakeConnection)
+    pool.checkin(connection)
+
+    pool.close_idle()
+
+    assert connection.closed
+    assert pool.get_stats()["size"] == 0
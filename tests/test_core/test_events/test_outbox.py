@@ -0,0 +1,226 @@
+import datetime
+
+import pytest
+from assertpy import assert_that
+from django.db import transaction
+from django.utils import timezone
+
+from dook.core.events.constants import OutboxEventStatus
+from dook.core.events.exceptions import SubscriberUnavailableError
+from dook.core.events.models import OutboxEvent
+from dook.core.events.outbox import OutboxDelivery
+from dook.core.events.services import ModelEventService
+from tests.factories.news import NewsFactory
+
+SUBSCRIBER_PATH = "tests.test_core.test_events.test_outbox.RecordingSubscriber"
+BATCH_SUBSCRIBER_PATH = "tests.test_core.test_events.test_outbox.BatchRecordingSubscriber"
+IMMEDIATE_SUBSCRIBER_PATH = (
+    "tests.test_core.test_events.test_outbox.ImmediateRecordingSubscriber"
+)
+
+
+class RecordingSubscriber:
+    outbox = True
+    received = []
+    failures = 0
+    unavailable = False
+
+    @classmethod
+    def receive(cls, obj, *args, **kwargs):
+        if cls.unavailable:
+            raise SubscriberUnavailableError("subscriber circuit is open")
+        if cls.failures:
+            cls.failures -= 1
+            raise ConnectionError("subscriber is down")
+        # leased events are not due for other workers while delivered
+        cls.received.append((obj, args, kwargs, OutboxEvent.objects.due().count()))
+
+
+class BatchRecordingSubscriber(RecordingSubscriber):
+    batches = []
+
+    @classmethod
+    def receive_batch(cls, events):
+        cls.batches.append(events)
+
+
+class ImmediateRecordingSubscriber:
+    received = []
+
+    @classmethod
+    def receive(cls, obj, *args, **kwargs):
+        cls.received.append((obj, args, kwargs))
+
+
+class SampleEvents(ModelEventService):
+    def happened(self, *args, **kwargs):
+        self._send("test_event", *args, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def subscribers(settings):
+    settings.EVENTS = {"test_event": [SUBSCRIBER_PATH, IMMEDIATE_SUBSCRIBER_PATH]}
+    RecordingSubscriber.received = []
+    RecordingSubscriber.failures = 0
+    RecordingSubscriber.unavailable = False
+    ImmediateRecordingSubscriber.received = []
+    BatchRecordingSubscriber.batches = []
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    def test_outbox_subscriber_receives_after_delivery(self):
+        news = NewsFactory()
+
+        SampleEvents(news).happened("first", number=1)
+
+        assert_that(RecordingSubscriber.received).is_empty()
+        assert_that(ImmediateRecordingSubscriber.received).is_length(1)
+
+        handled = OutboxDelivery().deliver_all()
+
+        assert_that(handled).is_equal_to(1)
+        assert_that(RecordingSubscriber.received).is_equal_to(
+            [(news, ("first",), {"number": 1}, 0)]
+        )
+        outbox_event = OutboxEvent.objects.get()
+        assert_that(outbox_event.status).is_equal_to(OutboxEventStatus.DELIVERED)
+        assert_that(outbox_event.attempts).is_equal_to(1)
+
+    def test_rolled_back_event_is_not_delivered(self):
+        news = NewsFactory()
+
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                SampleEvents(news).happened()
+                raise ValueError
+
+        assert_that(OutboxEvent.objects.exists()).is_false()
+
+    def test_failed_delivery_is_retried_with_backoff(self, settings):
+        settings.EVENTS_OUTBOX_RETRY_DELAY = 10
+        RecordingSubscriber.failures = 2
+        SampleEvents(NewsFactory()).happened()
+
+        OutboxDelivery().deliver_all()
+
+        outbox_event = OutboxEvent.objects.get()
+        assert_that(outbox_event.status).is_equal_to(OutboxEventStatus.PENDING)
+        assert_that(outbox_event.last_error).contains("subscriber is down")
+        assert_that(outbox_event.available_at).is_greater_than(
+            timezone.now() + datetime.timedelta(seconds=5)
+        )
+
+        OutboxEvent.objects.update(available_at=timezone.now())
+        OutboxDelivery().deliver_all()
+
+        outbox_event.refresh_from_db()
+        assert_that(outbox_event.attempts).is_equal_to(2)
+        assert_that(outbox_event.get_retry_delay()).is_equal_to(
+            datetime.timedelta(seconds=20)
+        )
+
+        OutboxEvent.objects.update(available_at=timezone.now())
+        OutboxDelivery().deliver_all()
+
+        outbox_event.refresh_from_db()
+        assert_that(outbox_event.status).is_equal_to(OutboxEventStatus.DELIVERED)
+        assert_that(RecordingSubscriber.received).is_length(1)
+
+    def test_event_is_dead_after_max_attempts(self, settings):
+        settings.EVENTS_OUTBOX_MAX_ATTEMPTS = 1
+        RecordingSubscriber.failures = 1
+        SampleEvents(NewsFactory()).happened()
+
+        OutboxDelivery().deliver_all()
+
+        outbox_event = OutboxEvent.objects.get()
+        assert_that(outbox_event.status).is_equal_to(OutboxEventStatus.DEAD)
+
+    def test_unavailable_subscriber_does_not_use_attempts(self, settings):
+        settings.EVENTS_OUTBOX_MAX_ATTEMPTS = 1
+        RecordingSubscriber.unavailable = True
+        SampleEvents(NewsFactory()).happened()
+
+        OutboxDelivery().deliver_all()
+
+        outbox_event = OutboxEvent.objects.get()
+        assert_that(outbox_event.status).is_equal_to(OutboxEventStatus.PENDING)
+        assert_that(outbox_event.attempts).is_equal_to(0)
+        assert_that(outbox_event.available_at).is_greater_than(timezone.now())
+
+    def test_interrupted_batch_is_delivered_after_lease(self, monkeypatch):
+        SampleEvents(NewsFactory()).happened()
+
+        def interrupt(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        with monkeypatch.context() as patch:
+            patch.setattr(OutboxDelivery, "deliver", interrupt)
+            with pytest.raises(KeyboardInterrupt):
+                OutboxDelivery().deliver_batch()
+
+        assert_that(OutboxDelivery().deliver_all()).is_equal_to(0)
+
+        OutboxEvent.objects.update(available_at=timezone.now())
+        assert_that(OutboxDelivery().deliver_all()).is_equal_to(1)
+        assert_that(RecordingSubscriber.received).is_length(1)
+
+    def test_event_of_deleted_object_is_dead(self):
+        news = NewsFactory()
+        SampleEvents(news).happened()
+        news.delete()
+
+        OutboxDelivery().deliver_all()
+
+        assert_that(OutboxEvent.objects.get().status).is_equal_to(OutboxEventStatus.DEAD)
+        assert_that(RecordingSubscriber.received).is_empty()
+
+    def test_delivery_batches(self):
+        for news in NewsFactory.create_batch(5):
+            SampleEvents(news).happened()
+
+        handled = OutboxDelivery(batch_size=3).deliver_batch()
+
+        assert_that(handled).is_equal_to(3)
+        assert_that(RecordingSubscriber.received).is_length(3)
+        assert_that(OutboxEvent.objects.due().count()).is_equal_to(2)
+
+    def test_batch_subscriber_receives_events_together(self, settings):
+        settings.EVENTS = {"test_event": [BATCH_SUBSCRIBER_PATH]}
+        first, second = NewsFactory.create_batch(2)
+        SampleEvents(first).happened()
+        SampleEvents(second).happened(number=2)
+
+        OutboxDelivery().deliver_all()
+
+        assert_that(BatchRecordingSubscriber.batches).is_equal_to(
+            [[(first, [], {}), (second, [], {"number": 2})]]
+        )
+        assert_that(
+            OutboxEvent.objects.filter(status=OutboxEventStatus.DELIVERED).count()
+        ).is_equal_to(2)
+
+    def test_objects_are_loaded_in_bulk(self, django_assert_num_queries):
+        for news in NewsFactory.create_batch(5):
+            SampleEvents(news).happened()
+        outbox_events = list(OutboxEvent.objects.select_related("content_type"))
+
+        with django_assert_num_queries(1):
+            objects = OutboxDelivery().get_objects(outbox_events)
+
+        assert_that(objects).is_length(5)
+
+    def test_lag_by_subscriber(self):
+        SampleEvents(NewsFactory()).happened()
+        SampleEvents(NewsFactory()).happened()
+        OutboxEvent.objects.filter(
+            id=OutboxEvent.objects.order_by("id").first().id
+        ).update(status=OutboxEventStatus.DEAD)
+
+        lag = list(OutboxEvent.objects.lag_by_subscriber())
+
+        assert_that(lag).is_length(1)
+        assert_that(lag[0]).contains_entry(
+            {"subscriber": SUBSCRIBER_PATH}, {"pending_count": 1}, {"dead_count": 1}
+        )
@@ -0,0 +1,63 @@
+from unittest import mock
+
+import pytest
+
+from assertpy import assert_that
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import override_settings
+
+from dook.core.news.cache import (
+    build_published_feed_key,
+    get_or_build_published_feed,
+    invalidate_published_feed,
+)
+
+
+class TestPublishedFeedCache:
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, settings):
+        settings.CACHE_SHARED = True
+
+    def test_build_key_ignores_unrelated_params_and_order(self):
+        key = build_published_feed_key("list", QueryDict("tags[]=b&tags[]=a&utm=x"))
+
+        assert_that(key).is_equal_to(
+            build_published_feed_key("list", QueryDict("tags[]=a&tags[]=b"))
+        )
+        assert_that(key).is_not_equal_to(
+            build_published_feed_key("list", QueryDict("tags[]=a"))
+        )
+
+    @pytest.mark.django_db
+    def test_invalidate_changes_keys(self):
+        key = build_published_feed_key("list", QueryDict())
+
+        invalidate_published_feed()
+
+        assert_that(build_published_feed_key("list", QueryDict())).is_not_equal_to(key)
+
+    def test_get_or_build_builds_once(self):
+        build = mock.Mock(return_value={"results": []})
+
+        get_or_build_published_feed("key", build)
+        payload = get_or_build_published_feed("key", build)
+
+        assert_that(payload).is_equal_to({"results": []})
+        assert_that(build.call_count).is_equal_to(1)
+
+    @override_settings(
+        PUBLISHED_FEED_CACHE_LOCK_WAIT=1, PUBLISHED_FEED_CACHE_POLL_INTERVAL=0.01
+    )
+    def test_get_or_build_waits_for_concurrent_build(self):
+        cache.add("key:lock", 1)
+        build = mock.Mock(return_value={"results": []})
+
+        def finish_concurrent_build(seconds):
+            cache.set("key", {"results": ["built concurrently"]})
+
+        with mock.patch("dook.core.news.cache.time.sleep", finish_concurrent_build):
+            payload = get_or_build_published_feed("key", build)
+
+        assert_that(payload).is_equal_to({"results": ["built concurrently"]})
+        build.assert_not_called()
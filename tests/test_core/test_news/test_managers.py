@@ -0,0 +1,66 @@
+import pytest
+from assertpy import assert_that
+
+from dook.core.news.constants import VerdictType
+from dook.core.news.models import News
+from tests.factories.news import (
+    FactCheckerOpinionFactory,
+    NewsFactory,
+    NewsTagFactory,
+    TagFactory,
+)
+
+
+@pytest.mark.django_db
+class TestNewsManager:
+    def test_recompute_verdict_state_repairs_drift(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        NewsFactory()
+        News.objects.filter(pk=news.pk).update(
+            current_verdict="no_verdict", fact_checker_true_count=0
+        )
+
+        drifted_news, drifted_fields = News.objects.recompute_verdict_state(chunk_size=1)
+
+        news.refresh_from_db()
+        assert_that(drifted_news).is_equal_to(1)
+        assert_that(dict(drifted_fields)).is_equal_to(
+            {"current_verdict": 1, "fact_checker_true_count": 1}
+        )
+        assert_that(news.current_verdict).is_equal_to(VerdictType.VERIFIED_TRUE)
+
+    def test_recompute_verdict_state_dry_run(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        News.objects.filter(pk=news.pk).update(current_verdict="no_verdict")
+
+        drifted_news, _ = News.objects.recompute_verdict_state(dry_run=True)
+
+        news.refresh_from_db()
+        assert_that(drifted_news).is_equal_to(1)
+        assert_that(news.current_verdict).is_equal_to("no_verdict")
+
+    def test_filter_by_related_tags(self, django_assert_num_queries):
+        tag_1, tag_2 = TagFactory.create_batch(2)
+        news_1, news_2, news_3 = NewsFactory.create_batch(3)
+        NewsTagFactory(news=news_1, tag=tag_1)
+        NewsTagFactory(news=news_1, tag=tag_2)
+        NewsTagFactory(news=news_2, tag=tag_1)
+        NewsTagFactory(news=news_3, tag=tag_2)
+
+        with django_assert_num_queries(1):
+            news_ids = list(
+                News.objects.filter_by_related_tags(tags=[tag_1, tag_2]).values_list(
+                    "id", flat=True
+                )
+            )
+
+        assert_that(news_ids).is_equal_to([news_1.id])
+        assert_that(
+            News.objects.filter_by_related_tags(tags=[tag_1]).count()
+        ).is_equal_to(2)
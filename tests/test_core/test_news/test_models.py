@@ -0,0 +1,176 @@
+import pytest
+from assertpy import assert_that
+
+from dook.core.events.models import OutboxEvent
+from dook.core.news.constants import VerdictType
+from tests.factories.news import (
+    ExpertOpinionFactory,
+    FactCheckerOpinionFactory,
+    NewsFactory,
+)
+
+
+@pytest.mark.django_db
+class TestNewsVerdictState:
+    def test_new_news_has_no_verdict(self):
+        news = NewsFactory()
+
+        assert_that(news.current_verdict).is_equal_to("no_verdict")
+        assert_that(news.fact_checker_opinions_count).is_equal_to(0)
+        assert_that(news.expert_verdict).is_none()
+
+    def test_fact_checker_opinions_update_state(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        news.refresh_from_db()
+        assert_that(news.fact_checker_true_count).is_equal_to(1)
+        assert_that(news.current_verdict).is_equal_to("no_verdict")
+
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        news.refresh_from_db()
+        assert_that(news.fact_checker_opinions_count).is_equal_to(2)
+        assert_that(news.current_verdict).is_equal_to(VerdictType.VERIFIED_TRUE)
+
+    def test_dispute(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_FALSE)
+
+        news.refresh_from_db()
+        assert_that(news.current_verdict).is_equal_to("dispute")
+
+    def test_expert_opinion_overrides_fact_checkers(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        ExpertOpinionFactory(news=news, verdict=VerdictType.SPAM)
+
+        news.refresh_from_db()
+        assert_that(news.expert_verdict).is_equal_to(VerdictType.SPAM)
+        assert_that(news.current_verdict).is_equal_to(VerdictType.SPAM)
+        assert_that(news.is_spam).is_true()
+
+    def test_duplicate(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(2, news=news, is_duplicate=True)
+
+        news.refresh_from_db()
+        assert_that(news.is_duplicate).is_true()
+
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        news.refresh_from_db()
+        assert_that(news.is_duplicate).is_false()
+
+    def test_opinion_edit_and_delete_update_state(self):
+        news = NewsFactory()
+        opinion, _ = FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+
+        opinion.verdict = VerdictType.VERIFIED_FALSE
+        opinion.save()
+
+        news.refresh_from_db()
+        assert_that(news.current_verdict).is_equal_to("dispute")
+
+        opinion.delete()
+
+        news.refresh_from_db()
+        assert_that(news.fact_checker_opinions_count).is_equal_to(1)
+        assert_that(news.current_verdict).is_equal_to("no_verdict")
+
+    def test_stale_instance_save_does_not_overwrite_state(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_FALSE
+        )
+
+        news.text = "new text"
+        news.save()
+
+        news.refresh_from_db()
+        assert_that(news.text).is_equal_to("new text")
+        assert_that(news.current_verdict).is_equal_to(VerdictType.VERIFIED_FALSE)
+
+
+def sent_verdict_events():
+    return list(
+        OutboxEvent.objects.filter(
+            subscriber__startswith="dook.core.integrations.chatbot"
+        ).values_list("event_name", flat=True)
+    )
+
+
+@pytest.mark.django_db
+class TestNewsVerdictEvents:
+    def test_single_new_verdict_event(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        assert_that(sent_verdict_events()).is_empty()
+
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        assert_that(sent_verdict_events()).is_equal_to(["news_new_verdict"])
+        assert_that(news._verdict).is_equal_to(VerdictType.VERIFIED_TRUE)
+
+    def test_changed_verdict_sends_edit_event(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        OutboxEvent.objects.all().delete()
+
+        ExpertOpinionFactory(news=news, verdict=VerdictType.VERIFIED_FALSE)
+
+        assert_that(sent_verdict_events()).is_equal_to(["news_edit_verdict"])
+        assert_that(news._verdict).is_equal_to(VerdictType.VERIFIED_FALSE)
+
+    def test_agreeing_opinion_sends_no_event(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        OutboxEvent.objects.all().delete()
+
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+
+        assert_that(sent_verdict_events()).is_empty()
+
+    def test_save_sends_no_verdict_event(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.VERIFIED_TRUE
+        )
+        OutboxEvent.objects.all().delete()
+        news.refresh_from_db()
+
+        news.is_pinned = True
+        news.save()
+        news.set_screenshot_url("https://example.com/screenshot.png")
+
+        assert_that(sent_verdict_events()).is_empty()
+
+    def test_no_event_without_verdict(self):
+        news = NewsFactory()
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_TRUE)
+        FactCheckerOpinionFactory(news=news, verdict=VerdictType.VERIFIED_FALSE)
+        ExpertOpinionFactory(news=news, verdict=VerdictType.SPAM)
+
+        assert_that(sent_verdict_events()).is_empty()
+
+    def test_is_with_verdict_uses_loaded_state(self, django_assert_num_queries):
+        news = NewsFactory()
+        FactCheckerOpinionFactory.create_batch(
+            2, news=news, verdict=VerdictType.CANNOT_BE_VERIFIED
+        )
+        news.refresh_from_db()
+
+        with django_assert_num_queries(0):
+            assert_that(news.is_with_verdict()).is_true()
+
+        assert_that(news._verdict).is_equal_to(VerdictType.CANNOT_BE_VERIFIED)
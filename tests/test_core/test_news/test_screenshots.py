@@ -0,0 +1,126 @@
+import io
+from unittest import mock
+
+import pytest
+from assertpy import assert_that
+from PIL import Image
+
+from dook.core.events.models import OutboxEvent
+from dook.core.integrations.storage.client import S3ApiClient
+from dook.core.news.models import News
+from dook.core.news.screenshots import ScreenshotDerivativesGenerator
+from dook.core.processor.processor import NewsDraftProcessor
+from tests.factories.news import NewsFactory
+from tests.factories.processor import NewsDraftFactory
+
+
+def store_image(filename, size=(1200, 900), image_format="PNG"):
+    image_file = io.BytesIO()
+    Image.new("RGBA", size, (200, 10, 10, 255)).save(image_file, format=image_format)
+    image_file.seek(0)
+    S3ApiClient().upload_file(image_file, filename, f"image/{image_format.lower()}")
+    return S3ApiClient().get_object_url(filename)
+
+
+def stored_image(stub_s3, url):
+    stored = stub_s3.objects[f"/{url.split('/', 3)[3]}"]
+    return Image.open(io.BytesIO(stored["body"])), stored["content_type"]
+
+
+@pytest.mark.django_db
+class TestScreenshotDerivatives:
+    def test_attached_screenshot_gets_derivatives(self, stub_s3, deliver_outbox_events):
+        news = NewsFactory()
+        image_file = io.BytesIO()
+        Image.new("RGB", (1200, 900)).save(image_file, format="PNG")
+        image_file.seek(0)
+
+        news.attach_screenshot(image_file)
+        deliver_outbox_events()
+
+        news.refresh_from_db()
+        thumbnail, content_type = stored_image(stub_s3, news.screenshot_thumbnail_url)
+        assert_that(thumbnail.format).is_equal_to("JPEG")
+        assert_that(thumbnail.size).is_equal_to((480, 360))
+        assert_that(content_type).is_equal_to("image/jpeg")
+
+        thumbnail, content_type = stored_image(
+            stub_s3, news.screenshot_thumbnail_webp_url
+        )
+        assert_that(thumbnail.format).is_equal_to("WEBP")
+        assert_that(thumbnail.size).is_equal_to((480, 360))
+        assert_that(content_type).is_equal_to("image/webp")
+
+        webp, _ = stored_image(stub_s3, news.screenshot_webp_url)
+        assert_that(webp.size).is_equal_to((1200, 900))
+        assert_that(news.screenshot_webp_url).is_equal_to(f"{news.screenshot_url}.webp")
+
+    def test_materialized_draft_screenshot_is_queued(self):
+        drafts_processor = NewsDraftProcessor()
+        drafts_processor.materialize_news(
+            NewsDraftFactory(
+                screenshot_url="https://screenshots.s3.amazonaws.com/image_1"
+            )
+        )
+        drafts_processor.materialize_news(NewsDraftFactory(screenshot_url=""))
+
+        assert_that(
+            OutboxEvent.objects.filter(event_name="news_screenshot_attached").count()
+        ).is_equal_to(1)
+
+    def test_screenshot_outside_bucket_is_skipped(self, stub_s3):
+        news = NewsFactory(screenshot_url="https://example.com/image.png")
+
+        assert_that(ScreenshotDerivativesGenerator().generate_and_save(news)).is_false()
+        assert_that(stub_s3.objects).is_empty()
+
+    def test_unreadable_screenshot_is_skipped(self, stub_s3):
+        S3ApiClient().upload_file(io.BytesIO(b"not an image"), "image_1", "image/png")
+        news = NewsFactory(screenshot_url=S3ApiClient().get_object_url("image_1"))
+
+        assert_that(ScreenshotDerivativesGenerator().generate_and_save(news)).is_false()
+        news.refresh_from_db()
+        assert_that(news.screenshot_thumbnail_url).is_empty()
+
+    def test_replaced_screenshot_is_not_overwritten(self, stub_s3):
+        news = NewsFactory(screenshot_url=store_image("image_1"))
+        generator = ScreenshotDerivativesGenerator()
+        urls = generator.generate(news)
+
+        News.objects.filter(pk=news.pk).update(screenshot_url=store_image("image_2"))
+
+        assert_that(generator.save(news, urls)).is_false()
+        news.refresh_from_db()
+        assert_that(news.screenshot_thumbnail_url).is_empty()
+
+    def test_stale_instance_save_keeps_derivatives(self, stub_s3):
+        news = NewsFactory(screenshot_url=store_image("image_1"))
+        stale_news = News.objects.get(pk=news.pk)
+        ScreenshotDerivativesGenerator().generate_and_save(news)
+
+        stale_news.text = "new text"
+        stale_news.save()
+
+        stale_news.refresh_from_db()
+        assert_that(stale_news.screenshot_thumbnail_url).is_not_empty()
+
+    def test_backfill(self, stub_s3):
+        news_list = [
+            NewsFactory(screenshot_url=store_image(f"image_{number}"))
+            for number in range(3)
+        ]
+        NewsFactory(screenshot_url="")
+
+        generator = ScreenshotDerivativesGenerator()
+        assert_that(generator.backfill(chunk_size=2, dry_run=True)).is_equal_to(3)
+        with mock.patch(
+            "dook.core.news.screenshots.invalidate_published_feed"
+        ) as invalidate_published_feed:
+            assert_that(generator.backfill(chunk_size=2, workers=2)).is_equal_to(3)
+
+        assert_that(invalidate_published_feed.call_count).is_equal_to(1)
+        for news in news_list:
+            news.refresh_from_db()
+            assert_that(news.screenshot_thumbnail_url).is_not_empty()
+        # news with derivatives are not processed again
+        assert_that(generator.backfill(chunk_size=2)).is_equal_to(0)
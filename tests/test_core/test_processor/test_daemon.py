@@ -0,0 +1,94 @@
+import os
+import signal
+import time
+from unittest import mock
+
+import pytest
+from assertpy import assert_that
+from django.db import connections
+
+from dook.core.processor.daemon import ProcessorDaemon
+from dook.core.users.constants import UserRoleType
+from tests.factories.processor import NewsDraftFactory
+from tests.factories.users import UserFactory
+
+
+class TestProcessorDaemon:
+    @pytest.mark.django_db
+    def test_process_reports_full_batch(self):
+        UserFactory.create_batch(4, role=UserRoleType.FACT_CHECKER, is_active=True)
+        NewsDraftFactory.create_batch(2)
+        daemon = ProcessorDaemon(poll_interval=1)
+
+        assert_that(daemon.process()).is_true()
+        assert_that(daemon.process()).is_true()
+        assert_that(daemon.process()).is_false()
+
+    @pytest.mark.django_db
+    def test_failing_draft_does_not_report_full_batch(self):
+        UserFactory.create_batch(2, role=UserRoleType.FACT_CHECKER, is_active=True)
+        NewsDraftFactory()
+        daemon = ProcessorDaemon(poll_interval=1)
+
+        with mock.patch.object(
+            daemon.drafts_processor, "process_draft", side_effect=ValueError
+        ) as process_draft_mock:
+            assert_that(daemon.process()).is_false()
+
+        assert_that(process_draft_mock.call_count).is_equal_to(1)
+
+    @pytest.mark.django_db
+    def test_run_waits_after_failing_draft(self):
+        UserFactory.create_batch(2, role=UserRoleType.FACT_CHECKER, is_active=True)
+        NewsDraftFactory()
+        daemon = ProcessorDaemon(poll_interval=60)
+
+        def wait():
+            daemon.stopping = True
+
+        def process_draft(news_draft):
+            # stops a daemon retrying the draft at once
+            if process_draft_mock.call_count >= 3:
+                daemon.stopping = True
+            raise ValueError
+
+        with mock.patch.object(
+            daemon.drafts_processor, "process_draft", side_effect=process_draft
+        ) as process_draft_mock, mock.patch.object(
+            daemon, "wait", side_effect=wait
+        ) as wait_mock, mock.patch.object(
+            connections, "close_all"
+        ), mock.patch(
+            "dook.core.processor.daemon.close_old_connections"
+        ):
+            daemon.run()
+
+        assert_that(process_draft_mock.call_count).is_equal_to(1)
+        assert_that(wait_mock.call_count).is_equal_to(1)
+
+    @pytest.mark.django_db
+    def test_run_stops_on_sigterm(self):
+        daemon = ProcessorDaemon(poll_interval=60)
+
+        def process():
+            os.kill(os.getpid(), signal.SIGTERM)
+            return True
+
+        with mock.patch.object(
+            daemon, "process", side_effect=process
+        ) as process_mock, mock.patch.object(connections, "close_all"):
+            daemon.run()
+
+        assert_that(process_mock.call_count).is_equal_to(1)
+        assert_that(signal.getsignal(signal.SIGTERM)).is_not_equal_to(
+            daemon.handle_stop_signal
+        )
+
+    def test_wait_wakes_up_on_stop_signal(self):
+        daemon = ProcessorDaemon(poll_interval=60)
+        daemon.handle_stop_signal(signal.SIGTERM, None)
+
+        started_at = time.monotonic()
+        daemon.wait()
+
+        assert_that(time.monotonic() - started_at).is_less_than(1)
@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+from assertpy import assert_that
+
+from dook.core.processor.keywords import KeywordMatcher, get_sensitive_keyword_matcher
+from tests.factories.news import SensitiveKeywordFactory
+
+
+def keywords(*names):
+    return [SimpleNamespace(name=name) for name in names]
+
+
+class TestKeywordMatcher:
+    def test_iter_matches_reports_positions(self):
+        he, she, hers = keywords("he", "she", "hers")
+        matcher = KeywordMatcher([he, she, hers])
+
+        matches = list(matcher.iter_matches("USHERS"))
+
+        assert_that(matches).is_equal_to([(1, 4, she), (2, 4, he), (2, 6, hers)])
+
+    def test_match_keeps_keywords_order(self):
+        build, noel, fake = keywords("build", "noel", "fake")
+        matcher = KeywordMatcher([build, noel, fake])
+
+        result = matcher.match("Character Noel", "How to BUILD a keyboard")
+
+        assert_that(result).is_equal_to([build, noel])
+
+    def test_match_without_keywords(self):
+        assert_that(KeywordMatcher([]).match("any text")).is_empty()
+
+
+@pytest.mark.django_db
+class TestGetSensitiveKeywordMatcher:
+    def test_rebuilt_only_when_keywords_change(self, django_assert_num_queries):
+        keyword = SensitiveKeywordFactory(name="fake")
+        matcher = get_sensitive_keyword_matcher()
+
+        # only ids and names are fetched while keywords are unchanged
+        with django_assert_num_queries(1) as captured:
+            assert_that(get_sensitive_keyword_matcher()).is_same_as(matcher)
+        assert_that(captured.captured_queries[0]["sql"]).does_not_contain("created_at")
+
+        keyword.name = "hoax"
+        keyword.save()
+        rebuilt_matcher = get_sensitive_keyword_matcher()
+
+        assert_that(rebuilt_matcher).is_not_same_as(matcher)
+        assert_that(rebuilt_matcher.match("a hoax")).is_equal_to([keyword])
@@ -1,11 +1,17 @@
+import datetime
+
 import pytest
 from assertpy import assert_that
+from django.utils import timezone
 
 from dook.core.news.models import News
-from dook.core.processor.processor import NewsDraftProcessor
+from dook.core.processor.models import NewsDraft, ProcessingResult
+from dook.core.processor.processor import NewsDraftProcessor, StaleNewsProcessor
+from dook.core.users.constants import UserRoleType
+from dook.core.users.models import UserNews
 from tests.factories.news import NewsFactory, SensitiveKeywordFactory
 from tests.factories.processor import NewsDraftFactory
-from tests.factories.users import UserFactory
+from tests.factories.users import UserFactory, UserNewsFactory
 
 
 class TestNewsProcessing:
@@ -82,3 +88,80 @@ class TestNewsProcessing:
 
         assert_that(materialized_news_1.is_sensitive).is_true()
         assert_that(materialized_news_2.is_sensitive).is_true()
+
+    @pytest.mark.django_db
+    def test_process_batch(self):
+        UserFactory.create_batch(8, role=UserRoleType.FACT_CHECKER, is_active=True)
+        drafts = NewsDraftFactory.create_batch(3)
+
+        drafts_processor = NewsDraftProcessor()
+        stats = drafts_processor.process_batch()
+
+        assert_that(stats).is_length(1)
+        assert_that(stats[0][0]).is_equal_to(2)
+        assert_that(
+            NewsDraft.objects.filter(processing_result=ProcessingResult.ASSIGNED).count()
+        ).is_equal_to(2)
+        assert_that(News.objects.filter(url=drafts[2].url).exists()).is_false()
+
+    @pytest.mark.django_db
+    def test_process_batch_skips_failed_draft(self):
+        UserFactory.create_batch(8, role=UserRoleType.FACT_CHECKER, is_active=True)
+        failing_draft, draft = NewsDraftFactory.create_batch(2)
+
+        drafts_processor = NewsDraftProcessor()
+        process_draft = drafts_processor.process_draft
+
+        def process_draft_failing(news_draft):
+            if news_draft == failing_draft:
+                raise ValueError
+            return process_draft(news_draft)
+
+        drafts_processor.process_draft = process_draft_failing
+        drafts_processor.process_batch()
+
+        failing_draft.refresh_from_db()
+        draft.refresh_from_db()
+        assert_that(failing_draft.processing_result).is_none()
+        assert_that(draft.processing_result).is_equal_to(ProcessingResult.ASSIGNED)
+
+
+class TestStaleNewsProcessing:
+    @pytest.fixture()
+    def fact_checkers(self):
+        return UserFactory.create_batch(8, role=UserRoleType.FACT_CHECKER)
+
+    @pytest.mark.django_db
+    def test_process_news_oldest_first(self, fact_checkers):
+        now = timezone.now()
+        newest = NewsFactory(reported_at=now)
+        oldest = NewsFactory(reported_at=now - datetime.timedelta(days=2))
+        older = NewsFactory(reported_at=now - datetime.timedelta(days=1))
+
+        StaleNewsProcessor().process_news()
+
+        assert_that(UserNews.objects.filter(news=oldest).count()).is_equal_to(4)
+        assert_that(UserNews.objects.filter(news=older).count()).is_equal_to(4)
+        assert_that(UserNews.objects.filter(news=newest).count()).is_zero()
+
+    @pytest.mark.django_db
+    def test_process_news_respects_existing_assignments(self, fact_checkers):
+        news = NewsFactory()
+        UserNewsFactory(news=news, user=fact_checkers[0])
+        UserNews.objects.update(created_at=timezone.now() - datetime.timedelta(days=30))
+
+        StaleNewsProcessor().process_news()
+
+        assigned_user_ids = UserNews.objects.filter(news=news).values_list(
+            "user_id", flat=True
+        )
+        assert_that(list(assigned_user_ids)).is_length(5).does_not_contain_duplicates()
+
+    @pytest.mark.django_db
+    def test_process_news_balances_assignments(self, fact_checkers):
+        NewsFactory.create_batch(2)
+
+        StaleNewsProcessor().process_news()
+
+        assigned_user_ids = UserNews.objects.values_list("user_id", flat=True)
+        assert_that(list(assigned_user_ids)).is_length(8).does_not_contain_duplicates()
@@ -0,0 +1,69 @@
+from collections import Counter
+
+import pytest
+from assertpy import assert_that
+
+from dook.core.processor.pool import CheckerPool
+from dook.core.users.constants import UserRoleType
+from dook.core.users.models import User
+from tests.factories.users import UserFactory, UserNewsFactory
+
+
+def rows(*counts):
+    return [
+        (checker_id, f"checker{checker_id}@example.com", True, count)
+        for checker_id, count in enumerate(counts, start=1)
+    ]
+
+
+class TestCheckerPool:
+    def test_take_least_assigned(self):
+        pool = CheckerPool(rows(3, 0, 2, 1))
+
+        checkers = pool.take(2)
+
+        assert_that([checker.id for checker in checkers]).is_equal_to([2, 4])
+        assert_that(checkers[0].email).is_equal_to("checker2@example.com")
+
+    def test_take_counts_assignments(self):
+        pool = CheckerPool(rows(0, 0, 0, 0, 0, 0, 0, 0))
+
+        taken = Counter(checker.id for _ in range(6) for checker in pool.take(4))
+
+        assert_that(set(taken.values())).is_equal_to({3})
+        assert_that(set(pool.get_assignments_counts().values())).is_equal_to({3})
+
+    def test_take_breaks_ties_randomly(self):
+        first_taken = {CheckerPool(rows(0, 0, 0, 0)).take(1)[0].id for _ in range(100)}
+
+        assert_that(len(first_taken)).is_greater_than(1)
+
+    def test_take_excluded(self):
+        pool = CheckerPool(rows(0, 1, 2))
+
+        checkers = pool.take(2, exclude_ids=[1])
+
+        assert_that([checker.id for checker in checkers]).is_equal_to([2, 3])
+        assert_that(pool.get_assignments_counts()).is_equal_to({1: 0, 2: 2, 3: 3})
+
+    def test_take_more_than_available(self):
+        assert_that(CheckerPool(rows(0, 0)).take(4)).is_length(2)
+
+    def test_release(self):
+        pool = CheckerPool(rows(0, 0))
+
+        pool.release(pool.take(1))
+
+        assert_that(pool.get_assignments_counts()).is_equal_to({1: 0, 2: 0})
+
+
+@pytest.mark.django_db
+def test_from_queryset_loads_active_assignments(django_assert_num_queries):
+    busy, idle = UserFactory.create_batch(2, role=UserRoleType.FACT_CHECKER)
+    UserFactory(role=UserRoleType.FACT_CHECKER, is_active=False)
+    UserNewsFactory.create_batch(2, user=busy)
+
+    with django_assert_num_queries(1):
+        pool = CheckerPool.from_queryset(User.fact_checkers.active_verified())
+
+    assert_that(pool.get_assignments_counts()).is_equal_to({busy.id: 2, idle.id: 0})
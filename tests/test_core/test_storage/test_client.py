@@ -0,0 +1,95 @@
+import io
+
+import pytest
+from assertpy import assert_that
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+
+from dook.core.integrations.storage.client import (
+    S3ApiClient,
+    detect_content_type,
+    get_boto3_client,
+    reset_boto3_client,
+)
+from dook.core.integrations.storage.exceptions import StorageServiceInternalException
+from dook.core.users.constants import UserRoleType
+from tests.factories.news import NewsFactory
+from tests.factories.users import UserFactory
+
+
+@pytest.fixture()
+def png_image():
+    image_file = io.BytesIO()
+    Image.new("RGB", (100, 100)).save(image_file, format="PNG")
+    return SimpleUploadedFile(
+        "screenshot.png", image_file.getvalue(), content_type="image/png"
+    )
+
+
+class TestS3ApiClient:
+    def test_client_is_shared(self, stub_s3):
+        assert_that(S3ApiClient().boto3_client).is_same_as(get_boto3_client())
+        assert_that(S3ApiClient().boto3_client).is_same_as(S3ApiClient().boto3_client)
+
+    def test_upload_image(self, stub_s3, png_image):
+        content = png_image.read()
+        png_image.seek(0)
+
+        S3ApiClient().upload_image(png_image, filename="image_1")
+
+        stored = stub_s3.objects["/screenshots/image_1"]
+        assert_that(stored["body"]).is_equal_to(content)
+        assert_that(stored["content_type"]).is_equal_to("image/png")
+        assert_that(stored["acl"]).is_equal_to("public-read")
+
+    def test_large_image_is_uploaded_in_parts(self, stub_s3, settings):
+        settings.AWS_S3_MULTIPART_THRESHOLD = 1024 * 1024
+        settings.AWS_S3_MULTIPART_CHUNKSIZE = 5 * 1024 * 1024
+        content = bytes(range(256)) * (24 * 1024)  # 6 MB
+        image = SimpleUploadedFile("large.jpg", content, content_type="image/jpeg")
+
+        S3ApiClient().upload_image(image, filename="image_2")
+
+        stored = stub_s3.objects["/screenshots/image_2"]
+        assert_that(stored["parts_count"]).is_equal_to(2)
+        assert_that(stored["body"]).is_equal_to(content)
+        assert_that(stored["content_type"]).is_equal_to("image/jpeg")
+
+    def test_upload_failure(self, stub_s3, settings, png_image):
+        settings.AWS_S3_ENDPOINT_URL = "http://127.0.0.1:1"
+        settings.AWS_S3_MAX_RETRIES = 0
+        reset_boto3_client()
+
+        with pytest.raises(StorageServiceInternalException):
+            S3ApiClient().upload_image(png_image, filename="image_3")
+
+    def test_detect_content_type(self):
+        assert_that(
+            detect_content_type(SimpleUploadedFile("a.bin", b"", content_type=""))
+        ).is_equal_to("application/octet-stream")
+        assert_that(detect_content_type(io.BytesIO())).is_equal_to(
+            "application/octet-stream"
+        )
+        assert_that(
+            detect_content_type(SimpleUploadedFile("a.webp", b"", content_type=""))
+        ).is_equal_to("image/webp")
+
+
+@pytest.mark.django_db
+def test_news_image_upload(stub_s3, api_client, png_image):
+    api_client.force_authenticate(user=UserFactory(role=UserRoleType.ADMIN))
+    news = NewsFactory()
+    png_image.content_type = "application/octet-stream"
+
+    url = reverse("news:management:news-image", kwargs={"pk": news.id})
+    response = api_client.patch(url, {"image": png_image}, format="multipart")
+
+    assert_that(response.status_code).is_equal_to(204)
+    news.refresh_from_db()
+    assert_that(news.screenshot_url).starts_with(
+        f"http://127.0.0.1:{stub_s3.server_port}/screenshots/"
+    )
+    key = news.screenshot_url.split("/", 3)[3]
+    # content type detected out of the image by the image field
+    assert_that(stub_s3.objects[f"/{key}"]["content_type"]).is_equal_to("image/png")
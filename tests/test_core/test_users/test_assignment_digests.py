@@ -0,0 +1,73 @@
+import datetime
+
+import pytest
+from assertpy import assert_that
+from django.utils import timezone
+
+from dook.core.users.email_service import (
+    get_news_url,
+    send_due_assignment_digests,
+    send_multiple_assignment_notifications,
+)
+from dook.core.users.models import AssignmentNotification, QueuedEmail
+from tests.factories.news import NewsFactory
+from tests.factories.users import UserFactory
+
+
+@pytest.fixture()
+def digests(settings):
+    settings.ASSIGNMENT_NOTIFICATION_DIGEST_MINUTES = 30
+
+
+def push_back_notifications(minutes):
+    AssignmentNotification.objects.update(
+        created_at=timezone.now() - datetime.timedelta(minutes=minutes)
+    )
+
+
+@pytest.mark.django_db
+class TestAssignmentDigests:
+    def test_notifications_are_collected(self, digests):
+        users = UserFactory.create_batch(2)
+        news = NewsFactory()
+
+        send_multiple_assignment_notifications(users, news)
+        send_multiple_assignment_notifications(users, news)
+
+        assert_that(QueuedEmail.objects.exists()).is_false()
+        assert_that(AssignmentNotification.objects.count()).is_equal_to(2)
+
+    def test_digest_waits_for_window(self, digests):
+        send_multiple_assignment_notifications([UserFactory()], NewsFactory())
+
+        assert_that(send_due_assignment_digests()).is_equal_to(0)
+        assert_that(AssignmentNotification.objects.count()).is_equal_to(1)
+
+    def test_single_digest_per_user(self, digests):
+        user, other_user = UserFactory.create_batch(2)
+        news_list = NewsFactory.create_batch(3)
+        for news in news_list:
+            send_multiple_assignment_notifications([user], news)
+        send_multiple_assignment_notifications([other_user], news_list[0])
+        push_back_notifications(minutes=31)
+
+        assert_that(send_due_assignment_digests()).is_equal_to(2)
+
+        assert_that(AssignmentNotification.objects.exists()).is_false()
+        digests_by_email = {
+            tuple(message.to): message
+            for message in (email.render() for email in QueuedEmail.objects.all())
+        }
+        digest = digests_by_email[(user.email,)]
+        for news in news_list:
+            assert_that(digest.body).contains(get_news_url(news))
+
+    def test_unsubscribed_users_are_skipped(self, digests):
+        send_multiple_assignment_notifications(
+            [UserFactory(allow_subscriptions=False)], NewsFactory()
+        )
+        push_back_notifications(minutes=31)
+
+        assert_that(send_due_assignment_digests()).is_equal_to(0)
+        assert_that(AssignmentNotification.objects.exists()).is_false()
+        assert_that(QueuedEmail.objects.exists()).is_false()
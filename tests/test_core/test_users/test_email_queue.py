@@ -0,0 +1,166 @@
+from unittest import mock
+
+import pytest
+from anymail.exceptions import AnymailAPIError
+from anymail.message import AnymailRecipientStatus, AnymailStatus
+from assertpy import assert_that
+from django.core import mail
+from django.utils import timezone
+
+from dook.core.users.constants import QueuedEmailStatus
+from dook.core.users.email_queue import EmailQueueDelivery
+from dook.core.users.email_service import (
+    send_multiple_assignment_notifications,
+    send_password_reset_email,
+)
+from dook.core.users.models import QueuedEmail
+from tests.factories.news import NewsFactory
+from tests.factories.users import UserFactory
+
+
+@pytest.fixture()
+def anymail_backend(settings):
+    settings.EMAIL_BACKEND = "anymail.backends.test.EmailBackend"
+
+
+def rejecting_connection():
+    def send_messages(messages):
+        for message in messages:
+            message.anymail_status = AnymailStatus()
+            message.anymail_status.set_recipient_status(
+                {message.to[0]: AnymailRecipientStatus(None, "rejected")}
+            )
+        return 0
+
+    connection = mock.MagicMock()
+    connection.send_messages.side_effect = send_messages
+    return connection
+
+
+@pytest.mark.django_db
+class TestEmailQueue:
+    def test_emails_are_queued(self):
+        result = send_password_reset_email("user@example.com", "https://reset")
+
+        assert_that(result).is_true()
+        assert_that(mail.outbox).is_empty()
+        queued_email = QueuedEmail.objects.get()
+        assert_that(queued_email.status).is_equal_to(QueuedEmailStatus.QUEUED)
+        assert_that(queued_email.render().to).is_equal_to(["user@example.com"])
+        assert_that(queued_email.render().body).contains("https://reset")
+
+    def test_emails_are_sent_right_away_without_queue(self, settings):
+        settings.EMAIL_QUEUE = False
+
+        send_password_reset_email("user@example.com", "https://reset")
+
+        assert_that(mail.outbox).is_length(1)
+        assert_that(QueuedEmail.objects.exists()).is_false()
+
+    def test_deliver_reuses_connection(self, anymail_backend):
+        users = UserFactory.create_batch(3)
+        send_multiple_assignment_notifications(users, NewsFactory())
+
+        with mock.patch(
+            "dook.core.users.email_queue.get_connection", wraps=mail.get_connection,
+        ) as get_connection:
+            handled = EmailQueueDelivery().deliver_all()
+
+        assert_that(handled).is_equal_to(3)
+        assert_that(get_connection.call_count).is_equal_to(1)
+        assert_that([message.to for message in mail.outbox]).contains_only(
+            *[[user.email] for user in users]
+        )
+        for queued_email in QueuedEmail.objects.all():
+            assert_that(queued_email.status).is_equal_to(QueuedEmailStatus.SENT)
+            assert_that(queued_email.provider_status).is_equal_to("sent")
+
+    def test_anymail_error_is_retried(self, settings):
+        settings.EMAIL_QUEUE_RETRY_DELAY = 60
+        send_password_reset_email("user@example.com", "https://reset")
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = AnymailAPIError("provider is down")
+
+        with mock.patch(
+            "dook.core.users.email_queue.get_connection", return_value=connection
+        ):
+            EmailQueueDelivery().deliver_all()
+
+        queued_email = QueuedEmail.objects.get()
+        assert_that(queued_email.status).is_equal_to(QueuedEmailStatus.QUEUED)
+        assert_that(queued_email.attempts).is_equal_to(1)
+        assert_that(queued_email.last_error).contains("provider is down")
+        assert_that(queued_email.available_at).is_greater_than(timezone.now())
+
+        QueuedEmail.objects.update(available_at=timezone.now())
+        EmailQueueDelivery().deliver_all()
+
+        queued_email.refresh_from_db()
+        assert_that(queued_email.status).is_equal_to(QueuedEmailStatus.SENT)
+        assert_that(mail.outbox).is_length(1)
+
+    def test_rejected_email_is_failed(self):
+        send_password_reset_email("user@example.com", "https://reset")
+
+        with mock.patch(
+            "dook.core.users.email_queue.get_connection",
+            return_value=rejecting_connection(),
+        ):
+            EmailQueueDelivery().deliver_all()
+
+        queued_email = QueuedEmail.objects.get()
+        assert_that(queued_email.status).is_equal_to(QueuedEmailStatus.FAILED)
+        assert_that(queued_email.provider_status).is_equal_to("rejected")
+
+    def test_failure_does_not_resend_sent_emails(self, anymail_backend):
+        users = UserFactory.create_batch(2)
+        send_multiple_assignment_notifications(users, NewsFactory())
+        sent_messages = []
+
+        def send_messages(messages):
+            if sent_messages:
+                raise ConnectionResetError("connection lost")
+            sent_messages.extend(messages)
+            return len(messages)
+
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = send_messages
+        with mock.patch(
+            "dook.core.users.email_queue.get_connection", return_value=connection
+        ):
+            EmailQueueDelivery().deliver_all()
+
+        statuses = sorted(
+            QueuedEmail.objects.values_list("status", "attempts", "last_error")
+        )
+        assert_that(statuses).is_equal_to(
+            [
+                (QueuedEmailStatus.QUEUED, 1, "ConnectionResetError('connection lost')"),
+                (QueuedEmailStatus.SENT, 1, ""),
+            ]
+        )
+        assert_that(sent_messages).is_length(1)
+
+    def test_emails_are_leased_while_sent(self):
+        send_password_reset_email("user@example.com", "https://reset")
+        due_counts = []
+
+        def send_messages(messages):
+            due_counts.append(QueuedEmail.objects.due().count())
+            raise KeyboardInterrupt
+
+        connection = mock.MagicMock()
+        connection.send_messages.side_effect = send_messages
+        with mock.patch(
+            "dook.core.users.email_queue.get_connection", return_value=connection
+        ):
+            with pytest.raises(KeyboardInterrupt):
+                EmailQueueDelivery().deliver_batch()
+
+        assert_that(due_counts).is_equal_to([0])
+        assert_that(EmailQueueDelivery().deliver_all()).is_equal_to(0)
+
+        QueuedEmail.objects.update(available_at=timezone.now())
+        EmailQueueDelivery().deliver_all()
+
+        assert_that(QueuedEmail.objects.get().status).is_equal_to(QueuedEmailStatus.SENT)